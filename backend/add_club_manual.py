@@ -14,7 +14,9 @@ import os
 import sys
 import uuid
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from services.supabase_client import get_client
+from services.club_catalog import invalidate_club_catalog
 
 load_dotenv()
 
@@ -23,7 +25,7 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 def add_club_manual(name: str, address: str, latitude: float, longitude: float, 
                    rating: float = 0.0, website: str = "https://example.com", 
@@ -70,6 +72,7 @@ def add_club_manual(name: str, address: str, latitude: float, longitude: float,
         result = supabase.table("Clubs").insert(club_data).execute()
         
         if result.data:
+            invalidate_club_catalog()
             print(f"✅ Successfully added club: {name}")
             print(f"   Club ID: {club_id}")
             return True
@@ -1,6 +1,14 @@
+import os
+
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Prefer the Procfile worker; in-process, a host-wide lock lets one web worker run it
+        if os.getenv('ATTENDANCE_SWEEPER_IN_PROCESS', 'false').lower() == 'true':
+            from services.attendance import start_background_sweeper
+            start_background_sweeper()
@@ -1,5 +1,5 @@
-from django.core.management.base import BaseCommand
-from services.supabase_service import smart_generate_recurring_events
+from django.core.management.base import BaseCommand, CommandError
+from services.supabase_service import smart_generate_recurring_events_by_club
 
 class Command(BaseCommand):
     help = 'Smart weekly generation of recurring events - avoids duplicates and only generates what\'s needed'
@@ -16,49 +16,86 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be generated without actually creating events'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of clubs generated in parallel (default: 4)'
+        )
+        parser.add_argument(
+            '--club-id',
+            type=str,
+            default=None,
+            help='Only generate events for this club'
+        )
 
     def handle(self, *args, **options):
         weeks_ahead = options['weeks']
         dry_run = options['dry_run']
-        
+        workers = max(1, options['workers'])
+        club_id = options['club_id']
+
         if dry_run:
             self.stdout.write(
                 self.style.WARNING('🔍 DRY RUN MODE - No events will be created')
             )
-        
+
         try:
             self.stdout.write(
                 self.style.SUCCESS(f'🚀 Starting smart recurring event generation for next {weeks_ahead} weeks...')
             )
-            
-            events = smart_generate_recurring_events(weeks_ahead)
-            
+
+            report = smart_generate_recurring_events_by_club(
+                weeks_ahead,
+                club_id=club_id,
+                workers=workers,
+                dry_run=dry_run
+            )
+            events = report['generated_events']
+
             if events:
+                verb = 'Would generate' if dry_run else 'Successfully generated'
                 self.stdout.write(
-                    self.style.SUCCESS(f'✅ Successfully generated {len(events)} recurring events')
+                    self.style.SUCCESS(f'✅ {verb} {len(events)} recurring events')
                 )
-                
+
                 # Show summary of generated events
                 for i, event in enumerate(events[:5]):  # Show first 5
                     start_date = event['start_date']
                     if isinstance(start_date, str):
                         from datetime import datetime
-                        start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+                        from services.opening_hours import CLUB_TIMEZONE
+                        # Stored as UTC; shown in club time
+                        start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00')).astimezone(CLUB_TIMEZONE)
                     self.stdout.write(f"   📅 {event['title']} on {start_date.strftime('%Y-%m-%d %H:%M')}")
-                
+
                 if len(events) > 5:
                     self.stdout.write(f"   ... and {len(events) - 5} more events")
             else:
                 self.stdout.write(
                     self.style.WARNING('ℹ️  No new events needed to be generated')
                 )
-                
+
+            # Per-club report, slowest first
+            self.stdout.write(
+                f"\n🏢 {len(report['clubs'])} clubs in {report['seconds']}s with {report['workers']} workers:"
+            )
+            for club in report['clubs']:
+                line = f"   {club['club_id']}: {club['generated']} events from {club['templates']} templates in {club['seconds']}s"
+                if club['error']:
+                    self.stdout.write(self.style.ERROR(f"{line} - {club['error']}"))
+                else:
+                    self.stdout.write(line)
+
         except Exception as e:
             self.stdout.write(
                 self.style.ERROR(f'❌ Error during smart generation: {e}')
             )
             raise e
-        
+
+        if report['failed_clubs']:
+            raise CommandError(f"{report['failed_clubs']} clubs failed; rerun to retry them")
+
         self.stdout.write(
             self.style.SUCCESS('🎉 Smart recurring event generation completed!')
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from services.attendance import get_attendance_sweeper, sweep_expired_attendance
+
+class Command(BaseCommand):
+    help = 'Clear attendance for users whose club has closed (one bulk update)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running, sweeping as each active_club_closed deadline passes'
+        )
+
+    def handle(self, *args, **options):
+        if options['watch']:
+            self.stdout.write('Watching attendance deadlines (Ctrl+C to stop)')
+            try:
+                get_attendance_sweeper().run_forever()
+            except KeyboardInterrupt:
+                pass
+            return
+
+        try:
+            cleared_ids = sweep_expired_attendance()
+            self.stdout.write(
+                self.style.SUCCESS(f'Cleared expired attendance for {len(cleared_ids)} users')
+            )
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error clearing expired attendance: {e}')
+            )
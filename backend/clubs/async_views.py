@@ -0,0 +1,51 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from services import async_supabase_service
+
+
+# Async views for the hottest read endpoints. Under ASGI these await their
+# Supabase queries instead of blocking a worker (see ASYNC_DEPLOYMENT_README.md).
+
+@require_GET
+async def get_trending_clubs_view(request):
+    """Fetch trending clubs based on recent reviews and ratings"""
+    try:
+        trending_clubs = await async_supabase_service.get_trending_clubs()
+        return JsonResponse({"trending_clubs": trending_clubs})
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+@require_GET
+async def get_club_trending_status_view(request, club_id):
+    """Get trending status for a single club"""
+    try:
+        trending_status = await async_supabase_service.get_club_trending_status(club_id)
+        return JsonResponse(trending_status)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+@require_GET
+async def get_filtered_clubs_view(request):
+    """Get filtered and sorted clubs with trending status"""
+    try:
+        # Get query parameters
+        filter_open = request.GET.get('filter_open', 'false').lower() == 'true'
+        selected_genres = request.GET.get('selected_genres', '').split(',') if request.GET.get('selected_genres') else []
+        min_rating = float(request.GET.get('min_rating', 0))
+        match_all_genres = request.GET.get('genre_match', 'any').lower() == 'all'
+        day_of_week = int(request.GET['day']) if request.GET.get('day') else None
+        
+        # Remove empty strings from genres
+        selected_genres = [genre.strip() for genre in selected_genres if genre.strip()]
+        
+        filtered_clubs = await async_supabase_service.get_filtered_clubs(
+            filter_open=filter_open,
+            selected_genres=selected_genres,
+            min_rating=min_rating,
+            match_all_genres=match_all_genres,
+            day_of_week=day_of_week
+        )
+        
+        return JsonResponse({"clubs": filtered_clubs})
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
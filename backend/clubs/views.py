@@ -1,40 +1,98 @@
 from django.shortcuts import render
-from services.supabase_service import get_clubs, add_club, get_trending_clubs, get_club_by_id, get_club_trending_status, get_filtered_clubs, search_clubs, get_friends_attending, get_club_music_schedule, get_club_reviews, add_club_review, get_user_profile, update_user_profile, get_user_friends, get_pending_friend_requests, send_friend_request, accept_friend_request, unfriend_user, get_user_favourites, add_club_to_favourites, remove_club_from_favourites, check_favourite_exists, print_all_clubs_json
+from services.supabase_service import get_clubs, get_clubs_page, get_clubs_etag, get_club_etag, get_club_occupancy, with_occupancy, get_club_reviews_etag, add_club, get_club_by_id, search_clubs, get_nearby_clubs, get_friends_attending, get_club_music_schedule, get_club_reviews, add_club_review, get_user_profile, update_user_profile, get_user_friends, get_pending_friend_requests, send_friend_request, accept_friend_request, unfriend_user, get_user_favourites, add_club_to_favourites, remove_club_from_favourites, check_favourite_exists, print_all_clubs_json
 from .models import Club
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
+from django.views.decorators.http import condition
+import hashlib
 
 
 # Create your views here.
 
+# ETag functions for conditional GETs (If-None-Match -> 304). They return None
+# on errors so the view itself still runs and reports the failure.
+def _catalog_etag(request, *args, **kwargs):
+    try:
+        query_hash = hashlib.sha1(request.GET.urlencode().encode()).hexdigest()[:12]
+        return f"{get_clubs_etag()}-{query_hash}"
+    except Exception:
+        return None
+
+def _club_etag(request, club_id):
+    try:
+        return get_club_etag(club_id)
+    except Exception:
+        return None
+
+def _club_reviews_etag(request, club_id):
+    try:
+        return get_club_reviews_etag(club_id, request.GET.get('type', 'app'))
+    except Exception:
+        return None
+
+def _parse_page_params(request):
+    """Read ?after=, ?limit= and ?fields= (comma-separated, 'card' or '*')"""
+    after = request.GET.get('after') or None
+    limit = max(1, min(int(request.GET.get('limit', 50)), 500))
+    fields_param = request.GET.get('fields', '').strip()
+    if not fields_param or fields_param == 'card':
+        fields = None  # Compact card projection
+    else:
+        fields = [field.strip() for field in fields_param.split(',') if field.strip()]
+    return after, limit, fields
+
 # Requires user authentication
+@condition(etag_func=_catalog_etag)
 @api_view(["GET"])
 def get_all_clubs(request):
-    """Fetch all clubs from Supabase"""
-    clubs = get_clubs()
-    return Response({"clubs": clubs})
+    """Fetch a page of clubs (card fields by default)"""
+    try:
+        after, limit, fields = _parse_page_params(request)
+        clubs, next_cursor = get_clubs_page(after, limit, fields)
+        return Response({"clubs": with_occupancy(clubs), "next": next_cursor})
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
 
+@condition(etag_func=_catalog_etag)
 @api_view(["GET"])
 def get_clubs_json(request):
-    """Fetch all clubs and return them in JSON format"""
-    clubs = get_clubs()
-    return Response(clubs)  # Returns raw JSON array
+    """Fetch clubs and return them in JSON format"""
+    if not any(param in request.GET for param in ('after', 'limit', 'fields')):
+        # Legacy clients expect every club with every column
+        clubs = with_occupancy(get_clubs())
+        return Response(clubs)  # Returns raw JSON array
+    
+    try:
+        after, limit, fields = _parse_page_params(request)
+        clubs, next_cursor = get_clubs_page(after, limit, fields)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    
+    response = Response(with_occupancy(clubs))  # Returns raw JSON array
+    if next_cursor:
+        response["X-Next-Cursor"] = str(next_cursor)
+    return response
 
+@condition(etag_func=_club_etag)
 @api_view(["GET"])
 def get_club_by_id_view(request, club_id):
     """Fetch a single club by ID from Supabase"""
     club = get_club_by_id(club_id)
     if club:
-        return Response({"club": club})
+        return Response({"club": with_occupancy([club])[0]})
     else:
         return Response({"error": "Club not found"}, status=404)
 
 @api_view(["GET"])
-def get_trending_clubs_view(request):
-    """Fetch trending clubs based on recent reviews and ratings"""
-    trending_clubs = get_trending_clubs()
-    return Response({"trending_clubs": trending_clubs})
+def get_club_occupancy_view(request):
+    """Users checked in per club (?ids=a,b,c to restrict, otherwise every occupied club)"""
+    try:
+        ids_param = request.GET.get('ids', '').strip()
+        club_ids = [club_id.strip() for club_id in ids_param.split(',') if club_id.strip()] if ids_param else None
+        return Response({"occupancy": get_club_occupancy(club_ids)})
+    except Exception as e:
+        return Response({"error": str(e)}, status=500)
 
 @api_view(["GET"])
 def create_club(request):
@@ -42,15 +100,6 @@ def create_club(request):
     # Implementation here
     pass
 
-@api_view(["GET"])
-def get_club_trending_status_view(request, club_id):
-    """Get trending status for a single club"""
-    try:
-        trending_status = get_club_trending_status(club_id)
-        return Response(trending_status)
-    except Exception as e:
-        return Response({"error": str(e)}, status=500)
-
 @api_view(["GET"])
 def get_friends_attending_view(request, club_id):
     """Get friends of a user who are attending a specific club"""
@@ -83,24 +132,23 @@ def search_clubs_view(request):
         return Response({"error": str(e)}, status=500)
 
 @api_view(["GET"])
-def get_filtered_clubs_view(request):
-    """Get filtered and sorted clubs with trending status"""
+def get_nearby_clubs_view(request):
+    """Get clubs near a location, nearest first"""
     try:
         # Get query parameters
-        filter_open = request.GET.get('filter_open', 'false').lower() == 'true'
-        selected_genres = request.GET.get('selected_genres', '').split(',') if request.GET.get('selected_genres') else []
-        min_rating = float(request.GET.get('min_rating', 0))
-        
-        # Remove empty strings from genres
-        selected_genres = [genre for genre in selected_genres if genre.strip()]
+        try:
+            latitude = float(request.GET['lat'])
+            longitude = float(request.GET['lng'])
+            radius = float(request.GET.get('radius', 5000))  # metres
+            limit = int(request.GET.get('limit', 20))
+        except (KeyError, ValueError):
+            return Response({"error": "lat and lng parameters are required and must be numbers"}, status=400)
         
-        filtered_clubs = get_filtered_clubs(
-            filter_open=filter_open,
-            selected_genres=selected_genres,
-            min_rating=min_rating
-        )
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or radius <= 0 or limit <= 0:
+            return Response({"error": "lat, lng, radius or limit out of range"}, status=400)
         
-        return Response({"clubs": filtered_clubs})
+        nearby_clubs = get_nearby_clubs(latitude, longitude, min(radius, 50000), min(limit, 100))
+        return Response({"clubs": nearby_clubs})
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
@@ -114,6 +162,7 @@ def get_club_music_schedule_view(request, club_id):
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
+@condition(etag_func=_club_reviews_etag)
 @api_view(["GET"])
 def get_club_reviews_view(request, club_id):
     """Get reviews for a club"""
@@ -15,7 +15,9 @@ import json
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from services.supabase_client import get_client
+from services.genre_index import invalidate_genre_index
 
 # Configure logging
 logging.basicConfig(
@@ -36,7 +38,7 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     sys.exit(1)
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 # List of all possible genres
 ALL_GENRES = [
@@ -136,7 +138,9 @@ def upsert_to_supabase(data):
                 # Insert new record
                 logger.info(f"Inserting new record for club_id {record['club_id']} and day {record['day_of_week']}")
                 supabase.table('ClubMusicSchedules').insert(record).execute()
-                
+        
+        # Let running servers rebuild their genre index
+        invalidate_genre_index()
         return True
             
     except Exception as e:
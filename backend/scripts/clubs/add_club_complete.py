@@ -13,7 +13,12 @@ import os
 import sys
 import uuid
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+
+# Add the backend directory to the path to import the shared services
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from services.supabase_client import get_client
+from services.club_catalog import invalidate_club_catalog
 
 load_dotenv()
 
@@ -22,7 +27,7 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 def get_user_input(prompt: str, required: bool = True, input_type: str = "str") -> any:
     """
@@ -108,7 +113,9 @@ def parse_hours_input(hours_input: str) -> dict:
     if not hours_input:
         return None
     
-    # Day mapping
+    # Day mapping (Monday = 0, the order of weekdayDescriptions); periods are
+    # written with Google's day numbers (Sunday = 0) like the rest of the
+    # Clubs table, see services/opening_hours.py
     day_map = {
         'monday': 0, 'mon': 0,
         'tuesday': 1, 'tue': 1, 'tues': 1,
@@ -183,12 +190,12 @@ def parse_hours_input(hours_input: str) -> dict:
                 
                 period = {
                     "open": {
-                        "day": day,
+                        "day": (day + 1) % 7,
                         "hour": open_hour,
                         "minute": open_minute
                     },
                     "close": {
-                        "day": close_day,
+                        "day": (close_day + 1) % 7,
                         "hour": close_hour,
                         "minute": close_minute
                     }
@@ -384,6 +391,7 @@ def add_club_to_database(data: dict) -> bool:
         result = supabase.table("Clubs").insert(club_data).execute()
         
         if result.data:
+            invalidate_club_catalog()
             print(f"✅ Successfully added club: {data['name']}")
             print(f"   Club ID: {club_id}")
             return True
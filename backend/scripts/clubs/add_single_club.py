@@ -15,9 +15,14 @@ import requests
 import os
 import sys
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 from typing import List, Dict, Optional, Any
 
+# Add the backend directory to the path to import the shared services
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from services.supabase_client import get_client
+from services.club_catalog import invalidate_club_catalog
+
 load_dotenv()
 
 # Configuration
@@ -27,7 +32,7 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 class Club:
     """Represents a club with its data and operations"""
@@ -106,6 +111,7 @@ class Club:
                 print(f"❌ Error saving club {self.name}: {result.error}")
                 return False
 
+            invalidate_club_catalog()
             print(f"✅ Successfully saved club: {self.name}")
             return True
 
@@ -1,11 +1,17 @@
 import requests
 import os
+import sys
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 import time
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 
+# Add the backend directory to the path to import the shared services
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from services.supabase_client import get_client
+from services.club_catalog import invalidate_club_catalog
+
 
 load_dotenv()
 
@@ -16,7 +22,7 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 class Club:
     """Represents a club with its data and operations"""
@@ -309,6 +315,7 @@ def main():
     for club in clubs:
         club.save()
     
+    invalidate_club_catalog()
     print("Finished processing nightclubs.")
 
 if __name__ == '__main__':
@@ -16,12 +16,14 @@ import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 try:
-    from supabase import create_client, Client
+    from supabase import Client
     from dotenv import load_dotenv
 except ImportError:
     print("Please install required packages: pip install supabase python-dotenv")
     sys.exit(1)
 
+from services.supabase_client import get_client
+
 # Load environment variables from the backend directory
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 env_path = os.path.join(backend_dir, '.env')
@@ -36,7 +38,7 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     sys.exit(1)
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 class MrBlackEventScraper:
     def __init__(self):
@@ -0,0 +1,168 @@
+"""
+Async variant of the Supabase service layer for ASGI views.
+
+Reads go through the async Supabase client so a worker can serve other
+requests while PostgREST round trips are in flight, and independent queries
+are awaited concurrently. The in-memory components owned by supabase_service
+(club catalog, trending cache, genre index) are shared: this module
+refreshes them asynchronously, then runs the synchronous read paths in a
+worker thread (sync_to_async), so a component that expires or is invalidated
+between the warm-up and the read reloads there instead of blocking the event
+loop.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from supabase import AsyncClient
+
+from services import friend_graph, supabase_service, trending
+from services.supabase_client import acreate_pooled_client
+from services.club_catalog import CLUBS_VERSION_SCOPE
+from services.genre_index import MUSIC_VERSION_SCOPE
+from services.single_flight import query_key
+from services.versions import get_version
+
+def _in_thread(func):
+    """Run a synchronous read off the event loop (no ORM use, so no shared thread)"""
+    return sync_to_async(func, thread_sensitive=False)
+
+
+_client = None
+_client_loop = None
+_client_lock = None
+
+
+async def get_async_client() -> AsyncClient:
+    """Async Supabase client for the running event loop (created on first use)"""
+    global _client, _client_loop, _client_lock
+    loop = asyncio.get_running_loop()
+    if _client is not None and _client_loop is loop:
+        return _client
+
+    if _client_loop is not loop:
+        # First use, or a new event loop (httpx clients are bound to their loop)
+        _client, _client_loop, _client_lock = None, loop, asyncio.Lock()
+    async with _client_lock:
+        if _client is None:
+            _client = await acreate_pooled_client(supabase_service.SUPABASE_URL, supabase_service.SUPABASE_KEY)
+    return _client
+
+
+async def _fetch_all_rows(build_query, page_size: int = 1000):
+    """Async counterpart of supabase_service._fetch_all_rows"""
+    rows = []
+    start = 0
+    while True:
+        response = await build_query().range(start, start + page_size - 1).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+async def _load_club_catalog():
+    client = await get_async_client()
+    version = get_version(CLUBS_VERSION_SCOPE)
+    rows = await _fetch_all_rows(lambda: client.table("Clubs").select("*"))
+    supabase_service._club_catalog.load(rows, version)
+
+
+async def _warm_club_catalog():
+    if supabase_service._club_catalog.is_fresh():
+        return
+    # Requests arriving while the catalog is cold share one load
+    await supabase_service._single_flight.do_async(query_key("Clubs", "*", all_rows=True), _load_club_catalog)
+
+
+async def _load_trending_cache():
+    client = await get_async_client()
+    since = (datetime.utcnow() - timedelta(hours=trending.TRENDING_WINDOW_HOURS)).isoformat()
+    reviews = await _fetch_all_rows(
+        lambda: client.table("club_reviews").select("club_id, rating, created_at").gte("created_at", since)
+    )
+    supabase_service._trending_cache.rebuild(reviews)
+
+
+async def _warm_trending_cache():
+    if supabase_service._trending_cache.is_warm():
+        return
+    await supabase_service._single_flight.do_async(
+        query_key("club_reviews", "club_id, rating, created_at", window="trending"), _load_trending_cache
+    )
+
+
+async def _load_genre_index():
+    client = await get_async_client()
+    version = get_version(MUSIC_VERSION_SCOPE)
+    rows = await _fetch_all_rows(lambda: client.table("ClubMusicSchedules").select("*"))
+    supabase_service._genre_index.load(rows, version)
+
+
+async def _warm_genre_index():
+    if supabase_service._genre_index.is_fresh():
+        return
+    await supabase_service._single_flight.do_async(
+        query_key("ClubMusicSchedules", "*", all_rows=True), _load_genre_index
+    )
+
+
+async def get_trending_clubs():
+    """Async get_trending_clubs: warms the catalog and trending cache concurrently"""
+    await asyncio.gather(_warm_club_catalog(), _warm_trending_cache())
+    return await _in_thread(supabase_service.get_trending_clubs)()
+
+
+async def get_club_trending_status(club_id: str):
+    """Async get_club_trending_status"""
+    await _warm_trending_cache()
+    return await _in_thread(supabase_service.get_club_trending_status)(club_id)
+
+
+async def get_filtered_clubs(filter_open=False, selected_genres=None, min_rating=0, match_all_genres=False, day_of_week=None):
+    """Async get_filtered_clubs: warms every index it reads concurrently"""
+    warmers = [_warm_club_catalog(), _warm_trending_cache()]
+    if selected_genres:
+        warmers.append(_warm_genre_index())
+    await asyncio.gather(*warmers)
+    return await _in_thread(supabase_service.get_filtered_clubs)(
+        filter_open=filter_open,
+        selected_genres=selected_genres,
+        min_rating=min_rating,
+        match_all_genres=match_all_genres,
+        day_of_week=day_of_week
+    )
+
+
+async def get_friends_active_clubs(user_id: str):
+    """
+    Friends of a user who are checked into a club, with the club attached.
+
+    The friend list comes from friend_graph (cached per user, shared with the
+    friends endpoint); it is loaded concurrently with the club catalog.
+    """
+    friends, _ = await asyncio.gather(
+        _in_thread(friend_graph.get_friends)(user_id),
+        _warm_club_catalog()
+    )
+    return await _in_thread(_attach_active_clubs)(friends)
+
+
+def _attach_active_clubs(friends: list) -> list:
+    """Checked-in friends with their club from the catalog"""
+    active_clubs = []
+    for profile in friends:
+        if not profile.get("active_club_id"):
+            continue
+        club = supabase_service._club_catalog.get(profile["active_club_id"])
+        if club:
+            active_clubs.append({
+                "user_id": profile["id"],
+                "username": profile["username"],
+                "avatar_url": profile["avatar_url"],
+                "club": club,
+                "expires_at": profile["active_club_closed"]
+            })
+    return active_clubs
@@ -0,0 +1,253 @@
+"""
+Server-side attendance expiry.
+
+Checked-in users carry an active_club_closed deadline on their profile. The
+sweeper keeps those deadlines in a min-heap and sleeps until the earliest one;
+when it passes, every due user is cleared with one bulk update
+(`active_club_closed <= now`), instead of each app launch clearing its own
+user with a write.
+
+The app also checks in by writing profiles directly, so the heap is reloaded
+from profiles every ATTENDANCE_REFRESH_SECONDS (default 300).
+
+Run it as `python manage.py sweep_expired_attendance --watch` (the Procfile
+`worker:` process), or in-process with ATTENDANCE_SWEEPER_IN_PROCESS=true.
+In-process, every web worker calls start_background_sweeper(), so a lock
+file next to the version stamps lets only one of them per host run it.
+The clear-attendance endpoint also clears its own user when the deadline
+has passed, so attendance still expires if no sweeper is running.
+
+Views pass check-ins to the sweeper with track_check_in(), which only does
+so in the process running the in-process sweeper; elsewhere (including when
+the sweeper is the worker process) the next refresh picks them up.
+"""
+
+import heapq
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from services.trending import parse_timestamp
+from services.versions import VERSION_DIR
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ATTENDANCE_REFRESH_SECONDS = int(os.getenv("ATTENDANCE_REFRESH_SECONDS", "300"))
+
+
+class AttendanceSweeper:
+    """Min-heap of attendance deadlines, cleared in bulk as they pass"""
+
+    def __init__(self, load_deadlines, clear_expired, refresh_seconds: int = ATTENDANCE_REFRESH_SECONDS):
+        """
+        Args:
+            load_deadlines: Callable returning (id, active_club_closed) rows for checked-in users
+            clear_expired: Callable(now) clearing every attendance due at `now`;
+                           returns the ids of the cleared users
+            refresh_seconds: How often to reload deadlines written outside the API
+        """
+        self._load_deadlines = load_deadlines
+        self._clear_expired = clear_expired
+        self.refresh_seconds = refresh_seconds
+        self._condition = threading.Condition()
+        self._heap = []       # (deadline, user_id), may hold superseded entries
+        self._deadlines = {}  # user_id -> current deadline
+        self._refreshed_at = None
+        self.sweeps = 0
+        self.cleared = 0
+
+    def refresh(self):
+        """Rebuild the heap from the profiles table"""
+        deadlines = {}
+        for row in self._load_deadlines() or []:
+            try:
+                deadlines[row["id"]] = parse_timestamp(row["active_club_closed"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        with self._condition:
+            self._deadlines = deadlines
+            self._heap = [(deadline, user_id) for user_id, deadline in deadlines.items()]
+            heapq.heapify(self._heap)
+            self._refreshed_at = time.monotonic()
+            self._condition.notify_all()
+
+    def schedule(self, user_id: str, deadline):
+        """Track a new check-in deadline (ISO string or datetime)"""
+        deadline = parse_timestamp(deadline)
+        with self._condition:
+            self._deadlines[user_id] = deadline
+            heapq.heappush(self._heap, (deadline, user_id))
+            self._condition.notify_all()
+
+    def cancel(self, user_id: str):
+        """Stop tracking a user who left their club"""
+        with self._condition:
+            self._deadlines.pop(user_id, None)
+
+    def _drop_superseded(self):
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_deadline(self):
+        """Earliest pending deadline, or None"""
+        with self._condition:
+            self._drop_superseded()
+            return self._heap[0][0] if self._heap else None
+
+    def sweep(self, now: datetime = None) -> list:
+        """
+        Clear every attendance that is due.
+
+        Returns:
+            list: Ids of the users whose attendance was cleared
+        """
+        now = now or datetime.now(timezone.utc)
+        due = False
+        with self._condition:
+            self._drop_superseded()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, user_id = heapq.heappop(self._heap)
+                self._deadlines.pop(user_id, None)
+                due = True
+                self._drop_superseded()
+        if not due:
+            return []
+
+        cleared_ids = self._clear_expired(now) or []
+        self.sweeps += 1
+        self.cleared += len(cleared_ids)
+        return cleared_ids
+
+    def run_forever(self, stop_event: threading.Event = None):
+        """Sleep until the next deadline (or refresh), sweep, repeat"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            if self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Error refreshing attendance deadlines: {e}")
+                    self._refreshed_at = time.monotonic()
+
+            try:
+                cleared_ids = self.sweep()
+                if cleared_ids:
+                    print(f"Cleared expired attendance for {len(cleared_ids)} users")
+            except Exception as e:
+                print(f"Error sweeping expired attendance: {e}")
+
+            wait = self.refresh_seconds - (time.monotonic() - self._refreshed_at)
+            next_deadline = self.next_deadline()
+            if next_deadline is not None:
+                wait = min(wait, (next_deadline - datetime.now(timezone.utc)).total_seconds())
+            with self._condition:
+                # schedule() / refresh() wake the loop early
+                self._condition.wait(timeout=max(wait, 0.5))
+
+
+def _load_deadlines():
+    from services.supabase_service import _fetch_all_rows, supabase
+    return _fetch_all_rows(
+        lambda: supabase.table("profiles").select(
+            "id,active_club_closed"
+        ).not_.is_("active_club_closed", "null").order("id")
+    )
+
+
+def _clear_expired(now: datetime) -> list:
+    """One bulk update clearing every profile whose club has closed"""
+    from services import friend_graph
+    from services.presence import get_presence_index
+    from services.supabase_service import supabase
+
+    response = supabase.table("profiles").update({
+        "active_club_id": None,
+        "active_club_closed": None
+    }).lte("active_club_closed", now.isoformat()).execute()
+
+    cleared_ids = [row["id"] for row in response.data or []]
+    if cleared_ids:
+        get_presence_index().check_out(*cleared_ids)
+    for user_id in cleared_ids:
+        friend_graph.invalidate_profile(user_id)
+    return cleared_ids
+
+
+_sweeper = AttendanceSweeper(load_deadlines=_load_deadlines, clear_expired=_clear_expired)
+_background_thread = None
+_background_lock = None
+
+
+def get_attendance_sweeper() -> AttendanceSweeper:
+    return _sweeper
+
+
+def sweeper_running() -> bool:
+    """Whether this process runs the in-process sweeper thread"""
+    return _background_thread is not None and _background_thread.is_alive()
+
+
+def track_check_in(user_id: str, deadline) -> bool:
+    """
+    Schedule a check-in deadline on this process's sweeper, if it runs one.
+
+    Returns:
+        bool: Whether the deadline was scheduled (False without a sweeper
+              thread here, or if the deadline can't be parsed)
+    """
+    if not deadline or not sweeper_running():
+        return False
+    try:
+        _sweeper.schedule(user_id, deadline)
+    except (TypeError, ValueError) as e:
+        print(f"Warning: Not scheduling attendance expiry for {user_id}: {e}")
+        return False
+    return True
+
+
+def track_check_out(user_id: str):
+    """Drop a user's deadline from this process's sweeper, if it runs one"""
+    if sweeper_running():
+        _sweeper.cancel(user_id)
+
+
+def sweep_expired_attendance() -> list:
+    """Clear every expired attendance now (one bulk update); returns the cleared ids"""
+    return _clear_expired(datetime.now(timezone.utc))
+
+
+def _acquire_background_lock() -> bool:
+    """Hold a host-wide lock so only one process runs the in-process sweeper"""
+    global _background_lock
+    if _background_lock is not None:
+        return True
+    if fcntl is None:
+        return True
+    os.makedirs(VERSION_DIR, exist_ok=True)
+    lock_file = open(os.path.join(VERSION_DIR, "attendance-sweeper.lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _background_lock = lock_file  # Kept open for the life of the process
+    return True
+
+
+def start_background_sweeper():
+    """
+    Run the sweeper on a daemon thread in this process (idempotent).
+    Returns None when another process on this host already runs it.
+    """
+    global _background_thread
+    if _background_thread is not None and _background_thread.is_alive():
+        return _background_thread
+    if not _acquire_background_lock():
+        return None
+    _background_thread = threading.Thread(target=_sweeper.run_forever, name="attendance-sweeper", daemon=True)
+    _background_thread.start()
+    return _background_thread
@@ -0,0 +1,108 @@
+"""
+Chunked, idempotent bulk writes through PostgREST.
+
+Rows are sent in chunks of at most BULK_WRITE_CHUNK_SIZE as
+`upsert(..., on_conflict=<natural key>, ignore_duplicates=True)`, i.e.
+INSERT ... ON CONFLICT DO NOTHING, so a retried chunk or a concurrent run
+cannot create duplicates. The natural key needs a matching unique index
+(see supabase/migrations/20261016_add_event_instance_unique_key.sql for
+events).
+
+Transient failures (connection errors, timeouts, 429/5xx responses and
+Postgres connection/deadlock/resource errors) are retried with exponential
+backoff. A chunk that still fails is reported and the remaining chunks are
+written anyway, so one bad request no longer loses the whole batch.
+"""
+
+import os
+import time
+
+import httpx
+from postgrest.exceptions import APIError
+
+BULK_WRITE_CHUNK_SIZE = int(os.getenv("BULK_WRITE_CHUNK_SIZE", "500"))
+BULK_WRITE_MAX_ATTEMPTS = int(os.getenv("BULK_WRITE_MAX_ATTEMPTS", "4"))
+BULK_WRITE_BACKOFF_SECONDS = float(os.getenv("BULK_WRITE_BACKOFF_SECONDS", "0.5"))
+
+# SQLSTATE classes worth retrying: connection, transaction rollback
+# (deadlock / serialization), insufficient resources, operator intervention
+TRANSIENT_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed write is worth retrying"""
+    if isinstance(error, (httpx.TransportError, httpx.TimeoutException)):
+        return True
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        if code == "429" or (len(code) == 3 and code.startswith("5")):
+            return True  # HTTP status surfaced by postgrest-py for non-JSON errors
+        return code[:2] in TRANSIENT_SQLSTATE_CLASSES and len(code) == 5
+    return False
+
+
+def bulk_upsert(
+    table: str,
+    rows: list,
+    on_conflict: str,
+    chunk_size: int = BULK_WRITE_CHUNK_SIZE,
+    max_attempts: int = BULK_WRITE_MAX_ATTEMPTS,
+    backoff_seconds: float = BULK_WRITE_BACKOFF_SECONDS,
+    client=None,
+) -> dict:
+    """
+    Insert rows in chunks, skipping rows whose natural key already exists.
+
+    Args:
+        table: Table name
+        rows: Row dicts (all with the same keys)
+        on_conflict: Comma-separated natural key columns, backed by a unique index
+        chunk_size: Maximum rows per request
+        max_attempts: Tries per chunk for transient failures
+        backoff_seconds: First retry delay (doubled on each further retry)
+        client: Supabase client (default: the service client)
+
+    Returns:
+        dict: rows, inserted (new rows), skipped (already present), seconds,
+              chunks (per-chunk rows / inserted / attempts / seconds / error)
+              and failed_rows (rows of chunks that never succeeded)
+    """
+    if client is None:
+        from services.supabase_service import supabase as client
+
+    report = {"rows": len(rows), "inserted": 0, "skipped": 0, "seconds": 0.0, "chunks": [], "failed_rows": []}
+    started = time.perf_counter()
+
+    for index, start in enumerate(range(0, len(rows), max(chunk_size, 1))):
+        chunk = rows[start:start + chunk_size]
+        chunk_started = time.perf_counter()
+        chunk_report = {"index": index, "rows": len(chunk), "inserted": 0, "attempts": 0, "seconds": 0.0, "error": None}
+
+        for attempt in range(1, max_attempts + 1):
+            chunk_report["attempts"] = attempt
+            try:
+                response = client.table(table).upsert(
+                    chunk, on_conflict=on_conflict, ignore_duplicates=True
+                ).execute()
+                chunk_report["inserted"] = len(response.data or [])
+                chunk_report["error"] = None
+                break
+            except Exception as e:
+                chunk_report["error"] = str(e)
+                if attempt == max_attempts or not is_transient(e):
+                    break
+                delay = backoff_seconds * 2 ** (attempt - 1)
+                print(f"Retrying {table} chunk {index} in {delay:.1f}s after: {e}")
+                time.sleep(delay)
+
+        chunk_report["seconds"] = round(time.perf_counter() - chunk_started, 4)
+        report["chunks"].append(chunk_report)
+        if chunk_report["error"] is None:
+            report["inserted"] += chunk_report["inserted"]
+            report["skipped"] += len(chunk) - chunk_report["inserted"]
+        else:
+            print(f"❌ Error writing {table} chunk {index} ({len(chunk)} rows): {chunk_report['error']}")
+            report["failed_rows"].extend(chunk)
+
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
@@ -0,0 +1,272 @@
+"""
+Read-through cache for supabase_service read functions.
+
+Two tiers:
+
+- an in-process LRU (bounded by SUPABASE_CACHE_MAX_ENTRIES, default 2048)
+- an optional shared tier speaking the Redis protocol, enabled by setting
+  SUPABASE_CACHE_URL (e.g. redis://localhost:6379/0) and installing `redis`
+
+Keys are derived from the function name and its bound arguments. Each cached
+function also declares tags (templates over its arguments, e.g.
+"user:{user_id}"); the current version of every tag is folded into the key, so
+a write invalidates a tag by bumping its version instead of hunting down keys.
+Tag versions live in the shared tier when there is one (visible to every node).
+Each process also keeps its own bounded table of tag versions, used when there
+is no shared tier (or it cannot be reached); an invalidation then only reaches
+the process that made it, and other workers serve their copy until its TTL
+runs out.
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+CACHE_URL = os.getenv("SUPABASE_CACHE_URL")
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("SUPABASE_CACHE_MAX_ENTRIES", "2048"))
+LOCAL_TAG_MAX_ENTRIES = int(os.getenv("SUPABASE_CACHE_MAX_TAGS", "8192"))
+
+_MISS = object()
+
+
+class LRUCache:
+    """Size-bounded in-process cache with per-entry TTLs"""
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key: str):
+        """Cached value, or _MISS if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISS
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return _MISS
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """
+    Shared tier over any Redis-protocol client.
+
+    Only get/set/mget/incr are used, so any client (or test stand-in) with
+    redis-py's signatures for those commands works.
+    """
+
+    def __init__(self, client, prefix: str = "motivz:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str):
+        raw = self.client.get(self.prefix + key)
+        return _MISS if raw is None else json.loads(raw)
+
+    def set(self, key: str, value, ttl: float):
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags: list) -> list:
+        if not tags:
+            return []
+        values = self.client.mget([f"{self.prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump_tag(self, tag: str):
+        self.client.incr(f"{self.prefix}tag:{tag}")
+
+
+class LocalTagVersions:
+    """
+    Bounded in-process tag versions.
+
+    Versions come from one counter, so a bumped tag always moves past every
+    version handed out before. When the table is full the least recently
+    bumped tag is dropped and the floor (the version every untracked tag
+    reports) rises to its version: entries built under a dropped tag can never
+    match again, and other untracked tags only see a spurious miss.
+    """
+
+    def __init__(self, max_tags: int = LOCAL_TAG_MAX_ENTRIES):
+        self.max_tags = max_tags
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()  # tag -> version
+        self._counter = 0
+        self._floor = 0
+
+    def get(self, tags: list) -> list:
+        with self._lock:
+            return [self._versions.get(tag, self._floor) for tag in tags]
+
+    def bump(self, tag: str):
+        with self._lock:
+            self._counter += 1
+            self._versions[tag] = self._counter
+            self._versions.move_to_end(tag)
+            while len(self._versions) > self.max_tags:
+                _, version = self._versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+
+    def __len__(self):
+        return len(self._versions)
+
+
+class TieredCache:
+    """Local LRU in front of an optional shared tier, with tag versioning"""
+
+    def __init__(self, local: LRUCache = None, shared: RedisCache = None, local_tags: LocalTagVersions = None):
+        self.local = local if local is not None else LRUCache()
+        self.shared = shared
+        self.local_tags = local_tags if local_tags is not None else LocalTagVersions()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def tag_versions(self, tags: list) -> list:
+        if self.shared is not None:
+            try:
+                return self.shared.tag_versions(tags)
+            except Exception as e:
+                print(f"Error reading cache tag versions: {e}")
+        # Marked so a fallback version can never equal a shared-tier one
+        return [f"l{version}" for version in self.local_tags.get(tags)]
+
+    def invalidate(self, *tags):
+        """Invalidate every entry carrying any of the tags"""
+        for tag in tags:
+            self.local_tags.bump(tag)
+            if self.shared is not None:
+                try:
+                    self.shared.bump_tag(tag)
+                except Exception as e:
+                    print(f"Error invalidating cache tag {tag}: {e}")
+
+    def get(self, key: str):
+        value = self.local.get(key)
+        if value is _MISS and self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                print(f"Error reading shared cache: {e}")
+                value = _MISS
+            if value is not _MISS:
+                self.local.set(key, value, _SHARED_HIT_LOCAL_TTL)
+        with self._lock:
+            if value is _MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value, ttl: float):
+        self.local.set(key, value, ttl)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value, ttl)
+            except Exception as e:
+                print(f"Error writing shared cache: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "local_entries": len(self.local),
+            "local_tags": len(self.local_tags),
+            "shared_tier": self.shared is not None,
+        }
+
+
+# Entries copied down from the shared tier are kept locally only briefly
+_SHARED_HIT_LOCAL_TTL = 5
+
+
+def _default_shared_tier():
+    if not CACHE_URL:
+        return None
+    if redis is None:
+        print("SUPABASE_CACHE_URL is set but the redis package is not installed; using the local cache only")
+        return None
+    return RedisCache(redis.Redis.from_url(CACHE_URL))
+
+
+default_cache = TieredCache(shared=_default_shared_tier())
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == [] or value == {} or value is False
+
+
+def cached(ttl: float, tags=(), cache: TieredCache = None, cache_empty: bool = False):
+    """
+    Cache a read function's results.
+
+    Args:
+        ttl: Seconds an entry stays valid
+        tags: Tag templates formatted with the call's arguments, e.g. "user:{user_id}"
+        cache: TieredCache to use (default: default_cache)
+        cache_empty: Also cache None / [] / {} / False results. Off by default
+                     because service reads return those on errors.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            target = cache or default_cache
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            resolved_tags = [tag.format(**arguments) for tag in tags]
+            key = "{}:{}:{}".format(
+                name,
+                json.dumps(arguments, sort_keys=True, default=str),
+                ".".join(str(version) for version in target.tag_versions(resolved_tags)),
+            )
+
+            value = target.get(key)
+            if value is not _MISS:
+                return value
+            value = fn(*args, **kwargs)
+            if cache_empty or not _is_empty(value):
+                target.set(key, value, ttl)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+def invalidate(*tags):
+    """Invalidate cached reads by tag (call from write functions)"""
+    default_cache.invalidate(*tags)
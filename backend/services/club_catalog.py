@@ -0,0 +1,166 @@
+"""
+Process-wide cache of the Clubs table.
+
+The catalog only changes when add_club or an ingestion script writes, so the
+full table is loaded once and served from memory until the TTL expires or the
+"clubs" version is bumped (see services/versions.py). Writers outside the
+server process call invalidate_club_catalog() after they write; that reaches
+the server processes only when the writer runs on the same host (or shares
+MOTIVZ_VERSION_DIR with them). Writes made anywhere else show up once
+CLUB_CATALOG_TTL_SECONDS has passed.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+
+from services.versions import bump_version, get_version
+
+CLUBS_VERSION_SCOPE = "clubs"
+CLUB_CATALOG_TTL_SECONDS = int(os.getenv("CLUB_CATALOG_TTL_SECONDS", "600"))
+
+
+def invalidate_club_catalog():
+    """Mark the club catalog stale in every process on this host (call after writing to Clubs)"""
+    return bump_version(CLUBS_VERSION_SCOPE)
+
+
+def content_hash(data) -> str:
+    """Stable hash of JSON-serialisable data (used as a strong ETag)"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class ClubCatalog:
+    """All club rows indexed by id, reloaded on TTL expiry or version change"""
+
+    def __init__(self, loader, ttl_seconds: int = CLUB_CATALOG_TTL_SECONDS):
+        """
+        Args:
+            loader: Callable returning every row of the Clubs table
+            ttl_seconds: Maximum age of the cached rows; 0 disables caching
+        """
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._rows = []
+        self._by_id = {}
+        self._page_keys = []   # str(id) of every row, sorted (keyset pagination)
+        self._page_rows = []   # rows in _page_keys order
+        self._columns = set()
+        self._loaded_at = None
+        self._loaded_version = None
+        self._listeners = []
+        self.etag = None
+        self.hits = 0
+        self.misses = 0
+
+    def is_fresh(self) -> bool:
+        """Whether the cached rows can be served without reloading"""
+        if self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            return False
+        return get_version(CLUBS_VERSION_SCOPE) == self._loaded_version
+
+    def subscribe(self, listener):
+        """Call listener(rows) after every reload (used to keep indexes in sync)"""
+        self._listeners.append(listener)
+
+    def load(self, rows: list, version: int):
+        """
+        Install freshly fetched rows.
+
+        Args:
+            rows: Every row of the Clubs table
+            version: The "clubs" version read *before* the rows were fetched
+        """
+        with self._lock:
+            self._rows = rows
+            self._by_id = {row["id"]: row for row in rows}
+            ordered = sorted(rows, key=lambda row: str(row["id"]))
+            self._page_keys = [str(row["id"]) for row in ordered]
+            self._page_rows = ordered
+            self._columns = set().union(*(row.keys() for row in rows))
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+            self.etag = content_hash(rows)
+            for listener in self._listeners:
+                listener(rows)
+
+    def ensure_loaded(self):
+        """Reload the rows if they are missing, expired, or invalidated"""
+        if self.is_fresh():
+            self.hits += 1
+            return
+        with self._lock:
+            if self.is_fresh():
+                self.hits += 1
+                return
+            self.misses += 1
+            version = get_version(CLUBS_VERSION_SCOPE)
+            self.load(self._loader() or [], version)
+
+    def all(self) -> list:
+        """Every club row (copies, safe for callers to annotate)"""
+        self.ensure_loaded()
+        return [dict(row) for row in self._rows]
+
+    def get(self, club_id: str):
+        """A single club row by id, or None if it is not in the catalog"""
+        self.ensure_loaded()
+        row = self._by_id.get(club_id)
+        return dict(row) if row else None
+
+    def columns(self) -> set:
+        """Column names present in the cached rows"""
+        self.ensure_loaded()
+        return set(self._columns)
+
+    def page(self, after: str = None, limit: int = 50, fields: list = None) -> tuple:
+        """
+        One page of clubs ordered by id (keyset pagination), served from memory.
+
+        Args:
+            after: Return clubs with an id greater than this cursor
+            limit: Maximum number of clubs to return
+            fields: Columns to keep (None or ["*"] for every column)
+
+        Returns:
+            tuple: (clubs (copies), next_cursor) where next_cursor is None on the last page
+        """
+        self.ensure_loaded()
+        with self._lock:
+            start = bisect.bisect_right(self._page_keys, str(after)) if after else 0
+            rows = self._page_rows[start:start + limit]
+            has_more = start + limit < len(self._page_rows)
+        if fields and "*" not in fields:
+            clubs = [{field: row.get(field) for field in fields} for row in rows]
+        else:
+            clubs = [dict(row) for row in rows]
+        next_cursor = rows[-1]["id"] if has_more and rows else None
+        return clubs, next_cursor
+
+    def row_etag(self, club_id: str):
+        """Content hash of a single club row, or None if it is not in the catalog"""
+        self.ensure_loaded()
+        row = self._by_id.get(club_id)
+        return content_hash(row) if row else None
+
+    def invalidate(self):
+        """Drop the cached rows here and in every other process on this host"""
+        with self._lock:
+            self._loaded_at = None
+        invalidate_club_catalog()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._rows),
+            "ttl_seconds": self.ttl_seconds
+        }
@@ -0,0 +1,111 @@
+"""
+Spatial index over club coordinates for "clubs near me" queries.
+
+Clubs are bucketed into a fixed latitude/longitude grid. A radius query only
+visits the grid cells overlapping the radius' bounding box (split in two when
+it crosses the antimeridian) and computes exact great-circle distances for the
+clubs in those cells.
+"""
+
+import math
+import threading
+
+EARTH_RADIUS_M = 6371000
+CELL_DEGREES = 0.01  # ~1.1 km of latitude, ~0.8 km of longitude in Toronto
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lng: float) -> tuple:
+    return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+
+def _lng_ranges(lng: float, lng_delta: float) -> list:
+    """(min, max) longitude ranges within lng_delta of lng, split at the antimeridian"""
+    if lng_delta >= 180:
+        return [(-180, 180)]
+    low, high = lng - lng_delta, lng + lng_delta
+    if low < -180:
+        return [(-180, high), (low + 360, 180)]
+    if high > 180:
+        return [(low, 180), (-180, high - 360)]
+    return [(low, high)]
+
+
+def _coordinates(club: dict):
+    """(lat, lng) for a club, or None if it has no usable coordinates"""
+    try:
+        lat, lng = float(club["latitude"]), float(club["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+class ClubGeoIndex:
+    """Grid index of clubs by latitude/longitude"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells = {}  # (lat cell, lng cell) -> list of (lat, lng, club row)
+
+    def sync(self, clubs: list):
+        """Rebuild the grid from a fresh catalog load"""
+        cells = {}
+        for club in clubs:
+            point = _coordinates(club)
+            if point:
+                cells.setdefault(_cell(*point), []).append((point[0], point[1], club))
+        with self._lock:
+            self._cells = cells
+
+    def within_bounds(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> list:
+        """(lat, lng, club) entries inside a bounding box"""
+        min_cell = _cell(min_lat, min_lng)
+        max_cell = _cell(max_lat, max_lng)
+        with self._lock:
+            cells = self._cells
+
+        entries = []
+        for lat_cell in range(min_cell[0], max_cell[0] + 1):
+            for lng_cell in range(min_cell[1], max_cell[1] + 1):
+                for lat, lng, club in cells.get((lat_cell, lng_cell), ()):
+                    if min_lat <= lat <= max_lat and min_lng <= lng <= max_lng:
+                        entries.append((lat, lng, club))
+        return entries
+
+    def nearby(self, lat: float, lng: float, radius_m: float, limit: int = 20) -> list:
+        """
+        Clubs within radius_m of a point, nearest first.
+
+        Returns:
+            list: Club rows (copies) with an added "distance_m" field
+        """
+        lat_delta = math.degrees(radius_m / EARTH_RADIUS_M)
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        lng_delta = min(math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat)), 180)
+
+        results = []
+        for min_lng, max_lng in _lng_ranges(lng, lng_delta):
+            for club_lat, club_lng, club in self.within_bounds(
+                lat - lat_delta, min_lng, lat + lat_delta, max_lng
+            ):
+                distance = haversine_m(lat, lng, club_lat, club_lng)
+                if distance <= radius_m:
+                    results.append((distance, club))
+
+        results.sort(key=lambda item: item[0])
+        nearby_clubs = []
+        for distance, club in results[:limit]:
+            club = dict(club)
+            club["distance_m"] = round(distance)
+            nearby_clubs.append(club)
+        return nearby_clubs
@@ -0,0 +1,199 @@
+"""
+In-memory search index over the club catalog.
+
+Club names and addresses are split into lowercase tokens. A query matches a
+club when every query token is a prefix of one of the club's tokens. When that
+finds too few clubs, the old substring match on the name or address is added
+(so "bel" still finds "Rebel"), then name tokens within a small edit distance
+are tried so typos like "rebl" still find "Rebel". Results are ranked the way
+search_clubs always has: names starting with the query first, then
+alphabetically, with typo matches last.
+"""
+
+import bisect
+import re
+import threading
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens of a string"""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _max_typos(token: str) -> int:
+    """Edit distance tolerated for a query token of this length"""
+    if len(token) < 4:
+        return 0
+    if len(token) < 8:
+        return 1
+    return 2
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance between a and b is at most limit (banded DP)"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class ClubSearchIndex:
+    """Token/prefix index over club Name and Address, updated incrementally"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clubs = {}         # club_id -> club row
+        self._club_tokens = {}   # club_id -> (name tokens, all tokens)
+        self._club_text = {}     # club_id -> (lowercase name, lowercase address)
+        self._postings = {}      # token -> set of club ids
+        self._name_postings = {} # name token -> set of club ids
+        self._sorted_tokens = [] # every token in _postings, sorted for prefix lookup
+
+    def _index(self, club: dict):
+        club_id = club["id"]
+        name_tokens = set(tokenize(club.get("Name", "")))
+        all_tokens = name_tokens | set(tokenize(club.get("Address", "")))
+        self._clubs[club_id] = club
+        self._club_tokens[club_id] = (name_tokens, all_tokens)
+        self._club_text[club_id] = ((club.get("Name") or "").lower(), (club.get("Address") or "").lower())
+
+        for token in all_tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                bisect.insort(self._sorted_tokens, token)
+            self._postings[token].add(club_id)
+        for token in name_tokens:
+            self._name_postings.setdefault(token, set()).add(club_id)
+
+    def _unindex(self, club_id: str):
+        self._clubs.pop(club_id, None)
+        name_tokens, all_tokens = self._club_tokens.pop(club_id, (set(), set()))
+        self._club_text.pop(club_id, None)
+
+        for token in all_tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(club_id)
+            if not postings:
+                del self._postings[token]
+                position = bisect.bisect_left(self._sorted_tokens, token)
+                del self._sorted_tokens[position]
+        for token in name_tokens:
+            postings = self._name_postings.get(token)
+            if postings is not None:
+                postings.discard(club_id)
+                if not postings:
+                    del self._name_postings[token]
+
+    def upsert(self, club: dict):
+        """Add or re-index a single club"""
+        with self._lock:
+            self._unindex(club["id"])
+            self._index(club)
+
+    def remove(self, club_id: str):
+        """Drop a club from the index"""
+        with self._lock:
+            self._unindex(club_id)
+
+    def sync(self, clubs: list):
+        """
+        Bring the index in line with a fresh catalog load, touching only clubs
+        that were added, removed, or had their Name/Address changed.
+        """
+        with self._lock:
+            current = {club["id"]: club for club in clubs}
+            for club_id in list(self._clubs):
+                if club_id not in current:
+                    self._unindex(club_id)
+            for club_id, club in current.items():
+                existing = self._clubs.get(club_id)
+                if existing is None:
+                    self._index(club)
+                elif (existing.get("Name"), existing.get("Address")) != (club.get("Name"), club.get("Address")):
+                    self._unindex(club_id)
+                    self._index(club)
+                else:
+                    self._clubs[club_id] = club
+
+    def _prefix_matches(self, token: str) -> set:
+        """Club ids having any token that starts with `token`"""
+        matches = set()
+        position = bisect.bisect_left(self._sorted_tokens, token)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(token):
+            matches |= self._postings[self._sorted_tokens[position]]
+            position += 1
+        return matches
+
+    def _substring_matches(self, query: str) -> set:
+        """Club ids whose name or address contains the whole query"""
+        return {
+            club_id for club_id, (name, address) in self._club_text.items()
+            if query in name or query in address
+        }
+
+    def _fuzzy_matches(self, token: str) -> set:
+        """Club ids with a name token within the typo allowance of `token`"""
+        limit = _max_typos(token)
+        if not limit:
+            return set()
+        matches = set()
+        for name_token, club_ids in self._name_postings.items():
+            # Compare against the same-length prefix too, so "rebl" finds "rebels"
+            candidate = name_token[:len(token) + limit]
+            if _within_distance(token, candidate, limit) or _within_distance(token, name_token, limit):
+                matches |= club_ids
+        return matches
+
+    def _match(self, query_tokens: list, matcher) -> set:
+        result = None
+        for token in query_tokens:
+            matches = matcher(token)
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """
+        Search clubs by name or address.
+
+        Returns:
+            list: Matching club rows (copies), best matches first
+        """
+        query_lower = query.lower().strip()
+        query_tokens = tokenize(query_lower)
+        if not query_tokens:
+            return []
+
+        def rank(club_id):
+            name = self._clubs[club_id].get("Name", "").lower()
+            return (not name.startswith(query_lower), name)
+
+        with self._lock:
+            exact = self._match(query_tokens, self._prefix_matches)
+            if len(exact) < limit:
+                exact |= self._substring_matches(query_lower)
+            ranked = sorted(exact, key=rank)
+
+            if len(ranked) < limit:
+                fuzzy = self._match(query_tokens, lambda t: self._prefix_matches(t) | self._fuzzy_matches(t))
+                ranked.extend(sorted(fuzzy - exact, key=rank))
+
+            return [dict(self._clubs[club_id]) for club_id in ranked[:limit]]
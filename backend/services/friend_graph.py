@@ -0,0 +1,295 @@
+"""
+Friend graph and friend lists for the users endpoints.
+
+The friendships table is held in memory as adjacency sets (FriendGraph), so
+mutual friends and friend-of-friend suggestions are set operations. The
+graph is loaded with one bulk query and reloaded on TTL expiry; the
+friendship write views patch it in place when this process has it loaded,
+without invalidating other processes (they, and the app's direct writes,
+catch up on the TTL reload). Because the graph can lag, friendship status,
+the duplicate-request check and friend lists are point queries instead
+(get_friendship_status, get_friend_ids).
+
+Friend profiles are then hydrated with one `in_` query using the narrow
+FRIEND_PROFILE_FIELDS projection (chunked so very large lists stay under URL
+limits) and cached per user (see services/cache.py). Friendship writes
+invalidate "friends:<user_id>"; profile and check-in writes invalidate
+"friend-profiles:<friend_id>" for each of the user's friends.
+"""
+
+import os
+import threading
+import time
+
+from services.cache import cached, invalidate as invalidate_cache
+from services.presence import get_presence_index
+from services.supabase_service import _fetch_all_rows, supabase
+from services.versions import get_version
+
+FRIENDSHIPS_VERSION_SCOPE = "friendships"
+FRIEND_GRAPH_TTL_SECONDS = int(os.getenv("FRIEND_GRAPH_TTL_SECONDS", "600"))
+
+# Columns the friends screens render (see frontend fetchUserFriends)
+FRIEND_PROFILE_FIELDS = "id,username,first_name,last_name,avatar_url,active_club_id,active_club_closed,last_active"
+
+# Status written by accept_friend_request_view
+ACCEPTED_STATUS = "accepted"
+
+HYDRATE_CHUNK_SIZE = 150
+
+
+def _pair(user_a: str, user_b: str) -> tuple:
+    return (user_a, user_b) if user_a <= user_b else (user_b, user_a)
+
+
+class FriendGraph:
+    """Adjacency sets over the friendships table"""
+
+    def __init__(self, loader, ttl_seconds: int = FRIEND_GRAPH_TTL_SECONDS):
+        """
+        Args:
+            loader: Callable returning every friendships row (requester_id, receiver_id, status)
+            ttl_seconds: Maximum age of the loaded graph
+        """
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._edges = {}    # (user, user) sorted pair -> (requester_id, status)
+        self._friends = {}  # user_id -> set of accepted friend ids
+        self._loaded_at = None
+        self._loaded_version = None
+
+    def is_fresh(self) -> bool:
+        """Whether the graph can be served without reloading"""
+        if self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            return False
+        return get_version(FRIENDSHIPS_VERSION_SCOPE) == self._loaded_version
+
+    def load(self, rows: list, version: int):
+        """Install freshly fetched friendships rows (version read before the fetch)"""
+        edges = {}
+        friends = {}
+        for row in rows:
+            requester_id, receiver_id = row.get("requester_id"), row.get("receiver_id")
+            if not requester_id or not receiver_id or requester_id == receiver_id:
+                continue
+            edges[_pair(requester_id, receiver_id)] = (requester_id, row.get("status"))
+            if row.get("status") == ACCEPTED_STATUS:
+                friends.setdefault(requester_id, set()).add(receiver_id)
+                friends.setdefault(receiver_id, set()).add(requester_id)
+
+        with self._lock:
+            self._edges = edges
+            self._friends = friends
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        """Reload the graph if it is missing, expired, or invalidated"""
+        if self.is_fresh():
+            return
+        with self._lock:
+            if self.is_fresh():
+                return
+            version = get_version(FRIENDSHIPS_VERSION_SCOPE)
+            self.load(self._loader() or [], version)
+
+    def set_edge(self, requester_id: str, receiver_id: str, status: str):
+        """Record a new or updated friendship (after the database write; a cold graph reads it on load)"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._edges[_pair(requester_id, receiver_id)] = (requester_id, status)
+            if status == ACCEPTED_STATUS:
+                self._friends.setdefault(requester_id, set()).add(receiver_id)
+                self._friends.setdefault(receiver_id, set()).add(requester_id)
+
+    def remove_edge(self, user_a: str, user_b: str):
+        """Forget a friendship in either direction (after the database delete)"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._edges.pop(_pair(user_a, user_b), None)
+            self._friends.get(user_a, set()).discard(user_b)
+            self._friends.get(user_b, set()).discard(user_a)
+
+    def friends_of(self, user_id: str) -> set:
+        """Accepted friend ids of a user (a copy)"""
+        self.ensure_loaded()
+        with self._lock:
+            return set(self._friends.get(user_id, ()))
+
+    def mutual_friends(self, user_a: str, user_b: str) -> set:
+        """Friends two users have in common"""
+        self.ensure_loaded()
+        with self._lock:
+            return self._friends.get(user_a, set()) & self._friends.get(user_b, set())
+
+    def network(self, user_id: str) -> set:
+        """Friends and friends-of-friends of a user (excluding the user)"""
+        self.ensure_loaded()
+        with self._lock:
+            friends = self._friends.get(user_id, set())
+            network = set(friends)
+            for friend_id in friends:
+                network |= self._friends.get(friend_id, set())
+        network.discard(user_id)
+        return network
+
+    def suggestions(self, user_id: str, limit: int = 10) -> list:
+        """
+        Friend-of-friend suggestions, most mutual friends first.
+
+        Returns:
+            list: (user_id, mutual friend count) tuples, excluding existing
+                  friends and users with a pending request either way
+        """
+        self.ensure_loaded()
+        with self._lock:
+            friends = self._friends.get(user_id, set())
+            counts = {}
+            for friend_id in friends:
+                for candidate in self._friends.get(friend_id, ()):
+                    if candidate == user_id or candidate in friends:
+                        continue
+                    counts[candidate] = counts.get(candidate, 0) + 1
+            candidates = [
+                (candidate, count) for candidate, count in counts.items()
+                if _pair(user_id, candidate) not in self._edges
+            ]
+        candidates.sort(key=lambda item: (-item[1], item[0]))
+        return candidates[:limit]
+
+
+# Whole friendships table as adjacency sets, kept current by the friendship views
+_friend_graph = FriendGraph(
+    loader=lambda: _fetch_all_rows(
+        lambda: supabase.table("friendships").select("requester_id,receiver_id,status")
+    )
+)
+
+
+def get_friend_graph() -> FriendGraph:
+    return _friend_graph
+
+
+def _other_side(friendship: dict, user_id: str) -> str:
+    if friendship["requester_id"] == user_id:
+        return friendship["receiver_id"]
+    return friendship["requester_id"]
+
+
+def get_friend_ids(user_id: str) -> list:
+    """Ids of a user's accepted friends (one edge query, deduplicated)"""
+    response = supabase.table("friendships").select(
+        "requester_id,receiver_id"
+    ).or_(f"requester_id.eq.{user_id},receiver_id.eq.{user_id}").eq("status", ACCEPTED_STATUS).execute()
+
+    friend_ids = []
+    seen = set()
+    for friendship in response.data or []:
+        friend_id = _other_side(friendship, user_id)
+        if friend_id not in seen and friend_id != user_id:
+            seen.add(friend_id)
+            friend_ids.append(friend_id)
+    return friend_ids
+
+
+def get_friendship_status(current_user_id: str, target_user_id: str) -> dict:
+    """Friendship status between two users, read from Supabase (as returned by the status endpoint)"""
+    response = supabase.table("friendships").select("requester_id,status").or_(
+        f"and(requester_id.eq.{current_user_id},receiver_id.eq.{target_user_id}),"
+        f"and(requester_id.eq.{target_user_id},receiver_id.eq.{current_user_id})"
+    ).limit(1).execute()
+    if not response.data:
+        return {"status": "none", "is_requester": False}
+    friendship = response.data[0]
+    return {"status": friendship["status"], "is_requester": friendship["requester_id"] == current_user_id}
+
+
+def hydrate_profiles(user_ids: list, fields: str = FRIEND_PROFILE_FIELDS) -> list:
+    """
+    Profiles for a list of user ids, in the order given.
+
+    Args:
+        user_ids: Profile ids (duplicates are fetched once)
+        fields: Column projection
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    profiles_by_id = {}
+    for start in range(0, len(unique_ids), HYDRATE_CHUNK_SIZE):
+        chunk = unique_ids[start:start + HYDRATE_CHUNK_SIZE]
+        response = supabase.table("profiles").select(fields).in_("id", chunk).execute()
+        for profile in response.data or []:
+            profiles_by_id[profile["id"]] = profile
+    return [profiles_by_id[user_id] for user_id in unique_ids if user_id in profiles_by_id]
+
+
+@cached(ttl=60, tags=("friends:{user_id}", "friend-profiles:{user_id}"), cache_empty=True)
+def get_friends(user_id: str) -> list:
+    """A user's accepted friends as narrow profile rows"""
+    return hydrate_profiles(get_friend_ids(user_id))
+
+
+def get_friends_attending(club_id: str, user_id: str, fields: str = "id,username,avatar_url") -> list:
+    """Friends of a user currently checked into a club (friend set ∩ venue presence)"""
+    attending_ids = get_presence_index().present_among(club_id, set(get_friend_ids(user_id)))
+    if not attending_ids:
+        return []
+    return hydrate_profiles(sorted(attending_ids), fields)
+
+
+def get_suggestions(user_id: str, limit: int = 10) -> list:
+    """Friend-of-friend profiles with a "mutual_friends" count"""
+    ranked = _friend_graph.suggestions(user_id, limit)
+    mutual_counts = dict(ranked)
+    suggestions = []
+    for profile in hydrate_profiles([candidate for candidate, _ in ranked]):
+        suggestion = dict(profile)
+        suggestion["mutual_friends"] = mutual_counts[profile["id"]]
+        suggestions.append(suggestion)
+    return suggestions
+
+
+@cached(ttl=60, tags=("friends:{user_id}",), cache_empty=True)
+def get_pending_requests(user_id: str) -> list:
+    """Profiles of users with a pending friend request to user_id"""
+    response = supabase.table("friendships").select(
+        "requester_id"
+    ).eq("receiver_id", user_id).eq("status", "pending").execute()
+    return hydrate_profiles([friendship["requester_id"] for friendship in response.data or []])
+
+
+def get_friends_active_clubs(user_id: str) -> list:
+    """Friends who are checked into a club, with the club attached"""
+    from services.supabase_service import get_club_by_id
+
+    active_clubs = []
+    for profile in get_friends(user_id):
+        if not profile.get("active_club_id"):
+            continue
+        club = get_club_by_id(profile["active_club_id"])
+        if club:
+            active_clubs.append({
+                "user_id": profile["id"],
+                "username": profile["username"],
+                "avatar_url": profile["avatar_url"],
+                "club": club,
+                "expires_at": profile["active_club_closed"]
+            })
+    return active_clubs
+
+
+def invalidate_friendship(*user_ids):
+    """Call after creating, accepting or deleting a friendship"""
+    invalidate_cache(*[f"friends:{user_id}" for user_id in user_ids])
+
+
+def invalidate_profile(user_id: str):
+    """Call after a profile or check-in change so friends see it"""
+    try:
+        invalidate_cache(*[f"friend-profiles:{friend_id}" for friend_id in get_friend_ids(user_id)])
+    except Exception as e:
+        print(f"Error invalidating friend profiles for {user_id}: {e}")
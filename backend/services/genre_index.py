@@ -0,0 +1,140 @@
+"""
+Inverted index from (genre, day_of_week) to the clubs playing that genre.
+
+ClubMusicSchedules stores one row per club and day (day 0 = Sunday) with a
+numeric column per genre, written by music_schedule.py / update_music_vars.py
+(10 = playing, 0 = not). The index is loaded from one bulk query and keeps a
+Python int bitset per (genre, day), so multi-genre filters are bitwise
+OR/AND instead of per-club lookups.
+
+Genre names are matched by normalize_genre (case, spaces, "-" and "_"
+ignored), so the app's "Top40" finds the "Top 40" column. Genres without a
+column (e.g. "Rock") are ignored rather than matching nothing.
+"""
+
+import threading
+import time
+
+from services.versions import bump_version, get_version
+
+MUSIC_VERSION_SCOPE = "music"
+
+# Genre columns of ClubMusicSchedules (see music_schedule.ALL_GENRES)
+GENRE_COLUMNS = [
+    "HipHop", "Pop", "Soul", "Rap", "House", "Latin", "EDM", "Jazz",
+    "Country", "Blues", "DanceHall", "Afrobeats", "Top 40", "Amapiano",
+    "90's", "2000's", "2010's", "R&B"
+]
+
+
+def normalize_genre(name: str) -> str:
+    """Lookup key for a genre name: lowercase without spaces, "-" or "_" """
+    return "".join(ch for ch in str(name).lower() if ch not in " -_")
+
+
+# Normalized name -> column
+GENRE_KEYS = {normalize_genre(genre): genre for genre in GENRE_COLUMNS}
+
+
+def known_genres(genres: list) -> list:
+    """Normalized keys of the genres that have a column, unknown names dropped"""
+    keys = []
+    for genre in genres:
+        key = normalize_genre(genre)
+        if key in GENRE_KEYS and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def invalidate_genre_index():
+    """Mark every process's genre index as stale (call after writing ClubMusicSchedules)"""
+    return bump_version(MUSIC_VERSION_SCOPE)
+
+
+class GenreIndex:
+    """(genre, day_of_week) -> bitset of clubs, reloaded on TTL expiry or version change"""
+
+    def __init__(self, loader, ttl_seconds: int = 900):
+        """
+        Args:
+            loader: Callable returning every ClubMusicSchedules row
+            ttl_seconds: Maximum age of the loaded index
+        """
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._club_ids = []  # bit position -> club_id
+        self._bitsets = {}   # (normalized genre, day) -> int bitset
+        self._loaded_at = None
+        self._loaded_version = None
+
+    def is_fresh(self) -> bool:
+        """Whether the index can be served without reloading"""
+        if self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            return False
+        return get_version(MUSIC_VERSION_SCOPE) == self._loaded_version
+
+    def build(self, rows: list):
+        """Rebuild the bitsets from ClubMusicSchedules rows"""
+        positions = {}
+        club_ids = []
+        bitsets = {}
+        for row in rows:
+            club_id = row.get("club_id")
+            try:
+                day = int(row.get("day_of_week"))
+            except (TypeError, ValueError):
+                continue
+            if club_id not in positions:
+                positions[club_id] = len(club_ids)
+                club_ids.append(club_id)
+            bit = 1 << positions[club_id]
+            for key, genre in GENRE_KEYS.items():
+                if (row.get(genre) or 0) > 0:
+                    bitsets[(key, day)] = bitsets.get((key, day), 0) | bit
+
+        with self._lock:
+            self._club_ids = club_ids
+            self._bitsets = bitsets
+
+    def load(self, rows: list, version: int):
+        """Install freshly fetched rows (version read before the fetch)"""
+        self.build(rows)
+        self._loaded_version = version
+        self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        """Reload the index if it is missing, expired, or invalidated"""
+        if self.is_fresh():
+            return
+        version = get_version(MUSIC_VERSION_SCOPE)
+        self.load(self._loader() or [], version)
+
+    def clubs_playing(self, genres: list, day: int, match_all: bool = False) -> set:
+        """
+        Club ids playing the given genres on a day.
+
+        Args:
+            genres: Genre names (see normalize_genre); unknown genres are ignored
+            day: Day of week (0 = Sunday)
+            match_all: Require every genre (AND) instead of any genre (OR)
+        """
+        keys = known_genres(genres)
+        with self._lock:
+            bitsets = [self._bitsets.get((key, day), 0) for key in keys]
+            club_ids = self._club_ids
+
+        if not bitsets:
+            return set()
+        combined = bitsets[0]
+        for bitset in bitsets[1:]:
+            combined = combined & bitset if match_all else combined | bitset
+
+        matches = set()
+        while combined:
+            lowest = combined & -combined
+            matches.add(club_ids[lowest.bit_length() - 1])
+            combined ^= lowest
+        return matches
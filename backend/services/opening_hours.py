@@ -0,0 +1,140 @@
+"""
+Opening-hours engine for clubs.
+
+A club's "hours" JSON holds Google-style periods:
+
+    {"open": {"day": 5, "hour": 22, "minute": 0},
+     "close": {"day": 6, "hour": 3, "minute": 0}}
+
+with day 0 = Sunday (Google's encoding), as written by
+populate_clubs.Club.to_dict and by add_club_complete.parse_hours_input, which
+reads Monday-first day names and converts them. Each club's periods are compiled once into
+a sorted list of minute-of-week intervals (splitting periods that wrap from
+Saturday into Sunday), so "open at T" is a binary search and the closing time
+is read straight off the matching interval.
+"""
+
+import bisect
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Club hours are local wall-clock times
+CLUB_TIMEZONE = ZoneInfo(os.getenv("CLUB_TIMEZONE", "America/Toronto"))
+
+
+def _minute_of_week(point: dict) -> int:
+    return point.get("day", 0) * MINUTES_PER_DAY + point.get("hour", 0) * 60 + point.get("minute", 0)
+
+
+def _local_minute_of_week(at: datetime) -> tuple:
+    """(local datetime truncated to the minute, minute of week with Sunday = 0)"""
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    local = at.astimezone(CLUB_TIMEZONE).replace(second=0, microsecond=0)
+    day = (local.weekday() + 1) % 7  # Python's Monday = 0 -> Google's Sunday = 0
+    return local, day * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+
+class CompiledHours:
+    """A club's opening hours as sorted, non-overlapping minute-of-week intervals"""
+
+    def __init__(self, intervals: list):
+        self.starts = [start for start, _ in intervals]
+        self.ends = [end for _, end in intervals]
+
+    @classmethod
+    def from_hours(cls, hours):
+        """Compile a club's hours JSON (returns an always-closed schedule if missing)"""
+        periods = (hours or {}).get("periods") or []
+        intervals = []
+        for period in periods:
+            if not period.get("open"):
+                continue
+            start = _minute_of_week(period["open"])
+            if not period.get("close"):
+                # Google's encoding for open 24/7
+                intervals.append((0, MINUTES_PER_WEEK))
+                continue
+            end = _minute_of_week(period["close"])
+            if end <= start:
+                end += MINUTES_PER_WEEK  # Overnight or Saturday -> Sunday wrap
+            if end > MINUTES_PER_WEEK:
+                intervals.append((start, MINUTES_PER_WEEK))
+                intervals.append((0, end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((start, end))
+
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return cls(merged)
+
+    def _interval_at(self, minute: int):
+        index = bisect.bisect_right(self.starts, minute) - 1
+        if index >= 0 and minute < self.ends[index]:
+            return index
+        return None
+
+    def is_open_at(self, at: datetime) -> bool:
+        """Whether the club is open at a given time"""
+        _, minute = _local_minute_of_week(at)
+        return self._interval_at(minute) is not None
+
+    def closing_time(self, at: datetime):
+        """
+        When the current opening period ends.
+
+        Returns:
+            datetime: Aware local closing time, or None if closed at `at`
+                      (or open around the clock)
+        """
+        local, minute = _local_minute_of_week(at)
+        index = self._interval_at(minute)
+        if index is None:
+            return None
+
+        end = self.ends[index]
+        if end == MINUTES_PER_WEEK and self.starts and self.starts[0] == 0:
+            # Period continues past Saturday midnight into Sunday
+            if self.ends[0] == MINUTES_PER_WEEK:
+                return None
+            end += self.ends[0]
+
+        naive_close = local.replace(tzinfo=None) + timedelta(minutes=end - minute)
+        return naive_close.replace(tzinfo=CLUB_TIMEZONE)
+
+
+class OpeningHoursIndex:
+    """Compiled opening hours for every club in the catalog"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._compiled = {}  # club_id -> CompiledHours
+
+    def sync(self, clubs: list):
+        """Recompile hours from a fresh catalog load"""
+        compiled = {club["id"]: CompiledHours.from_hours(club.get("hours")) for club in clubs}
+        with self._lock:
+            self._compiled = compiled
+
+    def get(self, club_id: str):
+        with self._lock:
+            return self._compiled.get(club_id)
+
+    def is_open(self, club_id: str, at: datetime = None) -> bool:
+        """Whether a club is open at `at` (default now); unknown clubs are closed"""
+        hours = self.get(club_id)
+        return bool(hours) and hours.is_open_at(at or datetime.now(timezone.utc))
+
+    def closing_time(self, club_id: str, at: datetime = None):
+        """Closing time of the club's current opening period, or None"""
+        hours = self.get(club_id)
+        return hours.closing_time(at or datetime.now(timezone.utc)) if hours else None
@@ -0,0 +1,199 @@
+"""
+Venue presence index: which users are checked into which club, and how many.
+
+Loaded from profiles.active_club_id / active_club_closed with one bulk query
+over checked-in users only, and updated in place by the check-in view and
+the attendance sweeper of the process that made the write. Writes do not
+invalidate other processes (a check-in would cost every worker a full
+reload): they, and the app's direct profile writes, are picked up by the
+short TTL reload (PRESENCE_TTL_SECONDS), which reconciles the occupancy
+counters with the database.
+
+Users whose attendance has expired are dropped from the counters on read
+(an expiry heap is drained up to the current time), so occupancy agrees with
+present() even when no sweeper has cleared their profile yet.
+"""
+
+import heapq
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from services.club_catalog import content_hash
+from services.trending import parse_timestamp
+from services.versions import get_version
+
+PRESENCE_VERSION_SCOPE = "presence"
+PRESENCE_TTL_SECONDS = int(os.getenv("PRESENCE_TTL_SECONDS", "60"))
+
+
+def _expires_at(value):
+    """Aware expiry time from an active_club_closed value (None = no expiry)"""
+    if not value:
+        return None
+    try:
+        return parse_timestamp(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PresenceIndex:
+    """club_id -> set of present user ids, with per-user expiry"""
+
+    def __init__(self, loader, ttl_seconds: int = PRESENCE_TTL_SECONDS):
+        """
+        Args:
+            loader: Callable returning profiles rows (id, active_club_id, active_club_closed)
+                    for checked-in users
+            ttl_seconds: Maximum age of the loaded index
+        """
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._present = {}  # club_id -> set of user ids
+        self._users = {}    # user_id -> (club_id, expires_at)
+        self._counts = {}   # club_id -> occupancy
+        self._expiries = [] # heap of (expires_at, user_id); stale entries skipped
+        self._loaded_at = None
+        self._loaded_version = None
+
+    def is_fresh(self) -> bool:
+        """Whether the index can be served without reloading"""
+        if self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            return False
+        return get_version(PRESENCE_VERSION_SCOPE) == self._loaded_version
+
+    def load(self, rows: list, version: int):
+        """Install freshly fetched profiles rows (version read before the fetch)"""
+        present = {}
+        users = {}
+        expiries = []
+        for row in rows:
+            club_id = row.get("active_club_id")
+            if not club_id:
+                continue
+            expires_at = _expires_at(row.get("active_club_closed"))
+            users[row["id"]] = (club_id, expires_at)
+            present.setdefault(club_id, set()).add(row["id"])
+            if expires_at is not None:
+                expiries.append((expires_at, row["id"]))
+        heapq.heapify(expiries)
+
+        with self._lock:
+            self._present = present
+            self._users = users
+            self._counts = {club_id: len(members) for club_id, members in present.items()}
+            self._expiries = expiries
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        """Reload the index if it is missing, expired, or invalidated"""
+        if self.is_fresh():
+            return
+        with self._lock:
+            if self.is_fresh():
+                return
+            version = get_version(PRESENCE_VERSION_SCOPE)
+            self.load(self._loader() or [], version)
+
+    def _remove(self, user_id: str):
+        previous = self._users.pop(user_id, None)
+        if previous:
+            members = self._present.get(previous[0])
+            if members is not None and user_id in members:
+                members.discard(user_id)
+                self._counts[previous[0]] -= 1
+                if not members:
+                    del self._present[previous[0]]
+                    del self._counts[previous[0]]
+
+    def _expire_due(self):
+        """Drop users whose attendance has expired from the counters"""
+        now = datetime.now(timezone.utc)
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, user_id = heapq.heappop(self._expiries)
+            current = self._users.get(user_id)
+            if current is not None and current[1] == expires_at:  # Not re-checked-in since
+                self._remove(user_id)
+
+    def check_in(self, user_id: str, club_id: str, expires_at=None):
+        """Record a check-in (after the profile write succeeded; a cold index will read it on load)"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._remove(user_id)
+            expires_at = _expires_at(expires_at)
+            self._users[user_id] = (club_id, expires_at)
+            self._present.setdefault(club_id, set()).add(user_id)
+            self._counts[club_id] = self._counts.get(club_id, 0) + 1
+            if expires_at is not None:
+                heapq.heappush(self._expiries, (expires_at, user_id))
+
+    def check_out(self, *user_ids):
+        """Record that users left / their attendance was cleared"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for user_id in user_ids:
+                self._remove(user_id)
+
+    def present(self, club_id: str, at: datetime = None) -> set:
+        """Users checked into a club whose attendance has not expired"""
+        self.ensure_loaded()
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            return {
+                user_id for user_id in self._present.get(club_id, ())
+                if self._users[user_id][1] is None or self._users[user_id][1] > at
+            }
+
+    def present_among(self, club_id: str, user_ids: set, at: datetime = None) -> set:
+        """The subset of user_ids checked into a club (smaller side drives the intersection)"""
+        self.ensure_loaded()
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            members = self._present.get(club_id, set())
+            candidates = user_ids & members if len(user_ids) < len(members) else members & user_ids
+            return {
+                user_id for user_id in candidates
+                if self._users[user_id][1] is None or self._users[user_id][1] > at
+            }
+
+    def occupancy(self, club_id: str) -> int:
+        """Number of users checked into a club whose attendance has not expired"""
+        self.ensure_loaded()
+        with self._lock:
+            self._expire_due()
+            return self._counts.get(club_id, 0)
+
+    def occupancy_all(self) -> dict:
+        """club_id -> occupancy for every club with at least one user checked in"""
+        self.ensure_loaded()
+        with self._lock:
+            self._expire_due()
+            return dict(self._counts)
+
+    def occupancy_etag(self) -> str:
+        """Content hash of the occupancy counters (changes whenever a count does)"""
+        return content_hash(sorted(self.occupancy_all().items()))
+
+
+def _load_checked_in_profiles():
+    from services.supabase_service import _fetch_all_rows, supabase
+    return _fetch_all_rows(
+        lambda: supabase.table("profiles").select(
+            "id,active_club_id,active_club_closed"
+        ).not_.is_("active_club_id", "null").order("id")
+    )
+
+
+# Who is checked in where, kept current by the check-in view and the attendance sweeper
+_presence_index = PresenceIndex(loader=_load_checked_in_profiles)
+
+
+def get_presence_index() -> PresenceIndex:
+    return _presence_index
@@ -0,0 +1,318 @@
+"""
+Recurrence expansion for recurring event templates.
+
+A template's recurring_config is compiled once into a RecurrenceRule. Both
+the legacy keys written by create_recurring_event and the RecurringConfig
+fields (types/recurring_events.py) are understood:
+
+- type / frequency: "daily", "weekly" or "monthly"
+- weekday (0 = Monday) or days_of_week (0 = Sunday, several allowed)
+- month_day (monthly; with a weekday, the first such weekday on or after it)
+- start_time / end_time ("HH:MM", default: the template's own times)
+- end_date, max_occurrences (counted from the template's start_date)
+- timezone (default CLUB_TIMEZONE)
+
+Rules are expanded over a horizon in batch: the calendar for the horizon
+(dates by weekday, months) is built once per timezone and shared by every
+template, so a weekly rule is a merge of precomputed date lists rather than
+a date-by-date walk, and occurrences before the horizon (for
+max_occurrences) are counted arithmetically.
+
+Rules are evaluated on the local wall clock of their timezone (a template's
+start_date, stored as UTC, is converted to it first), and occurrences are
+returned as aware datetimes in that timezone; callers store them as UTC.
+Wall times that do not exist on a DST spring-forward night are moved past
+the gap.
+"""
+
+import functools
+import heapq
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from services.opening_hours import CLUB_TIMEZONE
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_time(value) -> time:
+    return datetime.strptime(value, "%H:%M").time()
+
+
+def _parse_local(value, tz) -> datetime:
+    """ISO string or datetime as a naive local datetime (aware values are converted)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(tz).replace(tzinfo=None)
+    return value
+
+
+def _wall_clock(day: date, at: time, tz, transition_dates=None) -> datetime:
+    """
+    Local wall time on a date, moved forward if it falls in a DST gap.
+    Only dates in transition_dates (when given) can need the adjustment.
+    """
+    naive = datetime.combine(day, at)
+    if transition_dates is not None and day not in transition_dates:
+        return naive
+    normalized = naive.replace(tzinfo=tz).astimezone(timezone.utc).astimezone(tz)
+    return normalized.replace(tzinfo=None)
+
+
+def _add_months(year: int, month: int, months: int) -> tuple:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _count_weekdays(first: date, last_exclusive: date, weekdays: frozenset) -> int:
+    """Days in [first, last_exclusive) falling on one of the weekdays"""
+    days = (last_exclusive - first).days
+    if days <= 0:
+        return 0
+    full_weeks, remainder = divmod(days, 7)
+    start = first.weekday()
+    return full_weeks * len(weekdays) + sum(1 for offset in range(remainder) if (start + offset) % 7 in weekdays)
+
+
+class RecurrenceRule:
+    """A template's compiled recurring_config"""
+
+    def __init__(self, frequency: str, start_time: time, end_time: time, tz=CLUB_TIMEZONE,
+                 weekdays: frozenset = None, month_day: int = None, month_weekday: int = None,
+                 anchor: date = None, until: datetime = None, max_occurrences: int = None):
+        """
+        Args:
+            frequency: "daily", "weekly" or "monthly"
+            start_time / end_time: Local wall times (end <= start means the next day)
+            tz: Timezone the wall times are in
+            weekdays: Python weekdays (Monday = 0) for daily/weekly rules
+            month_day / month_weekday: Monthly day, optionally moved to the next given weekday
+            anchor: First date of the series (max_occurrences counts from here)
+            until: Last local start datetime allowed (end_date)
+            max_occurrences: Total occurrences in the series
+        """
+        self.frequency = frequency
+        self.start_time = start_time
+        self.end_time = end_time
+        self.tz = tz
+        self.weekdays = weekdays
+        self.month_day = month_day
+        self.month_weekday = month_weekday
+        self.anchor = anchor
+        self.until = until
+        self.max_occurrences = max_occurrences
+
+    @classmethod
+    def from_template(cls, event: dict):
+        """Compile an events row with a recurring_config (raises ValueError if unusable)"""
+        config = event.get("recurring_config") or {}
+        frequency = config.get("frequency") or config.get("type") or "weekly"
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unsupported recurrence frequency: {frequency}")
+        tz = ZoneInfo(config["timezone"]) if config.get("timezone") else CLUB_TIMEZONE
+
+        template_start = _parse_local(event["start_date"], tz) if event.get("start_date") else None
+        template_end = _parse_local(event["end_date"], tz) if event.get("end_date") else None
+        if config.get("start_time"):
+            start_time = _parse_time(config["start_time"])
+        elif template_start is not None:
+            start_time = template_start.time()
+        else:
+            raise ValueError("Recurring event has no start_time")
+        if config.get("end_time"):
+            end_time = _parse_time(config["end_time"])
+        elif template_end is not None:
+            end_time = template_end.time()
+        else:
+            end_time = start_time
+
+        weekdays = None
+        if config.get("days_of_week"):
+            weekdays = frozenset((int(day) - 1) % 7 for day in config["days_of_week"])  # Sunday = 0 -> Monday = 0
+        elif config.get("weekday") is not None and frequency != "monthly":
+            weekdays = frozenset([int(config["weekday"])])
+        elif frequency == "weekly":
+            if template_start is None:
+                raise ValueError("Weekly recurring event has no weekday")
+            weekdays = frozenset([template_start.weekday()])
+
+        until = None
+        if config.get("end_date"):
+            end_date = config["end_date"]
+            if isinstance(end_date, str) and len(end_date) == 10:
+                until = datetime.combine(date.fromisoformat(end_date), time.max)  # Whole last day
+            else:
+                until = _parse_local(end_date, tz)
+
+        month_day = None
+        if frequency == "monthly":
+            month_day = int(config.get("month_day") or (template_start.day if template_start else 1))
+
+        return cls(
+            frequency=frequency,
+            start_time=start_time,
+            end_time=end_time,
+            tz=tz,
+            weekdays=weekdays,
+            month_day=month_day,
+            month_weekday=config.get("weekday") if frequency == "monthly" else None,
+            anchor=template_start.date() if template_start else None,
+            until=until,
+            max_occurrences=config.get("max_occurrences"),
+        )
+
+    def _monthly_date(self, year: int, month: int):
+        try:
+            day = date(year, month, self.month_day)
+        except ValueError:
+            return None  # e.g. the 31st in a 30-day month
+        if self.month_weekday is not None:
+            day += timedelta(days=(int(self.month_weekday) - day.weekday()) % 7)
+        return day
+
+    def _dates(self, calendar, first: date, last: date) -> list:
+        """Rule dates in [first, last], read off the shared calendar"""
+        if self.frequency == "monthly":
+            dates = []
+            for year, month in calendar.months:
+                day = self._monthly_date(year, month)
+                if day is not None and first <= day <= last:
+                    dates.append(day)
+            return dates
+        if self.frequency == "daily" and self.weekdays is None:
+            return [day for day in calendar.dates if first <= day <= last]
+        merged = heapq.merge(*(calendar.by_weekday[weekday] for weekday in self.weekdays))
+        return [day for day in merged if first <= day <= last]
+
+    def _count_before(self, first: date) -> int:
+        """Occurrences from the anchor up to (not including) first"""
+        if self.anchor is None or first <= self.anchor:
+            return 0
+        if self.frequency == "monthly":
+            count = 0
+            year, month = self.anchor.year, self.anchor.month
+            while (year, month) <= (first.year, first.month):
+                day = self._monthly_date(year, month)
+                if day is not None and self.anchor <= day < first:
+                    count += 1
+                year, month = _add_months(year, month, 1)
+            return count
+        weekdays = self.weekdays if self.weekdays is not None else frozenset(range(7))
+        return _count_weekdays(self.anchor, first, weekdays)
+
+    def expand(self, calendar, now: datetime) -> list:
+        """
+        Occurrences starting at or after `now` up to the calendar's last day.
+
+        Returns:
+            list: (start, end) aware datetimes in the rule's timezone
+        """
+        local_now = now.astimezone(self.tz).replace(tzinfo=None)
+        first = local_now.date()
+        if self.anchor is not None:
+            first = max(first, self.anchor)
+
+        remaining = None
+        if self.max_occurrences is not None:
+            remaining = int(self.max_occurrences) - self._count_before(first)
+            if remaining <= 0:
+                return []
+
+        crosses_midnight = self.end_time <= self.start_time
+        occurrences = []
+        for day in self._dates(calendar, first, calendar.last):
+            start = _wall_clock(day, self.start_time, self.tz, calendar.transition_dates)
+            if self.until is not None and start > self.until:
+                break
+            if remaining is not None:
+                if remaining == 0:
+                    break
+                remaining -= 1  # Past occurrences today still count towards the cap
+            if start < local_now:
+                continue
+            end_day = day + timedelta(days=1) if crosses_midnight else day
+            end = _wall_clock(end_day, self.end_time, self.tz, calendar.transition_dates)
+            occurrences.append((start.replace(tzinfo=self.tz), end.replace(tzinfo=self.tz)))
+        return occurrences
+
+
+class Calendar:
+    """Dates of a horizon in one timezone, grouped by weekday and month, shared across rules"""
+
+    def __init__(self, first: date, last: date, tz=CLUB_TIMEZONE):
+        self.first = first
+        self.last = last
+        self.dates = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+        # Days whose UTC offset changes (DST), through the day after the horizon for end times
+        offsets = [
+            datetime.combine(first + timedelta(days=offset), time(0), tzinfo=tz).utcoffset()
+            for offset in range((last - first).days + 3)
+        ]
+        self.transition_dates = {
+            first + timedelta(days=offset) for offset in range(len(offsets) - 1)
+            if offsets[offset] != offsets[offset + 1]
+        }
+
+        self.by_weekday = {weekday: [] for weekday in range(7)}
+        for day in self.dates:
+            self.by_weekday[day.weekday()].append(day)
+        self.months = []
+        year, month = first.year, first.month
+        while (year, month) <= (last.year, last.month):
+            self.months.append((year, month))
+            year, month = _add_months(year, month, 1)
+        # Monthly rules with a weekday can land a few days into the next month
+        self.months.insert(0, _add_months(first.year, first.month, -1))
+
+
+def expand_templates(templates: list, weeks_ahead: int, now: datetime = None) -> dict:
+    """
+    Expand every template's rule over the next `weeks_ahead` weeks.
+
+    Args:
+        templates: events rows with a recurring_config
+        weeks_ahead: Horizon in weeks (through the same weekday that many weeks out)
+        now: Expansion start (default: current time)
+
+    Returns:
+        dict: template id -> list of (start, end) aware datetimes in the rule's timezone;
+              templates whose config cannot be compiled are skipped with a warning
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    calendars = {}  # timezone key -> Calendar
+    expanded = {}
+    for event in templates:
+        try:
+            rule = RecurrenceRule.from_template(event)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Warning: Skipping recurring event '{event.get('title')}': {e}")
+            continue
+        calendar = calendars.get(str(rule.tz))
+        if calendar is None:
+            today = now.astimezone(rule.tz).date()
+            calendar = calendars[str(rule.tz)] = Calendar(today, today + timedelta(weeks=weeks_ahead), rule.tz)
+        expanded[event["id"]] = rule.expand(calendar, now)
+    return expanded
+
+
+def next_occurrence(event: dict, now: datetime = None):
+    """
+    First (start, end) of a template at or after now, or None.
+
+    Raises:
+        ValueError: If the recurring_config cannot be compiled
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    rule = RecurrenceRule.from_template(event)
+    today = now.astimezone(rule.tz).date()
+    # Ten weeks covers the longest gap of a monthly rule (e.g. the 31st)
+    occurrences = rule.expand(Calendar(today, today + timedelta(weeks=10), rule.tz), now)
+    return occurrences[0] if occurrences else None
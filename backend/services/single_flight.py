@@ -0,0 +1,114 @@
+"""
+Single-flight coalescing for duplicate reads.
+
+When several requests ask for the same read at the same time (e.g. every
+client opening the app at once), only the first one goes to Supabase; the
+others wait for it and receive the same result (or the same exception).
+Nothing is cached once the call completes: the next caller starts a new
+flight.
+
+Results are shared between waiters, so callers must treat them as read-only.
+"""
+
+import asyncio
+import threading
+
+
+def query_key(table: str, projection: str = "*", **filters) -> tuple:
+    """Coalescing key for a read: table, projection and filters"""
+    return (table, projection, tuple(sorted(filters.items())))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical in-flight calls and counts how many were shared"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}        # key -> _Call (threads)
+        self._async_calls = {}  # (event loop, key) -> Future (coroutines)
+        self.calls = 0
+        self.executions = 0
+
+    def do(self, key, fn):
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Hashable identity of the read (see query_key)
+            fn: Zero-argument callable performing the read
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, coro_fn):
+        """Async counterpart of do(): coro_fn() is awaited once per key and event loop"""
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.calls += 1
+            future = self._async_calls.get(loop_key)
+            leader = future is None
+            if leader:
+                future = asyncio.get_running_loop().create_future()
+                self._async_calls[loop_key] = future
+                self.executions += 1
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await coro_fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+    def stats(self) -> dict:
+        """Calls seen, upstream executions, and the share of calls that were coalesced"""
+        with self._lock:
+            calls, executions = self.calls, self.executions
+        coalesced = calls - executions
+        return {
+            "calls": calls,
+            "executions": executions,
+            "coalesced": coalesced,
+            "coalescing_ratio": round(coalesced / calls, 4) if calls else 0.0,
+        }
@@ -0,0 +1,182 @@
+"""
+Shared Supabase client factory.
+
+Every process (gunicorn worker, management command, script) gets one client
+per (url, key) whose PostgREST requests go through a single pooled httpx
+transport with HTTP/2 and keep-alive, so TLS handshakes are paid once per
+connection instead of once per client. Clients are created lazily and keyed by
+pid: a forked worker never reuses sockets inherited from its parent.
+
+Pool settings come from the environment:
+
+    SUPABASE_HTTP_MAX_CONNECTIONS      (default 20)
+    SUPABASE_HTTP_MAX_KEEPALIVE        (default 10)
+    SUPABASE_HTTP_KEEPALIVE_EXPIRY     seconds (default 60)
+    SUPABASE_HTTP_CONNECT_TIMEOUT      seconds (default 5)
+    SUPABASE_HTTP_TIMEOUT              seconds (default 30)
+"""
+
+import os
+import threading
+
+import httpx
+from dotenv import load_dotenv
+from postgrest import AsyncPostgrestClient, SyncPostgrestClient
+from postgrest.utils import AsyncClient as AsyncPostgrestSession
+from postgrest.utils import SyncClient as SyncPostgrestSession
+from supabase import AsyncClient, Client
+
+load_dotenv()
+
+POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=float(os.getenv("SUPABASE_HTTP_KEEPALIVE_EXPIRY", "60")),
+)
+TIMEOUT = httpx.Timeout(
+    float(os.getenv("SUPABASE_HTTP_TIMEOUT", "30")),
+    connect=float(os.getenv("SUPABASE_HTTP_CONNECT_TIMEOUT", "5")),
+)
+
+_lock = threading.RLock()
+_pid = None
+_transport = None
+_clients = {}  # (url, key) -> Client
+
+
+def _reset_after_fork():
+    """Drop the parent's clients and pool in a forked child"""
+    global _lock, _pid, _transport, _clients
+    _lock = threading.RLock()
+    _pid = None
+    _transport = None
+    _clients = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _shared_transport() -> httpx.HTTPTransport:
+    """This process's pooled HTTP/2 transport (caller holds _lock)"""
+    global _pid, _transport
+    if _pid != os.getpid():
+        # Belt and braces for forks that bypass register_at_fork
+        _pid = os.getpid()
+        _transport = None
+        _clients.clear()
+    if _transport is None:
+        _transport = httpx.HTTPTransport(http2=True, limits=POOL_LIMITS, retries=1)
+    return _transport
+
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose session shares the process-wide transport"""
+
+    def __init__(self, *args, transport: httpx.HTTPTransport, **kwargs):
+        self._transport = transport
+        super().__init__(*args, **kwargs)
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return SyncPostgrestSession(
+            base_url=base_url,
+            headers=headers,
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            transport=self._transport,
+        )
+
+    def aclose(self):
+        # The transport outlives this client (auth events rebuild postgrest)
+        pass
+
+
+class PooledClient(Client):
+    """Supabase client that routes PostgREST calls through the shared pool"""
+
+    def _init_postgrest_client(self, rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        with _lock:
+            transport = _shared_transport()
+        return _PooledPostgrestClient(
+            rest_url,
+            headers=headers,
+            schema=schema,
+            transport=transport,
+        )
+
+
+def get_client(url: str = None, key: str = None) -> Client:
+    """
+    The process-wide Supabase client for a project URL and key.
+
+    Args:
+        url: Supabase URL (default SUPABASE_URL)
+        key: Supabase API key (default SUPABASE_KEY)
+    """
+    url = url or os.getenv("SUPABASE_URL")
+    key = key or os.getenv("SUPABASE_KEY")
+    with _lock:
+        _shared_transport()
+        client = _clients.get((url, key))
+        if client is None:
+            client = PooledClient.create(supabase_url=url, supabase_key=key)
+            _clients[(url, key)] = client
+        return client
+
+
+class LazyClient:
+    """
+    Module-level stand-in for a Supabase client.
+
+    Resolves get_client() on every attribute access, so modules imported
+    before gunicorn forks its workers still talk over the worker's own pool.
+    """
+
+    def __init__(self, url: str = None, key: str = None):
+        self._url = url
+        self._key = key
+
+    def __getattr__(self, name):
+        return getattr(get_client(self._url, self._key), name)
+
+
+class _PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client whose session shares an event loop's transport"""
+
+    def __init__(self, *args, transport: httpx.AsyncHTTPTransport, **kwargs):
+        self._transport = transport
+        super().__init__(*args, **kwargs)
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return AsyncPostgrestSession(
+            base_url=base_url,
+            headers=headers,
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            transport=self._transport,
+        )
+
+    async def aclose(self):
+        pass
+
+
+class PooledAsyncClient(AsyncClient):
+    """Async Supabase client that routes PostgREST calls through one pooled transport"""
+
+    def _init_postgrest_client(self, rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        if getattr(self, "_transport", None) is None:
+            self._transport = httpx.AsyncHTTPTransport(http2=True, limits=POOL_LIMITS, retries=1)
+        return _PooledAsyncPostgrestClient(
+            rest_url,
+            headers=headers,
+            schema=schema,
+            transport=self._transport,
+        )
+
+
+async def acreate_pooled_client(url: str = None, key: str = None) -> AsyncClient:
+    """Async Supabase client with a pooled HTTP/2 transport (one per event loop)"""
+    return await PooledAsyncClient.create(
+        supabase_url=url or os.getenv("SUPABASE_URL"),
+        supabase_key=key or os.getenv("SUPABASE_KEY"),
+    )
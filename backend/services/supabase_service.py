@@ -1,14 +1,64 @@
-from supabase import create_client, Client
+from supabase import Client
 import os
 from dotenv import load_dotenv
+from services import trending
+from services.supabase_client import LazyClient
+from services.club_catalog import ClubCatalog, content_hash
+from services.versions import bump_version, get_version
+from services.club_search import ClubSearchIndex
+from services.club_geo import ClubGeoIndex
+from services.opening_hours import CLUB_TIMEZONE, OpeningHoursIndex
+from services.genre_index import GenreIndex, known_genres
+from services.presence import get_presence_index
+from services.single_flight import SingleFlight, query_key
+from services.cache import cached, invalidate as invalidate_cache
+from services.bulk_writer import bulk_upsert
+from services.recurrence import expand_templates, next_occurrence
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Shared Supabase client (pooled, created per worker process on first use)
+supabase: Client = LazyClient(SUPABASE_URL, SUPABASE_KEY)
+
+# Identical concurrent reads share one upstream call (see get_single_flight_stats)
+_single_flight = SingleFlight()
+
+# Cached Clubs table, invalidated by add_club and the ingestion scripts
+_club_catalog = ClubCatalog(
+    loader=lambda: _single_flight.do(
+        query_key("Clubs", "*", all_rows=True),
+        lambda: _fetch_all_rows(lambda: supabase.table("Clubs").select("*"))
+    )
+)
+
+# Name/address search index, re-synced whenever the catalog reloads
+_club_search_index = ClubSearchIndex()
+_club_catalog.subscribe(_club_search_index.sync)
+
+# Latitude/longitude grid for nearby queries, rebuilt whenever the catalog reloads
+_club_geo_index = ClubGeoIndex()
+_club_catalog.subscribe(_club_geo_index.sync)
+
+# Compiled opening hours, recompiled whenever the catalog reloads
+_opening_hours = OpeningHoursIndex()
+_club_catalog.subscribe(_opening_hours.sync)
+
+# (genre, day) -> clubs bitsets from ClubMusicSchedules, invalidated by the music scripts
+_genre_index = GenreIndex(
+    loader=lambda: _single_flight.do(
+        query_key("ClubMusicSchedules", "*", all_rows=True),
+        lambda: _fetch_all_rows(lambda: supabase.table("ClubMusicSchedules").select("*"))
+    )
+)
+
+# Rolling trending window, updated by add_club_review and rebuilt periodically
+# so reviews written by other workers are picked up
+_trending_cache = trending.TrendingCache(
+    rebuild_seconds=int(os.getenv("TRENDING_CACHE_REBUILD_SECONDS", "300"))
+)
 
 # Test function to fetch data
 def test_supabase():
@@ -16,13 +66,101 @@ def test_supabase():
     print("hello")
 
 def get_clubs():
-    """Fetch all clubs from Supabase"""
-    response = supabase.table("Clubs").select("*").execute()
-    return response.data
+    """Fetch all clubs (served from the club catalog cache)"""
+    return _club_catalog.all()
+
+# Columns rendered by list screens (club cards)
+CLUB_CARD_FIELDS = ["id", "Name", "Address", "Rating", "Image", "latitude", "longitude"]
+
+def _validate_fields(fields, columns: set):
+    """Column list for a projection; rejects names that aren't columns of the Clubs table"""
+    unknown = [field for field in fields if field != "*" and field not in columns]
+    if unknown and columns:  # An empty catalog has no columns to check against
+        raise ValueError(f"Unknown field: {', '.join(unknown)}")
+    return fields
+
+def get_clubs_page(after: str = None, limit: int = 50, fields: list = None):
+    """
+    One page of clubs ordered by id (keyset pagination), from the club catalog.
+
+    Args:
+        after: Return clubs with an id greater than this cursor
+        limit: Maximum number of clubs to return
+        fields: Columns to select (defaults to CLUB_CARD_FIELDS, ["*"] for every column)
+
+    Returns:
+        tuple: (clubs, next_cursor) where next_cursor is None on the last page
+
+    Raises:
+        ValueError: If a field is not a column of the Clubs table
+    """
+    fields = _validate_fields(fields or CLUB_CARD_FIELDS, _club_catalog.columns())
+    if "*" not in fields and "id" not in fields:
+        fields = ["id"] + fields  # The cursor needs the id
+    return _club_catalog.page(after, limit, fields)
+
+def get_read_cache_stats():
+    """Hit/miss counters for the read cache (see services/cache.py)"""
+    from services.cache import default_cache
+    return default_cache.stats()
+
+def get_single_flight_stats():
+    """Coalescing counters for duplicate in-flight reads"""
+    return _single_flight.stats()
+
+def get_club_catalog_stats():
+    """Hit/miss counters for the club catalog cache"""
+    return _club_catalog.stats()
+
+def get_clubs_etag():
+    """ETag for catalog responses: cached Clubs table plus live occupancy"""
+    _club_catalog.ensure_loaded()
+    return f"{_club_catalog.etag}-{get_presence_index().occupancy_etag()[:12]}"
+
+def get_club_etag(club_id: str):
+    """ETag for a single club: its cached row plus its occupancy (None if unknown)"""
+    row_etag = _club_catalog.row_etag(club_id)
+    if row_etag is None:
+        return None
+    return f"{row_etag}-{get_presence_index().occupancy(club_id)}"
+
+def get_club_occupancy(club_ids: list = None) -> dict:
+    """
+    Users checked in per club, from in-memory counters (no per-club count query).
+
+    Args:
+        club_ids: Clubs to report (default: every club with anyone checked in)
+    """
+    counts = get_presence_index().occupancy_all()
+    if club_ids is None:
+        return counts
+    return {club_id: counts.get(club_id, 0) for club_id in club_ids}
+
+def with_occupancy(clubs: list) -> list:
+    """Copies of club rows with their current "occupancy" added (the rows are not modified)"""
+    counts = get_presence_index().occupancy_all()
+    return [dict(club, occupancy=counts.get(club["id"], 0)) if "id" in club else dict(club) for club in clubs]
+
+def get_club_reviews_etag(club_id: str, review_type: str = "app"):
+    """
+    ETag for a club's reviews, built from the local write counter and a
+    count/newest-timestamp probe (so writes made directly to Supabase count too).
+    """
+    source = "google" if review_type == "google" else "app"
+    response = supabase.table("club_reviews").select(
+        "created_at", count="exact"
+    ).eq("club_id", club_id).eq("source", source).order("created_at", desc=True).limit(1).execute()
+    newest = response.data[0]["created_at"] if response.data else ""
+    return f"{get_version(f'reviews.{club_id}')}-{response.count or 0}-{newest}"
 
 def get_club_by_id(club_id: str):
-    """Fetch a single club by ID from Supabase"""
+    """Fetch a single club by ID (catalog cache first, then Supabase)"""
     try:
+        club = _club_catalog.get(club_id)
+        if club:
+            return club
+
+        # Not cached yet (e.g. added since the last load)
         response = supabase.table("Clubs").select("*").eq("id", club_id).execute()
         if response.data and len(response.data) > 0:
             return response.data[0]
@@ -34,98 +172,56 @@ def get_club_by_id(club_id: str):
 def get_club_trending_status(club_id: str):
     """Get trending status for a single club"""
     try:
-        from datetime import datetime, timedelta
-        five_hours_ago = (datetime.utcnow() - timedelta(hours=5)).isoformat()
-        
-        # Get recent reviews for this club (last 5 hours)
-        reviews_response = supabase.table("club_reviews").select(
-            "rating, created_at"
-        ).eq("club_id", club_id).gte("created_at", five_hours_ago).execute()
-        
-        recent_reviews = reviews_response.data or []
-        
-        if len(recent_reviews) >= 3:  # Minimum 3 reviews in last 5 hours
-            # Calculate average rating
-            total_rating = sum(review["rating"] for review in recent_reviews)
-            avg_rating = total_rating / len(recent_reviews)
-            
-            if avg_rating >= 3.5:  # Minimum 3.5 average rating
-                trending_score = len(recent_reviews) * avg_rating
-                return {
-                    "is_trending": True,
-                    "trending_score": trending_score,
-                    "recent_reviews_count": len(recent_reviews),
-                    "avg_rating": round(avg_rating, 1)
-                }
-        
-        return {
-            "is_trending": False,
-            "trending_score": 0,
-            "recent_reviews_count": len(recent_reviews),
-            "avg_rating": 0
-        }
+        _ensure_trending_cache()
+        return _trending_cache.status(club_id)
         
     except Exception as e:
         print(f"Error getting club trending status: {e}")
-        return {
-            "is_trending": False,
-            "trending_score": 0,
-            "recent_reviews_count": 0,
-            "avg_rating": 0
-        }
+        return trending.trending_stats(0, 0)
+
+def get_filtered_clubs(filter_open=False, selected_genres=None, min_rating=0, match_all_genres=False, day_of_week=None):
+    """
+    Get filtered and sorted clubs with trending status.
 
-def get_filtered_clubs(filter_open=False, selected_genres=None, min_rating=0):
-    """Get filtered and sorted clubs with trending status"""
+    Args:
+        filter_open: Only clubs open right now
+        selected_genres: Genres the club must be playing (any of them by default);
+                         names without a ClubMusicSchedules column are ignored
+        min_rating: Minimum Google rating
+        match_all_genres: Require every selected genre instead of any
+        day_of_week: Day for the genre filter (0 = Sunday, defaults to today)
+    """
+    from datetime import datetime, timezone
     try:
-        from datetime import datetime, timedelta
-        five_hours_ago = (datetime.utcnow() - timedelta(hours=5)).isoformat()
+        # Trending status for every club from one bulk review query
+        trending_table = get_trending_table()
         
         # Get all clubs first
-        clubs_response = supabase.table("Clubs").select("*").execute()
-        clubs = clubs_response.data or []
+        clubs = _club_catalog.all()
+        now = datetime.now(timezone.utc)
+        
+        genre_club_ids = None
+        if known_genres(selected_genres or []):
+            if day_of_week is None:
+                day_of_week = (now.astimezone(CLUB_TIMEZONE).weekday() + 1) % 7
+            _genre_index.ensure_loaded()
+            genre_club_ids = _genre_index.clubs_playing(selected_genres, day_of_week, match_all_genres)
         
         filtered_clubs = []
         
         for club in clubs:
             # Apply filters
-            if filter_open:
-                # Check if club is open (simplified logic for now)
-                # TODO: Implement proper opening hours logic
-                pass
+            if filter_open and not _opening_hours.is_open(club["id"], now):
+                continue
             
             if min_rating > 0 and club.get("Rating", 0) < min_rating:
                 continue
                 
-            if selected_genres and selected_genres:
-                # TODO: Implement genre filtering logic
-                pass
-            
-            # Get trending status for this club
-            reviews_response = supabase.table("club_reviews").select(
-                "rating, created_at"
-            ).eq("club_id", club["id"]).gte("created_at", five_hours_ago).execute()
-            
-            recent_reviews = reviews_response.data or []
-            
-            # Calculate trending status
-            is_trending = False
-            trending_score = 0
-            recent_reviews_count = len(recent_reviews)
-            avg_rating = 0
-            
-            if len(recent_reviews) >= 3:
-                total_rating = sum(review["rating"] for review in recent_reviews)
-                avg_rating = total_rating / len(recent_reviews)
-                
-                if avg_rating >= 3.5:
-                    is_trending = True
-                    trending_score = len(recent_reviews) * avg_rating
+            if genre_club_ids is not None and club["id"] not in genre_club_ids:
+                continue
             
             # Add trending data to club
-            club["is_trending"] = is_trending
-            club["trending_score"] = trending_score
-            club["recent_reviews_count"] = recent_reviews_count
-            club["avg_rating"] = round(avg_rating, 1)
+            club.update(trending.lookup(trending_table, club["id"]))
             
             filtered_clubs.append(club)
         
@@ -145,58 +241,49 @@ def get_filtered_clubs(filter_open=False, selected_genres=None, min_rating=0):
 def search_clubs(query: str, limit: int = 20):
     """Search clubs by name or address"""
     try:
-        # Get all clubs first
-        clubs_response = supabase.table("Clubs").select("*").execute()
-        clubs = clubs_response.data or []
+        # Make sure the index reflects the current catalog
+        _club_catalog.ensure_loaded()
         
-        # Convert query to lowercase for case-insensitive search
-        query_lower = query.lower()
-        
-        # Filter clubs that match the query in name or address
-        matching_clubs = []
-        for club in clubs:
-            club_name = club.get("Name", "").lower()
-            club_address = club.get("Address", "").lower()
-            
-            if query_lower in club_name or query_lower in club_address:
-                matching_clubs.append(club)
+        # Name-prefix matches first, then alphabetical; typo-tolerant fallback
+        return _club_search_index.search(query, limit)
         
-        # Sort by relevance (exact name matches first, then partial matches)
-        matching_clubs.sort(key=lambda x: (
-            not x.get("Name", "").lower().startswith(query_lower),  # Exact matches first
-            x.get("Name", "").lower()  # Then alphabetically
-        ))
+    except Exception as e:
+        print(f"Error searching clubs: {e}")
+        return []
+
+def get_club_closing_time(club_id: str, at=None):
+    """
+    When the club's current opening period ends.
+
+    Args:
+        club_id: The club's ID
+        at: Reference time (defaults to now)
+
+    Returns:
+        datetime: Aware local closing time, or None if the club is closed at `at`
+    """
+    _club_catalog.ensure_loaded()
+    return _opening_hours.closing_time(club_id, at)
+
+def get_nearby_clubs(latitude: float, longitude: float, radius_m: float = 5000, limit: int = 20):
+    """Clubs within radius_m metres of a point, nearest first (with distance_m)"""
+    try:
+        # Make sure the index reflects the current catalog
+        _club_catalog.ensure_loaded()
         
-        # Limit results
-        return matching_clubs[:limit]
+        return _club_geo_index.nearby(latitude, longitude, radius_m, limit)
         
     except Exception as e:
-        print(f"Error searching clubs: {e}")
+        print(f"Error getting nearby clubs: {e}")
         return []
 
 def get_friends_attending(club_id: str, user_id: str):
     """Get friends of a user who are attending a specific club"""
+    from services import friend_graph
     try:
-        # First, get all friends of the user
-        friends_response = supabase.table("user_profiles").select(
-            "id, avatar_url, active_club_id"
-        ).eq("id", user_id).execute()
-        
-        if not friends_response.data:
-            return []
-        
-        # Get the user's friends (this would need to be implemented based on your friends system)
-        # For now, let's get all users who have the same active_club_id
-        friends_attending_response = supabase.table("user_profiles").select(
-            "id, avatar_url"
-        ).eq("active_club_id", club_id).execute()
-        
-        friends_attending = friends_attending_response.data or []
-        
-        # Filter out the current user
-        friends_attending = [friend for friend in friends_attending if friend["id"] != user_id]
-        
-        return friends_attending
+        # Intersect the user's friend set with the club's presence set in memory,
+        # then fetch only the matching profiles
+        return friend_graph.get_friends_attending(club_id, user_id)
         
     except Exception as e:
         print(f"Error getting friends attending: {e}")
@@ -206,9 +293,10 @@ def get_club_music_schedule(club_id: str, day_number: int):
     """Get music schedule for a club on a specific day"""
     try:
         # Get the club's music schedule
-        club_response = supabase.table("Clubs").select(
-            "current_music"
-        ).eq("id", club_id).execute()
+        club_response = _single_flight.do(
+            query_key("Clubs", "current_music", id=club_id),
+            lambda: supabase.table("Clubs").select("current_music").eq("id", club_id).execute()
+        )
         
         if not club_response.data:
             return None
@@ -228,18 +316,21 @@ def get_club_music_schedule(club_id: str, day_number: int):
         return None
 
 def get_club_reviews(club_id: str, review_type: str = "app"):
-    """Get reviews for a club (app reviews or Google reviews)"""
+    """
+    Get reviews for a club (app reviews or Google reviews).
+
+    Not cached: the app inserts reviews straight into Supabase, and the
+    ETag (get_club_reviews_etag) is probed live, so the body must be too.
+    """
     try:
-        if review_type == "google":
-            # Get Google reviews
-            reviews_response = supabase.table("club_reviews").select(
-                "*"
-            ).eq("club_id", club_id).eq("source", "google").order("created_at", desc=True).execute()
-        else:
-            # Get app reviews
-            reviews_response = supabase.table("club_reviews").select(
+        # Google reviews or app reviews
+        source = "google" if review_type == "google" else "app"
+        reviews_response = _single_flight.do(
+            query_key("club_reviews", "*", club_id=club_id, source=source, order="created_at.desc"),
+            lambda: supabase.table("club_reviews").select(
                 "*"
-            ).eq("club_id", club_id).eq("source", "app").order("created_at", desc=True).execute()
+            ).eq("club_id", club_id).eq("source", source).order("created_at", desc=True).execute()
+        )
         
         reviews = reviews_response.data or []
         return reviews
@@ -250,6 +341,7 @@ def get_club_reviews(club_id: str, review_type: str = "app"):
 
 def add_club_review(club_id: str, user_id: str, rating: int, music_genre: str, review_text: str = ""):
     """Add a review for a club"""
+    from datetime import datetime
     try:
         review_data = {
             "club_id": club_id,
@@ -264,7 +356,10 @@ def add_club_review(club_id: str, user_id: str, rating: int, music_genre: str, r
         response = supabase.table("club_reviews").insert(review_data).execute()
         
         if response.data:
-            return response.data[0]
+            review = response.data[0]
+            _trending_cache.record(club_id, rating, review.get("created_at") or review_data["created_at"])
+            bump_version(f"reviews.{club_id}")
+            return review
         else:
             raise Exception("Failed to add review")
             
@@ -272,10 +367,14 @@ def add_club_review(club_id: str, user_id: str, rating: int, music_genre: str, r
         print(f"Error adding club review: {e}")
         raise e
 
+@cached(ttl=60, tags=("user:{user_id}",))
 def get_user_profile(user_id: str):
     """Get user profile by ID"""
     try:
-        response = supabase.table("user_profiles").select("*").eq("id", user_id).execute()
+        response = _single_flight.do(
+            query_key("user_profiles", "*", id=user_id),
+            lambda: supabase.table("user_profiles").select("*").eq("id", user_id).execute()
+        )
         
         if response.data:
             return response.data[0]
@@ -290,6 +389,7 @@ def update_user_profile(user_id: str, updates: dict):
     """Update user profile"""
     try:
         response = supabase.table("user_profiles").update(updates).eq("id", user_id).execute()
+        invalidate_cache(f"user:{user_id}")
         
         if response.data:
             return response.data[0]
@@ -300,6 +400,7 @@ def update_user_profile(user_id: str, updates: dict):
         print(f"Error updating user profile: {e}")
         raise e
 
+@cached(ttl=60, tags=("friends:{user_id}",))
 def get_user_friends(user_id: str):
     """Get user's friends"""
     try:
@@ -327,6 +428,7 @@ def get_user_friends(user_id: str):
         print(f"Error getting user friends: {e}")
         return []
 
+@cached(ttl=60, tags=("friends:{user_id}",))
 def get_pending_friend_requests(user_id: str):
     """Get pending friend requests for a user"""
     try:
@@ -351,6 +453,7 @@ def send_friend_request(requester_id: str, receiver_id: str):
             "receiver_id": receiver_id,
             "status": "pending"
         }).execute()
+        invalidate_cache(f"friends:{requester_id}", f"friends:{receiver_id}")
         
         if response.data:
             return response.data[0]
@@ -367,6 +470,7 @@ def accept_friend_request(requester_id: str, receiver_id: str):
         response = supabase.table("friendships").update({
             "status": "friends"
         }).eq("requester_id", requester_id).eq("receiver_id", receiver_id).execute()
+        invalidate_cache(f"friends:{requester_id}", f"friends:{receiver_id}")
         
         if response.data:
             return response.data[0]
@@ -391,12 +495,14 @@ def unfriend_user(user_id_1: str, user_id_2: str):
         except:
             pass
         
+        invalidate_cache(f"friends:{user_id_1}", f"friends:{user_id_2}")
         return True
         
     except Exception as e:
         print(f"Error unfriending user: {e}")
         raise e
 
+@cached(ttl=120, tags=("favourites:{user_id}",))
 def get_user_favourites(user_id: str):
     """Get user's favourite clubs"""
     try:
@@ -420,6 +526,7 @@ def add_club_to_favourites(user_id: str, club_id: str):
             "user_id": user_id,
             "club_id": club_id
         }).execute()
+        invalidate_cache(f"favourites:{user_id}")
         
         if response.data:
             return response.data[0]
@@ -434,6 +541,7 @@ def remove_club_from_favourites(user_id: str, club_id: str):
     """Remove a club from user's favourites"""
     try:
         response = supabase.table("user_favourites").delete().eq("user_id", user_id).eq("club_id", club_id).execute()
+        invalidate_cache(f"favourites:{user_id}")
         
         return True
         
@@ -465,38 +573,70 @@ def print_all_clubs_json():
     except Exception as e:
         print(f"Error printing clubs: {e}")
 
+def _fetch_all_rows(build_query, page_size: int = 1000):
+    """
+    Fetch every row of a query, paging past PostgREST's max-rows cap.
+
+    Args:
+        build_query: Callable returning a fresh query builder (ready for .range())
+        page_size: Number of rows requested per round trip
+    """
+    rows = []
+    start = 0
+    while True:
+        response = build_query().range(start, start + page_size - 1).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+def rebuild_trending_cache():
+    """Cold rebuild of the trending cache from one bulk query over the window"""
+    from datetime import datetime, timedelta
+    since = (datetime.utcnow() - timedelta(hours=trending.TRENDING_WINDOW_HOURS)).isoformat()
+
+    reviews = _fetch_all_rows(
+        lambda: supabase.table("club_reviews").select(
+            "club_id, rating, created_at"
+        ).gte("created_at", since)
+    )
+    _trending_cache.rebuild(reviews)
+
+def _ensure_trending_cache():
+    """Rebuild the trending cache if it is cold or due for a refresh"""
+    if not _trending_cache.is_warm():
+        # Concurrent cold requests share one rebuild
+        _single_flight.do(query_key("club_reviews", "club_id, rating, created_at", window="trending"), rebuild_trending_cache)
+
+def get_trending_table():
+    """
+    Trending status for every club with reviews in the trending window.
+
+    Returns:
+        dict: club_id -> {is_trending, trending_score, recent_reviews_count, avg_rating}
+    """
+    _ensure_trending_cache()
+    return _trending_cache.table()
+
 def get_trending_clubs():
     """Fetch trending clubs based on recent reviews and ratings (last 5 hours)"""
     try:
-        # Calculate the timestamp for 5 hours ago
-        from datetime import datetime, timedelta
-        five_hours_ago = (datetime.utcnow() - timedelta(hours=5)).isoformat()
-        
+        # One query for every review in the window instead of one per club
+        trending_table = get_trending_table()
+        if not any(status["is_trending"] for status in trending_table.values()):
+            return []
+
         # Get all clubs first
-        clubs_response = supabase.table("Clubs").select("*").execute()
-        clubs = clubs_response.data or []
+        clubs = _club_catalog.all()
         
         trending_clubs = []
         
         for club in clubs:
-            # Get recent reviews for this club (last 5 hours)
-            reviews_response = supabase.table("club_reviews").select(
-                "rating, created_at"
-            ).eq("club_id", club["id"]).gte("created_at", five_hours_ago).execute()
-            
-            recent_reviews = reviews_response.data or []
-            
-            if len(recent_reviews) >= 3:  # Minimum 3 reviews in last 5 hours
-                # Calculate average rating
-                total_rating = sum(review["rating"] for review in recent_reviews)
-                avg_rating = total_rating / len(recent_reviews)
-                
-                if avg_rating >= 3.5:  # Minimum 3.5 average rating
-                    club["trending_score"] = len(recent_reviews) * avg_rating
-                    club["recent_reviews_count"] = len(recent_reviews)
-                    club["avg_rating"] = round(avg_rating, 1)
-                    club["is_trending"] = True
-                    trending_clubs.append(club)
+            status = trending_table.get(club["id"])
+            if status and status["is_trending"]:
+                club.update(status)
+                trending_clubs.append(club)
         
         # Sort by trending score (reviews count * average rating)
         trending_clubs.sort(key=lambda x: x["trending_score"], reverse=True)
@@ -510,6 +650,7 @@ def get_trending_clubs():
 def add_club(data):
     """Add a new club to Supabase"""
     response = supabase.table("Clubs").insert(data).execute()
+    _club_catalog.invalidate()
     return response.data
 
 def create_new_user(user):
@@ -562,29 +703,20 @@ def create_recurring_event(
     created_by: str = None
 ):
     """Create an event with recurring config"""
-    from datetime import datetime, timedelta
-    
-    # Calculate the proper start date based on recurring pattern
-    if recurring_config and recurring_config.get("type") in ["weekly", "monthly"]:
-        proper_start_date = _calculate_proper_start_date(recurring_config)
-        if proper_start_date:
-            start_date = proper_start_date.isoformat()
-            # Calculate end date based on duration
-            start_time = datetime.strptime(recurring_config.get("start_time", "00:00"), "%H:%M").time()
-            end_time = datetime.strptime(recurring_config.get("end_time", "02:00"), "%H:%M").time()
-            
-            # Handle end time that goes past midnight
-            if end_time < start_time:
-                # End time is next day
-                end_date = (proper_start_date + timedelta(days=1)).replace(
-                    hour=end_time.hour, 
-                    minute=end_time.minute
-                ).isoformat()
-            else:
-                end_date = proper_start_date.replace(
-                    hour=end_time.hour, 
-                    minute=end_time.minute
-                ).isoformat()
+    # Start the template on the first occurrence of its pattern
+    if recurring_config:
+        try:
+            first_occurrence = next_occurrence({
+                "start_date": start_date,
+                "end_date": end_date,
+                "recurring_config": recurring_config
+            })
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Warning: Could not calculate first occurrence: {e}")
+            first_occurrence = None
+        if first_occurrence:
+            start_date = _to_utc_iso(first_occurrence[0])
+            end_date = _to_utc_iso(first_occurrence[1])
     
     event_data = {
         "title": title,
@@ -600,96 +732,200 @@ def create_recurring_event(
     response = supabase.table("events").insert(event_data).execute()
     return response.data[0] if response.data else None
 
-def _calculate_proper_start_date(recurring_config: dict):
-    """Calculate the proper start date based on recurring pattern"""
-    from datetime import datetime, timedelta
+# Natural key of generated instances (unique index in
+# supabase/migrations/20261016_add_event_instance_unique_key.sql)
+EVENT_INSTANCE_CONFLICT_KEY = "club_id,title,start_date,is_template"
+
+# recurring_config keys written by the generator (not part of the template)
+GENERATED_THROUGH_KEY = "generated_through"
+GENERATED_FINGERPRINT_KEY = "generated_fingerprint"
+
+def _template_fingerprint(event: dict) -> str:
+    """Hash of everything in a template that shapes its generated instances"""
+    config = {
+        key: value for key, value in (event.get("recurring_config") or {}).items()
+        if key not in (GENERATED_THROUGH_KEY, GENERATED_FINGERPRINT_KEY)
+    }
+    # start_date / end_date supply the weekday, times and anchor when the config omits them
+    fields = ("title", "caption", "club_id", "poster_url", "music_genres", "created_by", "start_date", "end_date")
+    return content_hash([config, {field: event.get(field) for field in fields}])
+
+def _generated_through(event: dict):
+    """
+    Date a template was last generated through, or None when it never was
+    or has been edited since (the fingerprint no longer matches).
+    """
+    from datetime import date
     
-    current_date = datetime.now().date()
+    config = event.get("recurring_config") or {}
+    if not config.get(GENERATED_THROUGH_KEY):
+        return None
+    if config.get(GENERATED_FINGERPRINT_KEY) != _template_fingerprint(event):
+        return None
+    try:
+        return date.fromisoformat(config[GENERATED_THROUGH_KEY])
+    except (TypeError, ValueError):
+        return None
+
+def _record_generated_through(event: dict, through_date) -> bool:
+    """
+    Persist a template's high-water mark in its recurring_config.
     
-    if recurring_config["type"] == "weekly":
-        weekday = recurring_config["weekday"]
-        start_time = datetime.strptime(recurring_config["start_time"], "%H:%M").time()
-        
-        # Find next occurrence of this weekday
-        days_ahead = weekday - current_date.weekday()
-        if days_ahead <= 0:  # Target day already happened this week
-            days_ahead += 7
-        
-        next_date = current_date + timedelta(days=days_ahead)
-        return datetime.combine(next_date, start_time)
-        
-    elif recurring_config["type"] == "monthly":
-        month_day = recurring_config.get("month_day", 1)
-        weekday = recurring_config.get("weekday")
-        start_time = datetime.strptime(recurring_config["start_time"], "%H:%M").time()
-        
-        # Find next month with this day
-        try:
-            if current_date.month == 12:
-                next_date = current_date.replace(year=current_date.year + 1, month=1, day=month_day)
-            else:
-                next_date = current_date.replace(month=current_date.month + 1, day=month_day)
-            
-            # Adjust for weekday if specified
-            if weekday is not None:
-                while next_date.weekday() != weekday:
-                    next_date += timedelta(days=1)
-            
-            return datetime.combine(next_date, start_time)
-            
-        except ValueError:
-            # Handle invalid dates (e.g., Feb 30)
-            return datetime.combine(current_date, start_time)
+    Compare-and-set: the write only applies while the stored recurring_config
+    still equals the one the generator read, so a dashboard edit made during
+    the run is kept (the next run regenerates from it). Edits to other
+    columns are caught by the fingerprint instead.
     
-    return datetime.now()
-
-def smart_generate_recurring_events(weeks_ahead: int = 4):
+    Returns:
+        bool: Whether the mark was recorded
     """
-    Smart weekly generation that tracks last generation and avoids duplicates.
-    Only generates events that are actually needed.
+    import json
+    
+    original = event["recurring_config"]
+    config = dict(original)
+    config[GENERATED_THROUGH_KEY] = through_date.isoformat()
+    config[GENERATED_FINGERPRINT_KEY] = _template_fingerprint(event)
+    response = supabase.table("events").update({"recurring_config": config}).eq(
+        "id", event["id"]
+    ).eq("recurring_config", json.dumps(original)).execute()
+    if not response.data:
+        print(f"ℹ️  '{event.get('title')}' was edited during generation; generation mark not recorded")
+        return False
+    return True
+
+def _get_recurring_templates(club_id: str = None) -> list:
+    """Every recurring event template (optionally for one club), in id order"""
+    query = supabase.table("events").select("*").not_.is_("recurring_config", "null")
+    if club_id:
+        query = query.eq("club_id", club_id)
+    return query.order("id").execute().data or []
+
+def smart_generate_recurring_events(weeks_ahead: int = 4, club_id: str = None, dry_run: bool = False):
     """
-    from datetime import datetime, timedelta
+    Smart generation that tracks how far each template has been generated
+    and avoids duplicates. Only dates past a template's high-water mark
+    (recurring_config.generated_through) are considered, so repeat runs
+    over an already-covered window cost one query.
     
+    Args:
+        weeks_ahead: Horizon in weeks
+        club_id: Only generate this club's templates
+        dry_run: Return the instances that would be generated without writing anything
+    """
     print(f"🔄 Starting smart recurring event generation for next {weeks_ahead} weeks...")
     
-    # Get all active recurring events
-    response = supabase.table("events").select("*").not_.is_("recurring_config", "null").execute()
-    recurring_events = response.data or []
+    recurring_events = _get_recurring_templates(club_id)
     
     if not recurring_events:
         print("ℹ️  No recurring events found")
         return []
     
     print(f"📅 Found {len(recurring_events)} recurring events to process")
+    return _generate_from_templates(recurring_events, weeks_ahead, club_id, dry_run)
+
+def smart_generate_recurring_events_by_club(
+    weeks_ahead: int = 4,
+    club_id: str = None,
+    workers: int = 4,
+    dry_run: bool = False
+) -> dict:
+    """
+    Smart generation sharded by club across a thread pool.
     
-    # Group events by title to prevent duplicates across templates
-    events_by_title = {}
+    Templates are loaded with one query, then each club's templates are
+    generated independently (existing instances, insert and high-water marks
+    for that club only). Each worker issues one Supabase request at a time, so
+    at most `workers` requests are in flight; workers is capped at the HTTP
+    pool size (SUPABASE_HTTP_MAX_CONNECTIONS).
+    
+    Returns:
+        dict: generated_events, clubs (per-club templates / generated /
+              seconds / error, slowest first), failed_clubs, workers,
+              dry_run and total seconds
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from services.supabase_client import POOL_LIMITS
+    
+    started = time.perf_counter()
+    templates_by_club = {}
+    for event in _get_recurring_templates(club_id):
+        templates_by_club.setdefault(event["club_id"], []).append(event)
+    
+    max_workers = max(1, min(workers, len(templates_by_club) or 1, POOL_LIMITS.max_connections or workers))
+    print(f"🔄 Generating {len(templates_by_club)} clubs with {max_workers} workers{' (dry run)' if dry_run else ''}...")
+    
+    def generate_club(club_templates):
+        club_started = time.perf_counter()
+        result = {"club_id": club_templates[0]["club_id"], "templates": len(club_templates), "generated": 0, "error": None}
+        try:
+            events = _generate_from_templates(club_templates, weeks_ahead, result["club_id"], dry_run)
+            result["generated"] = len(events)
+        except Exception as e:
+            print(f"❌ Error generating recurring events for club {result['club_id']}: {e}")
+            events = []
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - club_started, 3)
+        return result, events
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recurring") as pool:
+        outcomes = list(pool.map(generate_club, templates_by_club.values()))
+    
+    generated_events = [event for _, events in outcomes for event in events]
+    clubs = sorted((result for result, _ in outcomes), key=lambda result: -result["seconds"])
+    return {
+        "generated_events": generated_events,
+        "clubs": clubs,
+        "failed_clubs": sum(1 for result in clubs if result["error"]),
+        "workers": max_workers,
+        "dry_run": dry_run,
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+
+def _generate_from_templates(recurring_events: list, weeks_ahead: int, club_id: str = None, dry_run: bool = False) -> list:
+    """Expand, diff and (unless dry_run) store instances for a set of templates"""
+    # Group templates by (club, title) to prevent duplicates across templates
+    events_by_key = {}
     for event in recurring_events:
-        title = event["title"]
-        if title not in events_by_title:
-            events_by_title[title] = []
-        events_by_title[title].append(event)
+        key = (event["club_id"], event["title"])
+        if key not in events_by_key:
+            events_by_key[key] = []
+        events_by_key[key].append(event)
+    
+    print(f"📝 Processing {len(events_by_key)} unique (club, title) templates")
+    
+    # Use the first template for generation (they should be identical)
+    primary_events = {}
+    for key, events_with_same_key in events_by_key.items():
+        if not events_with_same_key[0]["recurring_config"].get("active", True):
+            print(f"⏭️  Skipping inactive event: {key[1]}")
+            continue
+        primary_events[key] = events_with_same_key[0]
+    
+    # Occurrences every active template needs (one batch expansion), so
+    # existing instances load in one query
+    expanded = expand_templates(list(primary_events.values()), weeks_ahead)
+    needed_by_key = {}
+    for key, primary_event in primary_events.items():
+        occurrences = expanded.get(primary_event["id"]) or []
+        generated_through = _generated_through(primary_event)
+        if generated_through is not None:
+            occurrences = [occurrence for occurrence in occurrences if occurrence[0].date() > generated_through]
+        if occurrences:
+            needed_by_key[key] = occurrences
     
-    print(f"📝 Processing {len(events_by_title)} unique event titles")
+    all_needed = [start.date() for occurrences in needed_by_key.values() for start, _ in occurrences]
+    if not all_needed:
+        print("ℹ️  Every template is already generated through the window")
+        return []
+    existing_keys = _get_existing_instance_keys(min(all_needed), max(all_needed), club_id)
     
     generated_events = []
     total_generated = 0
     
-    # Process each unique title only once
-    for title, events_with_same_title in events_by_title.items():
-        print(f"🎯 Processing title: '{title}' ({len(events_with_same_title)} templates)")
-        
-        # Use the first template for generation (they should be identical)
-        primary_event = events_with_same_title[0]
-        config = primary_event["recurring_config"]
-        
-        # Skip inactive events
-        if not config.get("active", True):
-            print(f"⏭️  Skipping inactive event: {title}")
-            continue
-        
-        # Check if this event needs new instances
-        events_needed = _calculate_events_needed(primary_event, config, weeks_ahead)
+    # Diff every template against the existing instances in one pass
+    for (key_club_id, title), occurrences in needed_by_key.items():
+        events_needed = _calculate_events_needed(primary_events[(key_club_id, title)], occurrences, existing_keys)
         
         if events_needed:
             print(f"🎯 Generating {len(events_needed)} instances for: {title}")
@@ -698,157 +934,105 @@ def smart_generate_recurring_events(weeks_ahead: int = 4):
         else:
             print(f"✅ No new instances needed for: {title}")
     
-    # Insert all generated events at once
+    if dry_run:
+        print(f"🔍 Dry run: {total_generated} events would be generated")
+        return generated_events
+    
+    # Chunked insert; rows that already exist (e.g. from a concurrent run) are skipped
+    failed_keys = set()
     if generated_events:
         print(f"💾 Inserting {total_generated} new events into database...")
-        try:
-            supabase.table("events").insert(generated_events).execute()
-            print(f"✅ Successfully generated {total_generated} recurring events")
-        except Exception as e:
-            print(f"❌ Error inserting events: {e}")
-            raise e
+        report = bulk_upsert("events", generated_events, on_conflict=EVENT_INSTANCE_CONFLICT_KEY)
+        for chunk in report["chunks"]:
+            print(f"   📦 Chunk {chunk['index']}: {chunk['inserted']}/{chunk['rows']} rows in {chunk['seconds']}s ({chunk['attempts']} attempts)")
+        failed_keys = {(row["club_id"], row["title"]) for row in report["failed_rows"]}
+        print(f"✅ Inserted {report['inserted']} recurring events ({report['skipped']} already existed) in {report['seconds']}s")
     else:
         print("ℹ️  No new events needed to be generated")
     
+    # Advance high-water marks only once the instances are stored
+    for key, occurrences in needed_by_key.items():
+        if key in failed_keys:
+            continue
+        try:
+            _record_generated_through(primary_events[key], max(start.date() for start, _ in occurrences))
+        except Exception as e:
+            print(f"Warning: Could not record generation mark for '{key[1]}': {e}")
+    
+    if failed_keys:
+        raise Exception(f"Failed to insert instances for {len(failed_keys)} templates; rerun to retry them")
+    
     return generated_events
 
-def _calculate_events_needed(event: dict, config: dict, weeks_ahead: int) -> list:
+def _to_utc_iso(value) -> str:
+    """Aware occurrence time as the UTC ISO string stored in the timestamptz columns"""
+    from datetime import timezone
+    return value.astimezone(timezone.utc).isoformat()
+
+def _instance_date(value):
     """
-    Calculate which events need to be generated based on existing instances
-    and the recurring pattern.
+    Club-local date of an instance start (aware datetime or stored timestamp),
+    the date part of the (club_id, title, date) dedup key on both sides.
     """
-    from datetime import datetime, timedelta
-    
-    # Get existing instances for this recurring event
-    existing_instances = _get_existing_instances(event["id"])
-    
-    # Calculate what dates we need events for
-    needed_dates = _calculate_needed_dates(config, weeks_ahead)
-    
-    # Filter out dates that already have events
-    missing_dates = _find_missing_dates(needed_dates, existing_instances)
-    
-    if not missing_dates:
-        return []
-    
-    # Generate events for missing dates
-    events = []
-    for event_date in missing_dates:
-        instance = _create_event_instance(event, config, event_date)
-        events.append(instance)
-    
-    return events
-
-def _get_existing_instances(recurring_event_id: str) -> list:
-    """Get existing instances of a recurring event"""
-    try:
-        # Get the recurring event template to find its title
-        template_response = supabase.table("events").select("title").eq("id", recurring_event_id).execute()
-        if not template_response.data:
-            return []
-        
-        template_title = template_response.data[0]["title"]
-        
-        # Look for events with the same title (excluding the recurring template itself)
-        # Use is_() for NULL check instead of eq()
-        response = supabase.table("events").select("start_date, title").is_("recurring_config", "null").eq("title", template_title).execute()
-        existing_instances = response.data or []
-        
-        print(f"🔍 Found {len(existing_instances)} existing instances for '{template_title}'")
-        return existing_instances
-    except Exception as e:
-        print(f"Warning: Could not fetch existing instances: {e}")
-        return []
+    from services.trending import parse_timestamp
+    return parse_timestamp(value).astimezone(CLUB_TIMEZONE).date()
 
-def _calculate_needed_dates(config: dict, weeks_ahead: int) -> list:
-    """Calculate all the dates where events should exist"""
-    from datetime import datetime, timedelta
-    
-    needed_dates = []
-    start_date = datetime.now().date()
-    
-    if config["type"] == "weekly":
-        weekday = config["weekday"]
-        start_time = datetime.strptime(config["start_time"], "%H:%M").time()
-        
-        for week in range(weeks_ahead):
-            # Calculate next occurrence of this weekday
-            days_ahead = weekday - start_date.weekday()
-            if days_ahead <= 0:
-                days_ahead += 7
-            
-            event_date = start_date + timedelta(days=days_ahead + (week * 7))
-            needed_dates.append(event_date)
-            
-    elif config["type"] == "monthly":
-        month_day = config.get("month_day", 1)
-        weekday = config.get("weekday")
-        
-        for month in range(weeks_ahead // 4 + 1):
-            try:
-                if start_date.month == 12:
-                    event_date = start_date.replace(year=start_date.year + 1, month=1, day=month_day)
-                else:
-                    event_date = start_date.replace(month=start_date.month + month, day=month_day)
-                
-                if weekday is not None:
-                    while event_date.weekday() != weekday:
-                        event_date += timedelta(days=1)
-                
-                if event_date >= start_date:
-                    needed_dates.append(event_date)
-            except ValueError:
-                continue
+def _calculate_events_needed(event: dict, occurrences: list, existing_keys: set) -> list:
+    """
+    Instances a template still needs: its (start, end) occurrences minus the
+    (club_id, title, date) keys that already exist.
+    """
+    missing = [
+        (start, end) for start, end in occurrences
+        if (event["club_id"], event["title"], _instance_date(start)) not in existing_keys
+    ]
+    print(f"   📅 '{event['title']}': {len(occurrences) - len(missing)} existing, {len(missing)} need generation")
     
-    return needed_dates
+    return [_create_event_instance(event, start, end) for start, end in missing]
 
-def _find_missing_dates(needed_dates: list, existing_instances: list) -> list:
-    """Find which dates don't have events yet"""
-    from datetime import datetime
-    
-    if not existing_instances:
-        print(f"   📅 No existing instances found, generating all {len(needed_dates)} dates")
-        return needed_dates
-    
-    # Extract dates from existing instances
-    existing_dates = set()
-    for instance in existing_instances:
-        start_date = instance["start_date"]
-        if isinstance(start_date, str):
-            # Parse ISO string to date
-            try:
-                parsed_date = datetime.fromisoformat(start_date.replace('Z', '+00:00')).date()
-                existing_dates.add(parsed_date)
-            except ValueError:
-                continue
-        else:
-            # Already a datetime object
-            existing_dates.add(start_date.date())
+def _get_existing_instance_keys(first_date, last_date, club_id: str = None) -> set:
+    """
+    (club_id, title, club-local date) of every generated instance between
+    two local dates, loaded for all templates (or one club's) with one
+    (paged) query.
+    """
+    from datetime import timedelta
     
-    # Find missing dates
-    missing_dates = []
-    for needed_date in needed_dates:
-        if needed_date not in existing_dates:
-            missing_dates.append(needed_date)
+    def build_query():
+        # start_date is UTC; a day either side covers any local offset
+        query = supabase.table("events").select(
+            "title,club_id,start_date"
+        ).is_("recurring_config", "null").gte(
+            "start_date", (first_date - timedelta(days=1)).isoformat()
+        ).lt(
+            "start_date", (last_date + timedelta(days=2)).isoformat()
+        )
+        if club_id:
+            query = query.eq("club_id", club_id)
+        return query.order("id")
     
-    print(f"   📅 Found {len(existing_dates)} existing dates, {len(missing_dates)} dates need generation")
-    return missing_dates
-
-def _create_event_instance(event: dict, config: dict, event_date) -> dict:
-    """Create a single event instance for a specific date"""
-    from datetime import datetime
+    rows = _fetch_all_rows(build_query)
     
-    start_time = datetime.strptime(config["start_time"], "%H:%M").time()
-    end_time = datetime.strptime(config["end_time"], "%H:%M").time()
+    existing_keys = set()
+    for instance in rows:
+        try:
+            existing_keys.add((instance["club_id"], instance["title"], _instance_date(instance["start_date"])))
+        except (TypeError, ValueError):
+            continue
     
+    print(f"🔍 Found {len(existing_keys)} existing instances between {first_date} and {last_date}")
+    return existing_keys
+
+def _create_event_instance(event: dict, start, end) -> dict:
+    """Create a single event instance for one occurrence"""
     instance = {
         "title": event["title"],
         "caption": event["caption"],
         "club_id": event["club_id"],
         "poster_url": event["poster_url"],
         "music_genres": event["music_genres"],
-        "start_date": datetime.combine(event_date, start_time).isoformat(),
-        "end_date": datetime.combine(event_date, end_time).isoformat(),
+        "start_date": _to_utc_iso(start),
+        "end_date": _to_utc_iso(end),
         "created_by": event["created_by"],
         "recurring_config": None  # Individual instances don't need config
     }
@@ -857,104 +1041,24 @@ def _create_event_instance(event: dict, config: dict, event_date) -> dict:
 
 def generate_recurring_events(weeks_ahead: int = 4):
     """Generate events for all active recurring events"""
-    from datetime import datetime, timedelta
-    
     # Get all events with recurring config
     response = supabase.table("events").select("*").not_.is_("recurring_config", "null").execute()
-    recurring_events = response.data or []
+    recurring_events = [
+        event for event in response.data or []
+        if event["recurring_config"].get("active", True)
+    ]
     
     generated_events = []
-    
+    expanded = expand_templates(recurring_events, weeks_ahead)
     for event in recurring_events:
-        config = event["recurring_config"]
-        if not config.get("active", True):
-            continue
-            
-        if config["type"] == "weekly":
-            events = _generate_weekly_events(event, config, weeks_ahead)
-            generated_events.extend(events)
-            
-        elif config["type"] == "monthly":
-            events = _generate_monthly_events(event, config, weeks_ahead)
-            generated_events.extend(events)
+        for start, end in expanded.get(event["id"]) or []:
+            generated_events.append(_create_event_instance(event, start, end))
     
-    # Insert all generated events
+    # Insert all generated events (chunked; existing instances are skipped)
     if generated_events:
-        supabase.table("events").insert(generated_events).execute()
+        report = bulk_upsert("events", generated_events, on_conflict=EVENT_INSTANCE_CONFLICT_KEY)
+        if report["failed_rows"]:
+            raise Exception(f"Failed to insert {len(report['failed_rows'])} of {len(generated_events)} recurring events")
     
     return generated_events
 
-def _generate_weekly_events(event: dict, config: dict, weeks_ahead: int) -> list:
-    """Generate weekly recurring events"""
-    from datetime import datetime, timedelta
-    events = []
-    start_date = datetime.now().date()
-    weekday = config["weekday"]
-    start_time = datetime.strptime(config["start_time"], "%H:%M").time()
-    end_time = datetime.strptime(config["end_time"], "%H:%M").time()
-    
-    for week in range(weeks_ahead):
-        # Calculate next occurrence of this weekday
-        days_ahead = weekday - start_date.weekday()
-        if days_ahead <= 0:
-            days_ahead += 7
-        
-        event_date = start_date + timedelta(days=days_ahead + (week * 7))
-        
-        # Create event instance
-        instance = {
-            "title": event["title"],
-            "caption": event["caption"],
-            "club_id": event["club_id"],
-            "poster_url": event["poster_url"],
-            "music_genres": event["music_genres"],
-            "start_date": datetime.combine(event_date, start_time).isoformat(),
-            "end_date": datetime.combine(event_date, end_time).isoformat(),
-            "created_by": event["created_by"],
-            "recurring_config": None  # Individual instances don't need config
-        }
-        events.append(instance)
-    
-    return events
-
-def _generate_monthly_events(event: dict, config: dict, weeks_ahead: int) -> list:
-    """Generate monthly recurring events"""
-    from datetime import datetime, timedelta
-    events = []
-    start_date = datetime.now().date()
-    month_day = config.get("month_day", 1)
-    weekday = config.get("weekday")
-    start_time = datetime.strptime(config["start_time"], "%H:%M").time()
-    end_time = datetime.strptime(config["end_time"], "%H:%M").time()
-    
-    for month in range(weeks_ahead // 4 + 1):
-        try:
-            # Calculate next month's date
-            if start_date.month == 12:
-                event_date = start_date.replace(year=start_date.year + 1, month=1, day=month_day)
-            else:
-                event_date = start_date.replace(month=start_date.month + month, day=month_day)
-            
-            # Adjust for weekday if specified
-            if weekday is not None:
-                while event_date.weekday() != weekday:
-                    event_date += timedelta(days=1)
-            
-            if event_date >= start_date:
-                instance = {
-                    "title": event["title"],
-                    "caption": event["caption"],
-                    "club_id": event["club_id"],
-                    "poster_url": event["poster_url"],
-                    "music_genres": event["music_genres"],
-                    "start_date": datetime.combine(event_date, start_time).isoformat(),
-                    "end_date": datetime.combine(event_date, end_time).isoformat(),
-                    "created_by": event["created_by"],
-                    "recurring_config": None
-                }
-                events.append(instance)
-                
-        except ValueError:
-            continue  # Skip invalid dates
-    
-    return events
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Trending aggregation for clubs.
+
+A club is trending when it received at least MIN_RECENT_REVIEWS reviews in the
+last TRENDING_WINDOW_HOURS hours with an average rating of at least
+MIN_AVG_RATING. Its score is review count * average rating.
+
+This module does no I/O; callers in supabase_service fetch the review rows
+and either build a table directly or feed a TrendingCache.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+TRENDING_WINDOW_HOURS = 5
+MIN_RECENT_REVIEWS = 3
+MIN_AVG_RATING = 3.5
+
+
+def trending_stats(review_count: int, rating_sum: float) -> dict:
+    """Build the trending status for one club from its review count and rating sum"""
+    if review_count >= MIN_RECENT_REVIEWS:
+        avg_rating = rating_sum / review_count
+        if avg_rating >= MIN_AVG_RATING:
+            return {
+                "is_trending": True,
+                "trending_score": review_count * avg_rating,
+                "recent_reviews_count": review_count,
+                "avg_rating": round(avg_rating, 1)
+            }
+        return {
+            "is_trending": False,
+            "trending_score": 0,
+            "recent_reviews_count": review_count,
+            "avg_rating": round(avg_rating, 1)
+        }
+
+    return {
+        "is_trending": False,
+        "trending_score": 0,
+        "recent_reviews_count": review_count,
+        "avg_rating": 0
+    }
+
+
+def build_trending_table(reviews: list) -> dict:
+    """
+    Compute trending status for every club in one pass over the review rows.
+
+    Args:
+        reviews: Review rows with at least "club_id" and "rating"
+
+    Returns:
+        dict: club_id -> trending status (see trending_stats)
+    """
+    totals = {}
+    for review in reviews:
+        entry = totals.setdefault(review["club_id"], [0, 0])
+        entry[0] += 1
+        entry[1] += review["rating"]
+
+    return {
+        club_id: trending_stats(count, rating_sum)
+        for club_id, (count, rating_sum) in totals.items()
+    }
+
+
+def lookup(table: dict, club_id: str) -> dict:
+    """Trending status for a club, falling back to the not-trending defaults"""
+    return table.get(club_id) or trending_stats(0, 0)
+
+
+class TrendingCache:
+    """
+    Rolling-window trending state kept in fixed-size time buckets.
+
+    Each bucket holds per-club review counts and rating sums. Running totals
+    per club are maintained alongside the buckets, so a status read is O(1)
+    once expired buckets have been subtracted out. The window edge is exact to
+    within one bucket.
+
+    The cache is per process: reviews written by other workers only show up
+    after the next rebuild, so callers should rebuild once is_warm() is False.
+    """
+
+    def __init__(self, window_hours: int = TRENDING_WINDOW_HOURS, bucket_minutes: int = 5,
+                 rebuild_seconds: int = 300):
+        self.bucket_seconds = bucket_minutes * 60
+        self.bucket_count = (window_hours * 3600) // self.bucket_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._buckets = deque()  # (bucket_index, {club_id: [count, rating_sum]}), oldest first
+        self._totals = {}        # club_id -> [count, rating_sum] across live buckets
+        self._built_at = None
+
+    def _bucket_index(self, when: datetime) -> int:
+        return int(when.timestamp()) // self.bucket_seconds
+
+    def _expire(self, now: datetime):
+        """Drop buckets that have aged out of the window (caller holds the lock)"""
+        oldest_live = self._bucket_index(now) - self.bucket_count + 1
+        while self._buckets and self._buckets[0][0] < oldest_live:
+            _, bucket = self._buckets.popleft()
+            for club_id, (count, rating_sum) in bucket.items():
+                total = self._totals[club_id]
+                total[0] -= count
+                total[1] -= rating_sum
+                if total[0] <= 0:
+                    del self._totals[club_id]
+
+    def _add(self, club_id: str, rating: float, created_at: datetime):
+        """Add one review to its bucket (caller holds the lock)"""
+        index = self._bucket_index(created_at)
+
+        bucket = None
+        if not self._buckets or self._buckets[-1][0] < index:
+            bucket = {}
+            self._buckets.append((index, bucket))
+        else:
+            # Late arrival: walk back from the newest bucket
+            for position in range(len(self._buckets) - 1, -1, -1):
+                bucket_index, existing = self._buckets[position]
+                if bucket_index == index:
+                    bucket = existing
+                    break
+                if bucket_index < index:
+                    bucket = {}
+                    self._buckets.insert(position + 1, (index, bucket))
+                    break
+            if bucket is None:
+                bucket = {}
+                self._buckets.appendleft((index, bucket))
+
+        entry = bucket.setdefault(club_id, [0, 0])
+        entry[0] += 1
+        entry[1] += rating
+        total = self._totals.setdefault(club_id, [0, 0])
+        total[0] += 1
+        total[1] += rating
+
+    def rebuild(self, reviews: list, now: datetime = None):
+        """
+        Replace the cache contents from a bulk query result.
+
+        Args:
+            reviews: Review rows with "club_id", "rating" and "created_at"
+            now: Reference time (defaults to the current UTC time)
+        """
+        now = now or _utcnow()
+        with self._lock:
+            self._buckets = deque()
+            self._totals = {}
+            for review in sorted(reviews, key=lambda r: r["created_at"]):
+                self._add(review["club_id"], review["rating"], parse_timestamp(review["created_at"]))
+            self._expire(now)
+            self._built_at = now
+
+    def record(self, club_id: str, rating: float, created_at=None):
+        """Add a newly written review (write path of add_club_review)"""
+        created_at = parse_timestamp(created_at) if created_at else _utcnow()
+        with self._lock:
+            if self._built_at is None:
+                return  # Nothing to update until the first rebuild
+            self._add(club_id, rating, created_at)
+
+    def is_warm(self, now: datetime = None) -> bool:
+        """Whether the cache has been built recently enough to serve reads"""
+        if self._built_at is None:
+            return False
+        now = now or _utcnow()
+        return (now - self._built_at).total_seconds() < self.rebuild_seconds
+
+    def invalidate(self):
+        """Force the next read to rebuild"""
+        with self._lock:
+            self._built_at = None
+
+    def status(self, club_id: str, now: datetime = None) -> dict:
+        """Trending status for one club"""
+        with self._lock:
+            self._expire(now or _utcnow())
+            count, rating_sum = self._totals.get(club_id, (0, 0))
+        return trending_stats(count, rating_sum)
+
+    def table(self, now: datetime = None) -> dict:
+        """Trending status for every club with reviews in the window"""
+        with self._lock:
+            self._expire(now or _utcnow())
+            totals = {club_id: tuple(total) for club_id, total in self._totals.items()}
+        return {
+            club_id: trending_stats(count, rating_sum)
+            for club_id, (count, rating_sum) in totals.items()
+        }
+
+
+def parse_timestamp(value) -> datetime:
+    """Parse a Supabase timestamp (ISO string or datetime) as an aware UTC datetime"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,220 @@
+"""
+In-memory username search over profiles.
+
+Usernames are kept in a sorted list for prefix lookups (bisect) and in a
+trigram index for "contains" matches, so a keystroke is a few dict/set
+operations instead of an `ilike '%term%'` scan. Results use the compact
+USER_SEARCH_FIELDS projection and are ranked: exact username, then username
+prefix matches, then substring matches; within each group, users in the
+searcher's network (friends and friends-of-friends) come first. Terms of one
+or two letters are too short for trigrams and fall back to a scan of the
+sorted usernames that stops once enough matches are found.
+
+Profile writes through the API update the index of the process that made
+them (when it is loaded), without invalidating other processes: they, and
+sign-ups and edits made directly by the app, are picked up by the TTL
+reload (USER_SEARCH_TTL_SECONDS).
+"""
+
+import bisect
+import os
+import threading
+import time
+
+from services.versions import get_version
+
+USER_SEARCH_VERSION_SCOPE = "profiles.search"
+USER_SEARCH_TTL_SECONDS = int(os.getenv("USER_SEARCH_TTL_SECONDS", "300"))
+USER_SEARCH_FIELDS = ("id", "username", "avatar_url")
+
+# Non-boosted prefix matches considered per query before ranking (bounds
+# 1-letter queries); boosted users are always considered
+MAX_PREFIX_CANDIDATES = 500
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class UserSearchIndex:
+    """Prefix + trigram index over usernames"""
+
+    def __init__(self, loader, ttl_seconds: int = USER_SEARCH_TTL_SECONDS):
+        """
+        Args:
+            loader: Callable returning profiles rows (id, username, avatar_url)
+            ttl_seconds: Maximum age of the loaded index
+        """
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._users = {}     # user_id -> compact profile
+        self._sorted = []    # (lowercase username, user_id), sorted
+        self._trigrams = {}  # trigram -> set of user ids
+        self._loaded_at = None
+        self._loaded_version = None
+
+    def is_fresh(self) -> bool:
+        """Whether the index can be served without reloading"""
+        if self._loaded_at is None:
+            return False
+        if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            return False
+        return get_version(USER_SEARCH_VERSION_SCOPE) == self._loaded_version
+
+    def load(self, rows: list, version: int):
+        """Rebuild from profiles rows (version read before the fetch)"""
+        users = {}
+        trigrams = {}
+        for row in rows:
+            username = (row.get("username") or "").lower()
+            if not username:
+                continue
+            users[row["id"]] = {field: row.get(field) for field in USER_SEARCH_FIELDS}
+            for trigram in _trigrams(username):
+                trigrams.setdefault(trigram, set()).add(row["id"])
+        entries = sorted((profile["username"].lower(), user_id) for user_id, profile in users.items())
+
+        with self._lock:
+            self._users = users
+            self._sorted = entries
+            self._trigrams = trigrams
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        """Reload the index if it is missing, expired, or invalidated"""
+        if self.is_fresh():
+            return
+        with self._lock:
+            if self.is_fresh():
+                return
+            version = get_version(USER_SEARCH_VERSION_SCOPE)
+            self.load(self._loader() or [], version)
+
+    def _unindex(self, user_id: str):
+        profile = self._users.pop(user_id, None)
+        if not profile:
+            return
+        username = profile["username"].lower()
+        position = bisect.bisect_left(self._sorted, (username, user_id))
+        if position < len(self._sorted) and self._sorted[position] == (username, user_id):
+            del self._sorted[position]
+        for trigram in _trigrams(username):
+            postings = self._trigrams.get(trigram)
+            if postings is not None:
+                postings.discard(user_id)
+                if not postings:
+                    del self._trigrams[trigram]
+
+    def upsert(self, profile: dict):
+        """Add or re-index a profile after a write (a cold index reads it on load)"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._unindex(profile["id"])
+            username = (profile.get("username") or "").lower()
+            if username:
+                self._users[profile["id"]] = {field: profile.get(field) for field in USER_SEARCH_FIELDS}
+                bisect.insort(self._sorted, (username, profile["id"]))
+                for trigram in _trigrams(username):
+                    self._trigrams.setdefault(trigram, set()).add(profile["id"])
+
+    def remove(self, user_id: str):
+        """Drop a deleted profile"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._unindex(user_id)
+
+    def _prefix_matches(self, term: str, limit: int) -> list:
+        matches = []
+        position = bisect.bisect_left(self._sorted, (term,))
+        while position < len(self._sorted) and len(matches) < max(limit, MAX_PREFIX_CANDIDATES):
+            username, user_id = self._sorted[position]
+            if not username.startswith(term):
+                break
+            matches.append(user_id)
+            position += 1
+        return matches
+
+    def _substring_matches(self, term: str, limit: int) -> set:
+        if len(term) < 3:
+            # Too short for trigrams: the first `limit` matches in username
+            # order are all that can rank among the non-boosted results
+            matches = set()
+            for username, user_id in self._sorted:
+                if term in username:
+                    matches.add(user_id)
+                    if len(matches) >= limit:
+                        break
+            return matches
+        postings = [self._trigrams.get(trigram, set()) for trigram in _trigrams(term)]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return set()
+        return {user_id for user_id in candidates if term in self._users[user_id]["username"].lower()}
+
+    def search(self, term: str, limit: int = 20, boost_ids: set = None) -> list:
+        """
+        Users whose username contains `term`, best matches first.
+
+        Args:
+            term: Search text (case-insensitive)
+            limit: Maximum number of results
+            boost_ids: User ids ranked ahead of others within each match group
+        """
+        term = term.lower().strip()
+        if not term:
+            return []
+        self.ensure_loaded()
+        boost_ids = boost_ids or set()
+
+        with self._lock:
+            # Boosted matches are added before any truncation so they can't be cut
+            boosted = {
+                user_id for user_id in boost_ids
+                if user_id in self._users and term in self._users[user_id]["username"].lower()
+            }
+            candidates = set(self._prefix_matches(term, limit)) | self._substring_matches(term, limit) | boosted
+
+            def rank(user_id):
+                username = self._users[user_id]["username"].lower()
+                group = 0 if username == term else 1 if username.startswith(term) else 2
+                return (group, user_id not in boost_ids, username)
+
+            ranked = sorted(candidates, key=rank)[:limit]
+            return [dict(self._users[user_id]) for user_id in ranked]
+
+
+def _load_profiles():
+    from services.supabase_service import _fetch_all_rows, supabase
+    return _fetch_all_rows(
+        lambda: supabase.table("profiles").select(",".join(USER_SEARCH_FIELDS)).order("id")
+    )
+
+
+_user_search_index = UserSearchIndex(loader=_load_profiles)
+
+
+def get_user_search_index() -> UserSearchIndex:
+    return _user_search_index
+
+
+def search_users(term: str, limit: int = 20, user_id: str = None) -> list:
+    """
+    Username search for the users endpoint.
+
+    Args:
+        term: Search text
+        limit: Maximum number of results
+        user_id: Searching user; their friends and friends-of-friends are boosted
+    """
+    boost_ids = set()
+    if user_id:
+        from services.friend_graph import get_friend_graph
+        boost_ids = get_friend_graph().network(user_id)
+    return _user_search_index.search(term, limit, boost_ids)
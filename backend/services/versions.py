@@ -0,0 +1,49 @@
+"""
+Version stamps for cached data.
+
+Each scope (e.g. "clubs") has a version that writers bump and readers compare
+against the version their cache was built from. Versions are stored as the
+mtime of a stamp file under VERSION_DIR, so a bump from an ingestion script is
+seen by every server process on the same host with a single os.stat().
+
+Only processes that share VERSION_DIR see each other's bumps. By default it is
+a directory under the host's temp dir, so a bump made in another container or
+on another host never reaches the web processes; those pick the change up when
+their cache's TTL runs out. Point MOTIVZ_VERSION_DIR at a directory every
+process mounts to run writers elsewhere.
+"""
+
+import os
+import re
+import tempfile
+import time
+
+VERSION_DIR = os.getenv("MOTIVZ_VERSION_DIR", os.path.join(tempfile.gettempdir(), "motivz-versions"))
+
+
+def _stamp_path(scope: str) -> str:
+    safe_scope = re.sub(r"[^A-Za-z0-9_.-]", "_", scope)
+    return os.path.join(VERSION_DIR, f"{safe_scope}.stamp")
+
+
+def get_version(scope: str) -> int:
+    """Current version of a scope (0 if it has never been bumped)"""
+    try:
+        return os.stat(_stamp_path(scope)).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def bump_version(scope: str) -> int:
+    """Advance the version of a scope and return the new version"""
+    path = _stamp_path(scope)
+    try:
+        os.makedirs(VERSION_DIR, exist_ok=True)
+        version = max(time.time_ns(), get_version(scope) + 1)
+        with open(path, "a"):
+            pass
+        os.utime(path, ns=(version, version))
+        return version
+    except OSError as e:
+        print(f"Error bumping version for {scope}: {e}")
+        return get_version(scope)
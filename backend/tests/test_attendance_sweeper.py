@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the attendance expiry sweeper
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services import attendance
+from services.attendance import AttendanceSweeper
+
+
+class AttendanceSweeperTester:
+    """Test class for the attendance sweeper"""
+
+    def __init__(self):
+        self.test_results = []
+        self.now = datetime(2025, 5, 18, 3, 0, tzinfo=timezone.utc)
+
+    def _sweeper(self, profiles):
+        """Sweeper over an in-memory profiles table: user_id -> deadline"""
+        self.bulk_updates = 0
+
+        def load_deadlines():
+            return [{"id": user_id, "active_club_closed": deadline.isoformat()} for user_id, deadline in profiles.items()]
+
+        def clear_expired(now):
+            self.bulk_updates += 1
+            due = [user_id for user_id, deadline in profiles.items() if deadline <= now]
+            for user_id in due:
+                del profiles[user_id]
+            return due
+
+        sweeper = AttendanceSweeper(load_deadlines, clear_expired)
+        sweeper.refresh()
+        return sweeper
+
+    def test_one_bulk_update_per_expiry(self):
+        """All users due at a deadline are cleared by one bulk update"""
+        print("\n🧪 Test 1: One bulk update per expiry...")
+        profiles = {
+            "u1": self.now - timedelta(minutes=5),
+            "u2": self.now,
+            "u3": self.now + timedelta(hours=1),
+        }
+        sweeper = self._sweeper(profiles)
+        cleared = sweeper.sweep(self.now)
+
+        success = (
+            sorted(cleared) == ["u1", "u2"]
+            and self.bulk_updates == 1
+            and list(profiles) == ["u3"]
+            and sweeper.next_deadline() == self.now + timedelta(hours=1)
+        )
+        self.test_results.append(("One Bulk Update Per Expiry", success, None))
+        return success
+
+    def test_nothing_due_means_no_write(self):
+        """Sweeping before the earliest deadline does not write"""
+        print("\n🧪 Test 2: Nothing due means no write...")
+        sweeper = self._sweeper({"u1": self.now + timedelta(minutes=30)})
+        cleared = sweeper.sweep(self.now)
+
+        success = cleared == [] and self.bulk_updates == 0
+        self.test_results.append(("Nothing Due Means No Write", success, None))
+        return success
+
+    def test_rescheduled_check_in(self):
+        """A re-check-in supersedes the user's old deadline"""
+        print("\n🧪 Test 3: Rescheduled check-in...")
+        sweeper = self._sweeper({})
+        sweeper.schedule("u1", self.now - timedelta(minutes=1))
+        sweeper.schedule("u1", self.now + timedelta(hours=2))
+        cleared = sweeper.sweep(self.now)
+
+        success = cleared == [] and self.bulk_updates == 0 and sweeper.next_deadline() == self.now + timedelta(hours=2)
+        self.test_results.append(("Rescheduled Check-In", success, None))
+        return success
+
+    def test_check_ins_only_tracked_by_a_running_sweeper(self):
+        """Views only schedule on a sweeper thread in their own process; bad deadlines are skipped"""
+        print("\n🧪 Test 4: Check-ins tracked only by a running sweeper...")
+        heap = attendance.get_attendance_sweeper()._heap
+        deadline = (self.now + timedelta(hours=2)).isoformat()
+        without_thread = [attendance.track_check_in(f"u{number}", deadline) for number in range(100)]
+        heap_size = len(heap)
+
+        stop = threading.Event()
+        original = attendance._background_thread
+        attendance._background_thread = threading.Thread(target=stop.wait, daemon=True)
+        attendance._background_thread.start()
+        try:
+            scheduled = attendance.track_check_in("u1", deadline)
+            malformed = attendance.track_check_in("u2", "not a timestamp")
+            attendance.track_check_out("u1")
+        finally:
+            stop.set()
+            attendance._background_thread = original
+
+        success = not any(without_thread) and heap_size == 0 and scheduled and not malformed
+        self.test_results.append(("Check-Ins Only Tracked By A Running Sweeper", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all attendance sweeper tests"""
+        print("🚀 Starting Attendance Sweeper Tests")
+        print("=" * 60)
+
+        self.test_one_bulk_update_per_expiry()
+        self.test_nothing_due_means_no_write()
+        self.test_rescheduled_check_in()
+        self.test_check_ins_only_tracked_by_a_running_sweeper()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = AttendanceSweeperTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
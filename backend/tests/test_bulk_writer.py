@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the chunked bulk writer
+These tests use an in-memory stand-in for the Supabase client and do not touch Supabase
+"""
+
+import os
+import sys
+
+import httpx
+from postgrest.exceptions import APIError
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.bulk_writer import bulk_upsert, is_transient
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class LocalTable:
+    """Upsert with ON CONFLICT DO NOTHING over an in-memory list"""
+
+    def __init__(self, client):
+        self.client = client
+        self._rows = None
+        self._key = None
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False):
+        self._rows, self._key = rows, on_conflict.split(",")
+        return self
+
+    def execute(self):
+        self.client.requests.append(len(self._rows))
+        if self.client.failures:
+            raise self.client.failures.pop(0)
+        inserted = []
+        for row in self._rows:
+            key = tuple(row[column] for column in self._key)
+            if key not in self.client.keys:
+                self.client.keys.add(key)
+                inserted.append(row)
+        return _Response(inserted)
+
+
+class LocalClient:
+    def __init__(self, failures=None):
+        self.failures = list(failures or [])
+        self.requests = []
+        self.keys = set()
+
+    def table(self, name):
+        return LocalTable(self)
+
+
+def _rows(count, club_id="club-1"):
+    return [{"club_id": club_id, "title": "Friday", "start_date": f"2025-05-{day:02d}T22:00:00"} for day in range(1, count + 1)]
+
+
+class BulkWriterTester:
+    """Test class for the bulk writer"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def test_chunking_and_idempotence(self):
+        """Rows are split into chunks and re-sent rows are skipped"""
+        print("\n🧪 Test 1: Chunking and idempotence...")
+        client = LocalClient()
+        first = bulk_upsert("events", _rows(25), "club_id,title,start_date", chunk_size=10, client=client)
+        second = bulk_upsert("events", _rows(30), "club_id,title,start_date", chunk_size=10, client=client)
+        success = (
+            client.requests == [10, 10, 5, 10, 10, 10]
+            and first["inserted"] == 25 and first["skipped"] == 0
+            and second["inserted"] == 5 and second["skipped"] == 25
+            and len(second["chunks"]) == 3 and not second["failed_rows"]
+        )
+        self.test_results.append(("Chunking And Idempotence", success, None))
+        return success
+
+    def test_transient_retry(self):
+        """Transient failures are retried; permanent ones fail only their chunk"""
+        print("\n🧪 Test 2: Retries...")
+        client = LocalClient(failures=[
+            httpx.ConnectError("connection reset"),
+            APIError({"message": "duplicate column", "code": "42701"}),
+        ])
+        report = bulk_upsert("events", _rows(20), "club_id,title,start_date", chunk_size=10, backoff_seconds=0, client=client)
+        chunks = report["chunks"]
+        success = (
+            # chunk 0: connect error, then permanent error -> failed after 2 attempts
+            chunks[0]["attempts"] == 2 and chunks[0]["error"] is not None
+            and chunks[1]["attempts"] == 1 and chunks[1]["error"] is None
+            and report["inserted"] == 10 and len(report["failed_rows"]) == 10
+        )
+        self.test_results.append(("Transient Retry", success, None))
+        return success
+
+    def test_transient_classification(self):
+        """Connection, 5xx and deadlock errors are transient; constraint errors are not"""
+        print("\n🧪 Test 3: Transient classification...")
+        success = (
+            is_transient(httpx.ReadTimeout("timed out"))
+            and is_transient(APIError({"message": "Bad gateway", "code": "502"}))
+            and is_transient(APIError({"message": "deadlock detected", "code": "40P01"}))
+            and not is_transient(APIError({"message": "not null violation", "code": "23502"}))
+            and not is_transient(ValueError("bad row"))
+        )
+        self.test_results.append(("Transient Classification", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all bulk writer tests"""
+        print("🚀 Starting Bulk Writer Tests")
+        print("=" * 60)
+
+        self.test_chunking_and_idempotence()
+        self.test_transient_retry()
+        self.test_transient_classification()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = BulkWriterTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for club catalog paging and projections
+These tests use an in-memory catalog loader and do not touch Supabase
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Keep version stamps written by these tests out of the real stamp directory
+os.environ["MOTIVZ_VERSION_DIR"] = tempfile.mkdtemp(prefix="motivz-catalog-test-")
+
+from services import supabase_service
+from services.club_catalog import ClubCatalog
+
+CLUBS = [
+    {"id": f"club-{number:02d}", "Name": f"Club {number}", "Address": "Toronto", "Rating": 4.0,
+     "Image": None, "latitude": 43.6, "longitude": -79.4, "Description": "Long text"}
+    for number in (7, 3, 12, 1, 5)  # Loader order is not id order
+]
+
+
+class ClubCatalogTester:
+    """Test class for club catalog paging"""
+
+    def __init__(self):
+        self.test_results = []
+        self.loads = 0
+
+    def _catalog(self):
+        def loader():
+            self.loads += 1
+            return [dict(club) for club in CLUBS]
+        return ClubCatalog(loader=loader)
+
+    def test_keyset_pages(self):
+        """Pages follow id order, cursors chain, and every page comes from one load"""
+        print("\n🧪 Test 1: Keyset pages...")
+        self.loads = 0
+        catalog = self._catalog()
+        first, cursor = catalog.page(limit=2)
+        second, cursor_2 = catalog.page(after=cursor, limit=2)
+        last, cursor_3 = catalog.page(after=cursor_2, limit=2)
+        ids = [club["id"] for club in first + second + last]
+        success = (
+            ids == ["club-01", "club-03", "club-05", "club-07", "club-12"]
+            and cursor == "club-03" and cursor_2 == "club-07" and cursor_3 is None
+            and catalog.page(after="club-12")[0] == []
+            and self.loads == 1
+        )
+        self.test_results.append(("Keyset Pages", success, None))
+        return success
+
+    def test_projection_and_unknown_fields(self):
+        """Card projection by default, the id always kept, unknown columns rejected"""
+        print("\n🧪 Test 2: Projections and unknown fields...")
+        original = supabase_service._club_catalog
+        supabase_service._club_catalog = self._catalog()
+        try:
+            cards, _ = supabase_service.get_clubs_page(limit=1)
+            names, _ = supabase_service.get_clubs_page(limit=1, fields=["Name"])
+            everything, _ = supabase_service.get_clubs_page(limit=1, fields=["*"])
+            try:
+                supabase_service.get_clubs_page(fields=["Name", "Password"])
+                rejected = False
+            except ValueError:
+                rejected = True
+        finally:
+            supabase_service._club_catalog = original
+
+        success = (
+            list(cards[0]) == ["id"] + [field for field in supabase_service.CLUB_CARD_FIELDS if field != "id"]
+            and names == [{"id": "club-01", "Name": "Club 1"}]
+            and everything[0]["Description"] == "Long text"
+            and rejected
+        )
+        self.test_results.append(("Projection And Unknown Fields", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all club catalog tests"""
+        print("🚀 Starting Club Catalog Tests")
+        print("=" * 60)
+
+        self.test_keyset_pages()
+        self.test_projection_and_unknown_fields()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = ClubCatalogTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
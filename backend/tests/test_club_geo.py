@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the club geo index and the nearby-clubs endpoint
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+
+import django
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Set up Django environment
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from rest_framework.test import APIRequestFactory
+
+from clubs import views
+from services.club_geo import CELL_DEGREES, ClubGeoIndex, _cell, haversine_m
+
+# Rebel as the query point; the other clubs are at known distances from it
+REBEL = (43.6401, -79.3544)
+
+CLUBS = [
+    {"id": "rebel", "latitude": 43.6401, "longitude": -79.3544},
+    {"id": "cabana", "latitude": 43.6405, "longitude": -79.3550},
+    {"id": "lavelle", "latitude": 43.6446, "longitude": -79.4004},
+    {"id": "toybox", "latitude": 43.6470, "longitude": -79.3990},
+    {"id": "montreal", "latitude": 45.5017, "longitude": -73.5673},
+    {"id": "no-coords", "latitude": None, "longitude": None},
+    {"id": "bad-coords", "latitude": "north", "longitude": -79.4},
+]
+
+
+class ClubGeoTester:
+    """Test class for the club geo index and nearby endpoint"""
+
+    def __init__(self):
+        self.test_results = []
+        self.factory = APIRequestFactory()
+
+    def _index(self, clubs=CLUBS):
+        index = ClubGeoIndex()
+        index.sync([dict(club) for club in clubs])
+        return index
+
+    @staticmethod
+    def _ids(results):
+        return [club["id"] for club in results]
+
+    def test_nearest_first_within_radius(self):
+        """Only clubs inside the radius, nearest first, with distance_m; bad rows skipped"""
+        print("\n🧪 Test 1: Nearest first within radius...")
+        index = self._index()
+        results = index.nearby(*REBEL, radius_m=5000)
+        expected_lavelle = round(haversine_m(*REBEL, 43.6446, -79.4004))
+        success = (
+            self._ids(results) == ["rebel", "cabana", "toybox", "lavelle"]
+            and results[0]["distance_m"] == 0
+            and results[3]["distance_m"] == expected_lavelle
+            and self._ids(index.nearby(*REBEL, radius_m=100)) == ["rebel", "cabana"]
+            and self._ids(index.nearby(*REBEL, radius_m=5000, limit=2)) == ["rebel", "cabana"]
+            and "distance_m" not in CLUBS[0]  # Results are copies
+        )
+        self.test_results.append(("Nearest First Within Radius", success, None))
+        return success
+
+    def test_cell_boundaries(self):
+        """Clubs just across a grid line, and on it, are found from either side"""
+        print("\n🧪 Test 2: Cell boundaries...")
+        line_lat, line_lng = 4365 * CELL_DEGREES, -7938 * CELL_DEGREES  # A grid corner
+        index = self._index([
+            {"id": "below", "latitude": line_lat - 0.0001, "longitude": line_lng + 0.0001},
+            {"id": "above", "latitude": line_lat + 0.0001, "longitude": line_lng - 0.0001},
+            {"id": "on-line", "latitude": line_lat, "longitude": line_lng},
+        ])
+        from_below = self._ids(index.nearby(line_lat - 0.0001, line_lng + 0.0001, radius_m=50))
+        from_above = self._ids(index.nearby(line_lat + 0.0001, line_lng - 0.0001, radius_m=50))
+        success = (
+            _cell(line_lat - 0.0001, line_lng + 0.0001) != _cell(line_lat + 0.0001, line_lng - 0.0001)
+            and from_below == ["below", "on-line", "above"]
+            and from_above == ["above", "on-line", "below"]
+        )
+        self.test_results.append(("Cell Boundaries", success, None))
+        return success
+
+    def test_antimeridian_and_poles(self):
+        """A radius crossing ±180° longitude or reaching a pole still finds every club"""
+        print("\n🧪 Test 3: Antimeridian and poles...")
+        index = self._index([
+            {"id": "fiji-east", "latitude": -16.5, "longitude": 179.999},
+            {"id": "fiji-west", "latitude": -16.5, "longitude": -179.999},
+            {"id": "pole-a", "latitude": 89.999, "longitude": 0.0},
+            {"id": "pole-b", "latitude": 89.999, "longitude": 180.0},
+        ])
+        success = (
+            self._ids(index.nearby(-16.5, 179.9995, radius_m=1000)) == ["fiji-east", "fiji-west"]
+            and self._ids(index.nearby(-16.5, -179.9995, radius_m=1000)) == ["fiji-west", "fiji-east"]
+            and set(self._ids(index.nearby(90.0, 0.0, radius_m=1000))) == {"pole-a", "pole-b"}
+        )
+        self.test_results.append(("Antimeridian And Poles", success, None))
+        return success
+
+    def test_endpoint_clamps_and_validation(self):
+        """The nearby endpoint clamps radius and limit and rejects bad parameters"""
+        print("\n🧪 Test 4: Endpoint clamps and validation...")
+        calls = []
+        original = views.get_nearby_clubs
+        views.get_nearby_clubs = lambda lat, lng, radius, limit: calls.append((lat, lng, radius, limit)) or []
+        try:
+            def status(**params):
+                return views.get_nearby_clubs_view(self.factory.get("/clubs/nearby/", params)).status_code
+
+            ok = status(lat=43.64, lng=-79.35, radius=1000000, limit=5000)
+            defaults = status(lat=43.64, lng=-79.35)
+            rejected = [
+                status(lng=-79.35),
+                status(lat="north", lng=-79.35),
+                status(lat=91, lng=-79.35),
+                status(lat=43.64, lng=-181),
+                status(lat=43.64, lng=-79.35, radius=0),
+                status(lat=43.64, lng=-79.35, limit=-1),
+            ]
+        finally:
+            views.get_nearby_clubs = original
+
+        success = (
+            ok == 200 and defaults == 200
+            and calls == [(43.64, -79.35, 50000, 100), (43.64, -79.35, 5000, 20)]
+            and rejected == [400] * 6
+        )
+        self.test_results.append(("Endpoint Clamps And Validation", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all club geo tests"""
+        print("🚀 Starting Club Geo Tests")
+        print("=" * 60)
+
+        self.test_nearest_first_within_radius()
+        self.test_cell_boundaries()
+        self.test_antimeridian_and_poles()
+        self.test_endpoint_clamps_and_validation()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = ClubGeoTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory club search index
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.club_search import ClubSearchIndex
+
+CLUBS = [
+    {"id": "rebel", "Name": "Rebel", "Address": "11 Polson St, Toronto"},
+    {"id": "rebel-house", "Name": "Rebel House", "Address": "1068 Yonge St, Toronto"},
+    {"id": "cabana", "Name": "Cabana Pool Bar", "Address": "11 Polson St, Toronto"},
+    {"id": "lavelle", "Name": "Lavelle", "Address": "627 King St W, Toronto"},
+    {"id": "toybox", "Name": "Toybox", "Address": "473 Adelaide St W, Toronto"},
+]
+
+
+class ClubSearchTester:
+    """Test class for the club search index"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def _index(self):
+        index = ClubSearchIndex()
+        index.sync([dict(club) for club in CLUBS])
+        return index
+
+    @staticmethod
+    def _ids(results):
+        return [club["id"] for club in results]
+
+    def test_prefix_and_ranking(self):
+        """Names starting with the query first, then alphabetical; every token must match"""
+        print("\n🧪 Test 1: Prefix matches and ranking...")
+        index = self._index()
+        success = (
+            self._ids(index.search("reb")) == ["rebel", "rebel-house"]
+            # "polson" matches by address only, so both rank after any name-prefix match
+            and self._ids(index.search("polson")) == ["cabana", "rebel"]
+            and self._ids(index.search("rebel yonge")) == ["rebel-house"]
+            and self._ids(index.search("king", limit=1)) == ["lavelle"]
+        )
+        self.test_results.append(("Prefix And Ranking", success, None))
+        return success
+
+    def test_substring_fallback(self):
+        """Mid-word fragments of names and addresses still match, as they used to"""
+        print("\n🧪 Test 2: Substring fallback...")
+        index = self._index()
+        success = (
+            self._ids(index.search("bel")) == ["rebel", "rebel-house"]
+            and self._ids(index.search("ybo")) == ["toybox"]
+            and self._ids(index.search("laide st")) == ["toybox"]
+            and self._ids(index.search("zzz")) == []
+        )
+        self.test_results.append(("Substring Fallback", success, None))
+        return success
+
+    def test_typo_tolerance(self):
+        """Short typos in name tokens still find the club, after exact matches"""
+        print("\n🧪 Test 3: Typo tolerance...")
+        index = self._index()
+        success = (
+            self._ids(index.search("rebl")) == ["rebel", "rebel-house"]
+            and self._ids(index.search("lavele")) == ["lavelle"]
+            and self._ids(index.search("cab")) == ["cabana"]  # Too short for typos
+        )
+        self.test_results.append(("Typo Tolerance", success, None))
+        return success
+
+    def test_incremental_updates(self):
+        """Renames, removals and catalog syncs keep every lookup in step"""
+        print("\n🧪 Test 4: Incremental updates...")
+        index = self._index()
+        index.upsert({"id": "toybox", "Name": "Nest", "Address": "423 College St, Toronto"})
+        index.remove("cabana")
+        renamed = (
+            self._ids(index.search("toybox")) == []
+            and self._ids(index.search("ybo")) == []
+            and self._ids(index.search("nest")) == ["toybox"]
+            and self._ids(index.search("polson")) == ["rebel"]
+        )
+        index.sync([dict(club) for club in CLUBS])
+        synced = self._ids(index.search("toybox")) == ["toybox"] and self._ids(index.search("nest")) == []
+
+        success = renamed and synced
+        self.test_results.append(("Incremental Updates", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all club search tests"""
+        print("🚀 Starting Club Search Tests")
+        print("=" * 60)
+
+        self.test_prefix_and_ranking()
+        self.test_substring_fallback()
+        self.test_typo_tolerance()
+        self.test_incremental_updates()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = ClubSearchTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
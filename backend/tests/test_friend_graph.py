@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory friend graph
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Keep version stamps written by these tests out of the real stamp directory
+os.environ["MOTIVZ_VERSION_DIR"] = tempfile.mkdtemp(prefix="motivz-friends-test-")
+
+from services.friend_graph import FRIENDSHIPS_VERSION_SCOPE, FriendGraph
+from services.presence import PRESENCE_VERSION_SCOPE, PresenceIndex
+from services.versions import get_version
+
+FRIENDSHIPS = [
+    {"requester_id": "alice", "receiver_id": "bob", "status": "accepted"},
+    {"requester_id": "carol", "receiver_id": "alice", "status": "accepted"},
+    {"requester_id": "bob", "receiver_id": "dave", "status": "accepted"},
+    {"requester_id": "carol", "receiver_id": "dave", "status": "accepted"},
+    {"requester_id": "carol", "receiver_id": "erin", "status": "accepted"},
+    {"requester_id": "frank", "receiver_id": "alice", "status": "pending"},
+    {"requester_id": "bob", "receiver_id": "frank", "status": "accepted"},
+]
+
+
+class FriendGraphTester:
+    """Test class for the friend graph"""
+
+    def __init__(self):
+        self.test_results = []
+        self.loads = 0
+
+    def _graph(self):
+        def loader():
+            self.loads += 1
+            return FRIENDSHIPS
+        return FriendGraph(loader=loader)
+
+    def test_mutual_friends_and_suggestions(self):
+        """Suggestions are friends of friends ranked by mutual count"""
+        print("\n🧪 Test 1: Mutual friends and suggestions...")
+        graph = self._graph()
+        success = (
+            graph.mutual_friends("alice", "dave") == {"bob", "carol"}
+            # frank has a pending request with alice, so is not suggested
+            and graph.suggestions("alice") == [("dave", 2), ("erin", 1)]
+            and graph.network("alice") == {"bob", "carol", "dave", "erin", "frank"}
+        )
+        self.test_results.append(("Mutual Friends And Suggestions", success, None))
+        return success
+
+    def test_incremental_updates(self):
+        """Writes patch a loaded graph in place, without loading a cold one or invalidating other processes"""
+        print("\n🧪 Test 2: Incremental updates...")
+        self.loads = 0
+        graph = self._graph()
+        version = get_version(FRIENDSHIPS_VERSION_SCOPE)
+        graph.set_edge("frank", "erin", "pending")  # Cold: the next load reads it from the database
+        cold_loads = self.loads
+
+        graph.friends_of("alice")  # Loads the graph
+        graph.set_edge("frank", "alice", "accepted")
+        accepted = "frank" in graph.friends_of("alice")
+        graph.remove_edge("alice", "bob")
+        # bob is now a friend-of-friend suggestion (via frank) rather than a friend
+        removed = "bob" not in graph.friends_of("alice") and ("bob", 1) in graph.suggestions("alice")
+
+        success = (
+            cold_loads == 0 and accepted and removed and self.loads == 1
+            and get_version(FRIENDSHIPS_VERSION_SCOPE) == version
+        )
+        self.test_results.append(("Incremental Updates", success, None))
+        return success
+
+    def test_friends_attending(self):
+        """Friend set intersected with venue presence, and occupancy counters that skip expired users"""
+        print("\n🧪 Test 3: Friends attending...")
+        now = datetime.now(timezone.utc)
+        later = (now + timedelta(hours=3)).isoformat()
+        earlier = (now - timedelta(hours=1)).isoformat()
+        presence = PresenceIndex(loader=lambda: [
+            {"id": "bob", "active_club_id": "club-1", "active_club_closed": later},
+            {"id": "carol", "active_club_id": "club-1", "active_club_closed": earlier},
+            {"id": "erin", "active_club_id": "club-1", "active_club_closed": later},
+            {"id": "dave", "active_club_id": "club-2", "active_club_closed": later},
+        ])
+        friends = self._graph().friends_of("alice")  # bob, carol
+
+        before = presence.present_among("club-1", friends, at=now)
+        occupancy_before = presence.occupancy("club-1")
+        presence.check_in("carol", "club-1", later)
+        presence.check_out("bob")
+        after = presence.present_among("club-1", friends, at=now)
+
+        success = (
+            before == {"bob"} and after == {"carol"}
+            and occupancy_before == 2  # carol's attendance has expired
+            and presence.occupancy_all() == {"club-1": 2, "club-2": 1}
+        )
+        self.test_results.append(("Friends Attending", success, None))
+        return success
+
+    def test_presence_writes_stay_local(self):
+        """Check-ins patch a loaded index only, without invalidating other processes"""
+        print("\n🧪 Test 4: Presence writes stay local...")
+        later = (datetime.now(timezone.utc) + timedelta(hours=3)).isoformat()
+        loads = []
+        presence = PresenceIndex(loader=lambda: loads.append(1) or [])
+        version = get_version(PRESENCE_VERSION_SCOPE)
+
+        presence.check_in("bob", "club-1", later)  # Cold: the next load reads it from the database
+        cold_loads = len(loads)
+        presence.occupancy_all()
+        for number in range(50):
+            presence.check_in(f"user-{number}", "club-1", later)
+        presence.check_out("user-0")
+
+        success = (
+            cold_loads == 0 and len(loads) == 1
+            and presence.occupancy("club-1") == 49
+            and get_version(PRESENCE_VERSION_SCOPE) == version
+        )
+        self.test_results.append(("Presence Writes Stay Local", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all friend graph tests"""
+        print("🚀 Starting Friend Graph Tests")
+        print("=" * 60)
+
+        self.test_mutual_friends_and_suggestions()
+        self.test_incremental_updates()
+        self.test_friends_attending()
+        self.test_presence_writes_stay_local()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = FriendGraphTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
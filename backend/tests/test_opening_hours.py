@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the opening-hours engine
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.opening_hours import CLUB_TIMEZONE, CompiledHours
+
+# Friday and Saturday 10PM - 3AM (day 0 = Sunday)
+WEEKEND_HOURS = {
+    "periods": [
+        {"open": {"day": 5, "hour": 22, "minute": 0}, "close": {"day": 6, "hour": 3, "minute": 0}},
+        {"open": {"day": 6, "hour": 22, "minute": 0}, "close": {"day": 0, "hour": 3, "minute": 0}}
+    ]
+}
+
+
+class OpeningHoursTester:
+    """Test class for opening-hours compilation and lookups"""
+
+    def __init__(self):
+        self.test_results = []
+        self.hours = CompiledHours.from_hours(WEEKEND_HOURS)
+
+    def _local(self, *args):
+        return datetime(*args, tzinfo=CLUB_TIMEZONE)
+
+    def test_open_and_closed(self):
+        """Open inside a period, closed outside"""
+        print("\n🧪 Test 1: Open/closed lookups...")
+        success = (
+            self.hours.is_open_at(self._local(2025, 5, 16, 23, 0))      # Friday 11PM
+            and not self.hours.is_open_at(self._local(2025, 5, 16, 21, 59))  # Friday 9:59PM
+            and not self.hours.is_open_at(self._local(2025, 5, 14, 23, 0))   # Wednesday
+        )
+        self.test_results.append(("Open And Closed", success, None))
+        return success
+
+    def test_saturday_to_sunday_wrap(self):
+        """Saturday night stays open past midnight into Sunday"""
+        print("\n🧪 Test 2: Saturday -> Sunday wrap...")
+        sunday_early = self._local(2025, 5, 18, 2, 30)
+        saturday_late = self._local(2025, 5, 17, 23, 0)
+        expected_close = self._local(2025, 5, 18, 3, 0)
+
+        success = (
+            self.hours.is_open_at(sunday_early)
+            and self.hours.closing_time(sunday_early) == expected_close
+            and self.hours.closing_time(saturday_late) == expected_close
+            and not self.hours.is_open_at(self._local(2025, 5, 18, 3, 0))
+        )
+        self.test_results.append(("Saturday To Sunday Wrap", success, None))
+        return success
+
+    def test_missing_hours(self):
+        """Clubs without hours are never open"""
+        print("\n🧪 Test 3: Missing hours...")
+        hours = CompiledHours.from_hours(None)
+        success = not hours.is_open_at(self._local(2025, 5, 16, 23, 0)) and hours.closing_time(self._local(2025, 5, 16, 23, 0)) is None
+        self.test_results.append(("Missing Hours", success, None))
+        return success
+
+    def test_hours_from_add_club_script(self):
+        """Hours typed into add_club_complete.py open on the named days"""
+        print("\n🧪 Test 4: Hours from the add-club script...")
+        import importlib.util
+        script = os.path.join(backend_dir, "scripts", "clubs", "add_club_complete.py")
+        spec = importlib.util.spec_from_file_location("add_club_complete", script)
+        add_club_complete = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(add_club_complete)
+
+        hours = CompiledHours.from_hours(add_club_complete.parse_hours_input("Fri-Sat: 10PM-3AM"))
+        success = (
+            hours.is_open_at(self._local(2025, 5, 16, 23, 0))       # Friday 11PM
+            and hours.is_open_at(self._local(2025, 5, 18, 2, 0))    # Saturday night, into Sunday
+            and not hours.is_open_at(self._local(2025, 5, 15, 23, 0))  # Thursday
+            and not hours.is_open_at(self._local(2025, 5, 18, 23, 0))  # Sunday
+        )
+        self.test_results.append(("Hours From Add-Club Script", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all opening-hours tests"""
+        print("🚀 Starting Opening Hours Tests")
+        print("=" * 60)
+
+        self.test_open_and_closed()
+        self.test_saturday_to_sunday_wrap()
+        self.test_missing_hours()
+        self.test_hours_from_add_club_script()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = OpeningHoursTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
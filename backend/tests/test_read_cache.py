@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the tiered read cache
+These tests are pure in-memory checks and do not touch Supabase or Redis
+(the shared tier is a local stand-in)
+"""
+
+import os
+import sys
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.cache import LocalTagVersions, LRUCache, RedisCache, TieredCache, cached
+
+
+class LocalRedis:
+    """Dict-backed stand-in for the Redis commands the shared tier uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1).encode()
+        return int(self.data[key])
+
+
+class ReadCacheTester:
+    """Test class for the read cache"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def test_lru_eviction(self):
+        """The local tier evicts least recently used entries"""
+        print("\n🧪 Test 1: LRU eviction...")
+        lru = LRUCache(max_entries=2)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+        lru.get("a")
+        lru.set("c", 3, 60)
+
+        success = lru.get("a") == 1 and lru.get("c") == 3 and len(lru) == 2 and "b" not in lru._entries
+        self.test_results.append(("LRU Eviction", success, None))
+        return success
+
+    def test_keys_and_tag_invalidation(self):
+        """Arguments select the entry, and invalidating a tag forces a reload"""
+        print("\n🧪 Test 2: Keys and tag invalidation...")
+        cache = TieredCache(local=LRUCache(16))
+        calls = []
+
+        @cached(ttl=60, tags=("user:{user_id}",), cache=cache)
+        def get_profile(user_id):
+            calls.append(user_id)
+            return {"id": user_id, "version": len(calls)}
+
+        get_profile("u1")
+        get_profile("u1")
+        get_profile("u2")
+        cache.invalidate("user:u1")
+        reloaded = get_profile("u1")
+        get_profile("u2")
+
+        success = calls == ["u1", "u2", "u1"] and reloaded["version"] == 3
+        self.test_results.append(("Keys And Tag Invalidation", success, None))
+        return success
+
+    def test_shared_tier_across_workers(self):
+        """Two workers share entries and invalidations through the shared tier"""
+        print("\n🧪 Test 3: Shared tier across workers...")
+        shared = RedisCache(LocalRedis())
+        worker_a = TieredCache(local=LRUCache(16), shared=shared)
+        worker_b = TieredCache(local=LRUCache(16), shared=shared)
+        calls = []
+
+        def get_reviews(club_id):
+            calls.append(club_id)
+            return [{"club_id": club_id, "rating": 5}]
+
+        read_a = cached(ttl=60, tags=("reviews:{club_id}",), cache=worker_a)(get_reviews)
+        read_b = cached(ttl=60, tags=("reviews:{club_id}",), cache=worker_b)(get_reviews)
+
+        read_a("c1")
+        from_shared = read_b("c1")
+        worker_a.invalidate("reviews:c1")
+        read_b("c1")
+
+        success = calls == ["c1", "c1"] and from_shared == [{"club_id": "c1", "rating": 5}]
+        self.test_results.append(("Shared Tier Across Workers", success, None))
+        return success
+
+    def test_empty_results_not_cached(self):
+        """Empty results (what reads return on errors) are not cached by default"""
+        print("\n🧪 Test 4: Empty results are not cached...")
+        cache = TieredCache(local=LRUCache(16))
+        calls = []
+
+        @cached(ttl=60, cache=cache)
+        def get_friends(user_id):
+            calls.append(user_id)
+            return []
+
+        get_friends("u1")
+        get_friends("u1")
+
+        success = len(calls) == 2
+        self.test_results.append(("Empty Results Not Cached", success, None))
+        return success
+
+    def test_local_tag_versions_bounded(self):
+        """Per-user tags stay bounded, and a dropped tag never revives old entries"""
+        print("\n🧪 Test 5: Local tag versions are bounded...")
+        cache = TieredCache(local=LRUCache(64), local_tags=LocalTagVersions(max_tags=2))
+        calls = []
+
+        @cached(ttl=60, tags=("user:{user_id}",), cache=cache)
+        def get_profile(user_id):
+            calls.append(user_id)
+            return {"id": user_id, "version": len(calls)}
+
+        get_profile("u1")
+        cache.invalidate("user:u1")
+        get_profile("u1")
+        for user_id in ("u2", "u3", "u4"):
+            cache.invalidate(f"user:{user_id}")
+        reloaded = get_profile("u1")  # u1's version was dropped, so this must miss
+        get_profile("u1")
+
+        success = len(cache.local_tags) == 2 and calls == ["u1", "u1", "u1"] and reloaded["version"] == 3
+        self.test_results.append(("Local Tag Versions Bounded", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all read cache tests"""
+        print("🚀 Starting Read Cache Tests")
+        print("=" * 60)
+
+        self.test_lru_eviction()
+        self.test_keys_and_tag_invalidation()
+        self.test_shared_tier_across_workers()
+        self.test_empty_results_not_cached()
+        self.test_local_tag_versions_bounded()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = ReadCacheTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
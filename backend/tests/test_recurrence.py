@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script for the recurrence expansion engine
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.recurrence import expand_templates, next_occurrence
+
+# Wednesday 2025-12-10 12:00 in Toronto
+NOW = datetime(2025, 12, 10, 17, 0, tzinfo=timezone.utc)
+
+
+def _template(template_id, config, start_date="2025-12-12T22:00:00", end_date="2025-12-13T02:00:00"):
+    return {"id": template_id, "title": template_id, "start_date": start_date, "end_date": end_date,
+            "recurring_config": dict(config, timezone=config.get("timezone", "America/Toronto"))}
+
+
+def _starts(expanded, template_id):
+    return [start.replace(tzinfo=None).isoformat() for start, _ in expanded[template_id]]
+
+
+class RecurrenceTester:
+    """Test class for the recurrence engine"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def test_weekly_rules(self):
+        """Legacy weekday and RecurringConfig days_of_week (Sunday = 0)"""
+        print("\n🧪 Test 1: Weekly rules...")
+        expanded = expand_templates([
+            _template("legacy", {"type": "weekly", "weekday": 4, "start_time": "22:00", "end_time": "02:00"}),
+            _template("multi", {"frequency": "weekly", "days_of_week": [5, 6]}),  # Friday, Saturday
+        ], weeks_ahead=2, now=NOW)
+        success = (
+            _starts(expanded, "legacy") == ["2025-12-12T22:00:00", "2025-12-19T22:00:00"]
+            and expanded["legacy"][0][1].astimezone(timezone.utc).isoformat() == "2025-12-13T07:00:00+00:00"
+            and _starts(expanded, "multi") == [
+                "2025-12-12T22:00:00", "2025-12-13T22:00:00", "2025-12-19T22:00:00", "2025-12-20T22:00:00"
+            ]
+        )
+        self.test_results.append(("Weekly Rules", success, None))
+        return success
+
+    def test_monthly_across_year_end(self):
+        """Monthly rules roll over December and skip months without the day"""
+        print("\n🧪 Test 2: Monthly rules...")
+        expanded = expand_templates([
+            _template("first-saturday", {"type": "monthly", "month_day": 1, "weekday": 5, "start_time": "21:00", "end_time": "01:00"}),
+            _template("thirty-first", {"type": "monthly", "month_day": 31, "start_time": "21:00", "end_time": "01:00"}),
+        ], weeks_ahead=12, now=NOW)
+        success = (
+            _starts(expanded, "first-saturday") == ["2026-01-03T21:00:00", "2026-02-07T21:00:00"]
+            and _starts(expanded, "thirty-first") == ["2025-12-31T21:00:00", "2026-01-31T21:00:00"]
+        )
+        self.test_results.append(("Monthly Across Year End", success, None))
+        return success
+
+    def test_end_date_and_max_occurrences(self):
+        """end_date stops the series; max_occurrences counts from the template start"""
+        print("\n🧪 Test 3: end_date and max_occurrences...")
+        expanded = expand_templates([
+            _template("until", {"type": "weekly", "weekday": 4, "end_date": "2025-12-26"}),
+            # Started 2025-11-28: Nov 28, Dec 5 already happened, so 2 of 4 remain
+            _template("capped", {"type": "weekly", "weekday": 4, "max_occurrences": 4},
+                      start_date="2025-11-28T22:00:00", end_date="2025-11-29T02:00:00"),
+        ], weeks_ahead=8, now=NOW)
+        success = (
+            _starts(expanded, "until") == ["2025-12-12T22:00:00", "2025-12-19T22:00:00", "2025-12-26T22:00:00"]
+            and _starts(expanded, "capped") == ["2025-12-12T22:00:00", "2025-12-19T22:00:00"]
+        )
+        self.test_results.append(("End Date And Max Occurrences", success, None))
+        return success
+
+    def test_dst(self):
+        """Wall-clock times hold across DST; times in the spring-forward gap move past it"""
+        print("\n🧪 Test 4: DST handling...")
+        now = datetime(2026, 3, 1, 17, 0, tzinfo=timezone.utc)
+        expanded = expand_templates([
+            _template("late", {"type": "weekly", "weekday": 6, "start_time": "02:30", "end_time": "05:00"},
+                      start_date="2026-03-01T02:30:00", end_date="2026-03-01T05:00:00"),
+            _template("evening", {"type": "weekly", "weekday": 5, "start_time": "22:00", "end_time": "03:00"},
+                      start_date="2026-03-07T22:00:00", end_date="2026-03-08T03:00:00"),
+        ], weeks_ahead=2, now=now)
+        success = (
+            # 2026-03-08 02:30 does not exist in Toronto
+            _starts(expanded, "late") == ["2026-03-08T03:30:00", "2026-03-15T02:30:00"]
+            and _starts(expanded, "evening")[:2] == ["2026-03-07T22:00:00", "2026-03-14T22:00:00"]
+            # Same wall time, one hour earlier in UTC after the change
+            and [start.astimezone(timezone.utc).hour for start, _ in expanded["evening"][:2]] == [3, 2]
+        )
+        self.test_results.append(("DST Handling", success, None))
+        return success
+
+    def test_batch_speed(self):
+        """Hundreds of weekly templates expand six months ahead quickly"""
+        print("\n🧪 Test 5: Batch expansion speed...")
+        templates = [
+            _template(f"t{index}", {"type": "weekly", "weekday": index % 7, "start_time": "22:00", "end_time": "03:00"})
+            for index in range(500)
+        ]
+        started = time.perf_counter()
+        expanded = expand_templates(templates, weeks_ahead=26, now=NOW)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"   ⏱️  500 templates x 26 weeks in {elapsed_ms:.1f} ms")
+        first = next_occurrence(_template("next", {"type": "weekly", "weekday": 4}), now=NOW)
+        success = (
+            all(25 <= len(occurrences) <= 27 for occurrences in expanded.values())
+            and first[0].date() == date(2025, 12, 12)
+            and elapsed_ms < 1000
+        )
+        self.test_results.append(("Batch Expansion Speed", success, None))
+        return success
+
+    def test_utc_template_dates(self):
+        """A template stored in UTC keeps its local weekday and time, and maps back to the same UTC time"""
+        print("\n🧪 Test 6: UTC template dates...")
+        now = datetime(2026, 10, 10, 12, 0, tzinfo=timezone.utc)
+        # Friday 22:00-02:00 in Toronto, as the dashboard writes it (toISOString)
+        template = _template("utc", {"type": "weekly"}, start_date="2026-10-10T02:00:00.000Z",
+                             end_date="2026-10-10T06:00:00.000Z")
+        occurrences = expand_templates([template], weeks_ahead=1, now=now)["utc"]
+        start, end = occurrences[0]
+        success = (
+            len(occurrences) == 1
+            and start.replace(tzinfo=None).isoformat() == "2026-10-16T22:00:00"
+            and start.astimezone(timezone.utc).isoformat() == "2026-10-17T02:00:00+00:00"
+            and end.astimezone(timezone.utc).isoformat() == "2026-10-17T06:00:00+00:00"
+        )
+        self.test_results.append(("UTC Template Dates", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all recurrence tests"""
+        print("🚀 Starting Recurrence Engine Tests")
+        print("=" * 60)
+
+        self.test_weekly_rules()
+        self.test_monthly_across_year_end()
+        self.test_end_date_and_max_occurrences()
+        self.test_dst()
+        self.test_batch_speed()
+        self.test_utc_template_dates()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = RecurrenceTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Test script for smart recurring event generation (existing-instance diff,
+high-water marks and per-club sharding)
+These tests use an in-memory stand-in for the Supabase client and do not touch Supabase
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Keep version stamps written by these tests out of the real stamp directory
+os.environ["MOTIVZ_VERSION_DIR"] = tempfile.mkdtemp(prefix="motivz-recurring-test-")
+
+from services import supabase_service
+from services.opening_hours import CLUB_TIMEZONE
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class LocalQuery:
+    """The subset of the PostgREST query builder the generator uses, over a list of rows"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.negate = False
+        self.write = None
+        self.bounds = None
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def _filter(self, name, column, value, test):
+        negate, self.negate = self.negate, False
+        self.filters.append((name, column, value, (lambda row: not test(row)) if negate else test))
+        return self
+
+    def select(self, *columns):
+        return self
+
+    def eq(self, column, value):
+        def test(row):
+            if isinstance(row.get(column), dict):
+                return row[column] == json.loads(value)  # jsonb compared with a JSON literal
+            return row.get(column) == value
+        return self._filter("eq", column, value, test)
+
+    def is_(self, column, value):
+        return self._filter("is", column, value, lambda row: row.get(column) is None)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value, lambda row: row.get(column) >= value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value, lambda row: row.get(column) < value)
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False):
+        self.write = ("upsert", rows, on_conflict.split(","))
+        return self
+
+    def update(self, values):
+        self.write = ("update", values, None)
+        return self
+
+    def execute(self):
+        client = self.client
+        with client.lock:
+            client.requests.append((self.write[0] if self.write else "select", [(name, column, value) for name, column, value, _ in self.filters]))
+            rows = client.tables.setdefault(self.table, [])
+            matched = [row for row in rows if all(test(row) for _, _, _, test in self.filters)]
+            if self.write is None:
+                if self.bounds:
+                    matched = matched[self.bounds[0]:self.bounds[1] + 1]
+                return _Response([dict(row) for row in matched])
+            kind, payload, key = self.write
+            if kind == "update":
+                for row in matched:
+                    row.update(payload)
+                return _Response([dict(row) for row in matched])
+            inserted = []
+            for new_row in payload:
+                is_template = new_row.get("recurring_config") is not None
+                duplicate = any(
+                    all(row.get(column) == new_row.get(column) for column in key if column != "is_template")
+                    and (row.get("recurring_config") is not None) == is_template
+                    for row in rows
+                )
+                if not duplicate:
+                    rows.append(dict(new_row))
+                    inserted.append(new_row)
+            return _Response(inserted)
+
+
+class LocalClient:
+    def __init__(self, events):
+        self.tables = {"events": events}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return LocalQuery(self, name)
+
+
+def _next_weekday(weekday):
+    today = datetime.now().date()
+    return today + timedelta(days=(weekday - today.weekday()) % 7 or 7)
+
+
+def _template(template_id, club_id, weekday):
+    day = _next_weekday(weekday)
+    return {
+        "id": template_id, "title": f"Night {template_id}", "club_id": club_id, "caption": "",
+        "poster_url": None, "music_genres": [], "created_by": None,
+        "start_date": f"{day.isoformat()}T22:00:00", "end_date": f"{(day + timedelta(days=1)).isoformat()}T02:00:00",
+        "recurring_config": {"type": "weekly", "weekday": weekday, "start_time": "22:00", "end_time": "02:00", "active": True},
+    }
+
+
+def _instance(template, day):
+    return {
+        "id": f"{template['id']}-{day.isoformat()}", "title": template["title"], "club_id": template["club_id"],
+        "start_date": f"{day.isoformat()}T22:00:00", "end_date": f"{(day + timedelta(days=1)).isoformat()}T02:00:00",
+        "recurring_config": None,
+    }
+
+
+class RecurringGenerationTester:
+    """Test class for smart recurring generation"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def _use(self, client):
+        supabase_service.supabase = client
+        return client
+
+    def test_existing_instances_across_clubs(self):
+        """One unfiltered existing-instance query; each club's existing dates are skipped"""
+        print("\n🧪 Test 1: Existing instances across clubs...")
+        club_a, club_b = _template("a", "club-a", 4), _template("b", "club-b", 5)
+        existing = _instance(club_a, _next_weekday(4))
+        client = self._use(LocalClient([club_a, club_b, existing]))
+
+        generated = supabase_service.smart_generate_recurring_events(weeks_ahead=2)
+        existing_queries = [filters for kind, filters in client.requests if kind == "select" and ("gte", "start_date") in [f[:2] for f in filters]]
+        generated_keys = {(event["club_id"], event["start_date"]) for event in generated}
+        success = (
+            len(existing_queries) == 1
+            and not any(name == "eq" and column == "club_id" for name, column, _ in existing_queries[0])
+            and ("club-a", existing["start_date"]) not in generated_keys
+            and {event["club_id"] for event in generated} == {"club-a", "club-b"}
+            and len(generated) == 3
+        )
+        self.test_results.append(("Existing Instances Across Clubs", success, None))
+        return success
+
+    def test_high_water_mark(self):
+        """A second run over a covered window writes nothing"""
+        print("\n🧪 Test 2: High-water mark...")
+        client = self._use(LocalClient([_template("a", "club-a", 4)]))
+        first = supabase_service.smart_generate_recurring_events(weeks_ahead=2)
+        writes_before = sum(1 for kind, _ in client.requests if kind != "select")
+        second = supabase_service.smart_generate_recurring_events(weeks_ahead=2)
+        writes_after = sum(1 for kind, _ in client.requests if kind != "select")
+        success = len(first) == 2 and second == [] and writes_after == writes_before
+        self.test_results.append(("High-Water Mark", success, None))
+        return success
+
+    def test_template_edit_resets_mark(self):
+        """Moving a template's start_date to another weekday regenerates the window"""
+        print("\n🧪 Test 3: Template edits reset the mark...")
+        template = _template("a", "club-a", 4)
+        template["recurring_config"] = {"type": "weekly", "active": True}  # Weekday and times from start_date
+        client = self._use(LocalClient([template]))
+        supabase_service.smart_generate_recurring_events(weeks_ahead=2)
+
+        saturday = _next_weekday(5)
+        stored = client.tables["events"][0]
+        stored["start_date"] = f"{saturday.isoformat()}T22:00:00"
+        stored["end_date"] = f"{(saturday + timedelta(days=1)).isoformat()}T02:00:00"
+        regenerated = supabase_service.smart_generate_recurring_events(weeks_ahead=2)
+        success = len(regenerated) >= 1 and all(
+            datetime.fromisoformat(event["start_date"]).astimezone(CLUB_TIMEZONE).weekday() == 5 for event in regenerated
+        )
+        self.test_results.append(("Template Edit Resets Mark", success, None))
+        return success
+
+    def test_sharding_by_club(self):
+        """Each club's queries are filtered to that club; dry runs write nothing"""
+        print("\n🧪 Test 4: Sharding by club...")
+        templates = [_template("a", "club-a", 4), _template("b", "club-b", 5), _template("c", "club-c", 6)]
+        client = self._use(LocalClient([dict(template) for template in templates]))
+
+        dry = supabase_service.smart_generate_recurring_events_by_club(weeks_ahead=2, workers=3, dry_run=True)
+        dry_writes = sum(1 for kind, _ in client.requests if kind != "select")
+        report = supabase_service.smart_generate_recurring_events_by_club(weeks_ahead=2, workers=3)
+        existing_club_filters = sorted(
+            value for kind, filters in client.requests if kind == "select"
+            for name, column, value in filters if name == "eq" and column == "club_id"
+        )
+        success = (
+            len(dry["generated_events"]) == 6 and dry_writes == 0
+            and len(report["generated_events"]) == 6 and report["failed_clubs"] == 0
+            and sorted(club["club_id"] for club in report["clubs"]) == ["club-a", "club-b", "club-c"]
+            and all(club["generated"] == 2 for club in report["clubs"])
+            and existing_club_filters == ["club-a", "club-a", "club-b", "club-b", "club-c", "club-c"]
+        )
+        self.test_results.append(("Sharding By Club", success, None))
+        return success
+
+    def test_mark_keeps_concurrent_edits(self):
+        """The mark is not written over a recurring_config edited after it was read"""
+        print("\n🧪 Test 5: Concurrent template edits are kept...")
+        template = _template("a", "club-a", 4)
+        client = self._use(LocalClient([dict(template, recurring_config=dict(template["recurring_config"]))]))
+        stored = client.tables["events"][0]
+        stored["recurring_config"]["start_time"] = "23:00"  # Dashboard edit during the run
+
+        through = _next_weekday(4)
+        stale = supabase_service._record_generated_through(template, through)
+        current = supabase_service._record_generated_through(dict(stored), through)
+        success = (
+            not stale
+            and current
+            and stored["recurring_config"]["start_time"] == "23:00"
+            and stored["recurring_config"]["generated_through"] == through.isoformat()
+        )
+        self.test_results.append(("Mark Keeps Concurrent Edits", success, None))
+        return success
+
+    def test_instances_stored_in_utc(self):
+        """Instances keep a UTC template's time of day, and existing UTC instances are deduplicated"""
+        print("\n🧪 Test 6: Instances stored in UTC...")
+        friday = _next_weekday(4)
+        # Friday 22:00 in club time, written by the dashboard as UTC
+        local_start = datetime.combine(friday, datetime.min.time()).replace(hour=22, tzinfo=CLUB_TIMEZONE)
+        utc_start = local_start.astimezone(timezone.utc)
+        template = dict(
+            _template("a", "club-a", 4),
+            start_date=utc_start.isoformat().replace("+00:00", "Z"),
+            end_date=(utc_start + timedelta(hours=4)).isoformat().replace("+00:00", "Z"),
+            recurring_config={"type": "weekly", "active": True},
+        )
+        existing = dict(_instance(template, friday), start_date=utc_start.isoformat())
+        self._use(LocalClient([template, existing]))
+
+        generated = supabase_service.smart_generate_recurring_events(weeks_ahead=2)
+        starts = [event["start_date"] for event in generated]
+        # Wall-clock arithmetic in club time, so a DST change in between is allowed for
+        expected = (local_start + timedelta(weeks=1)).astimezone(timezone.utc).isoformat()
+        success = starts == [expected]
+        self.test_results.append(("Instances Stored In UTC", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all recurring generation tests"""
+        print("🚀 Starting Recurring Generation Tests")
+        print("=" * 60)
+
+        original = supabase_service.supabase
+        try:
+            self.test_existing_instances_across_clubs()
+            self.test_high_water_mark()
+            self.test_template_edit_resets_mark()
+            self.test_sharding_by_club()
+            self.test_mark_keeps_concurrent_edits()
+            self.test_instances_stored_in_utc()
+        finally:
+            supabase_service.supabase = original
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = RecurringGenerationTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight read coalescing
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.single_flight import SingleFlight, query_key
+
+
+class SingleFlightTester:
+    """Test class for single-flight coalescing"""
+
+    def __init__(self):
+        self.test_results = []
+
+    def test_concurrent_threads_share_one_call(self):
+        """Concurrent identical reads run the upstream call once"""
+        print("\n🧪 Test 1: Concurrent threads share one call...")
+        flight = SingleFlight()
+        upstream_calls = []
+        results = []
+
+        def slow_read():
+            upstream_calls.append(1)
+            time.sleep(0.2)
+            return {"id": "club-1"}
+
+        def worker():
+            results.append(flight.do(query_key("Clubs", "*", id="club-1"), slow_read))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = flight.stats()
+        success = (
+            len(upstream_calls) == 1
+            and len(results) == 8
+            and all(result == {"id": "club-1"} for result in results)
+            and stats["coalesced"] == 7
+            and stats["coalescing_ratio"] == 0.875
+        )
+        self.test_results.append(("Concurrent Threads Share One Call", success, None))
+        return success
+
+    def test_errors_and_new_flights(self):
+        """Errors reach the caller, and a finished flight is not cached"""
+        print("\n🧪 Test 2: Errors and new flights...")
+        flight = SingleFlight()
+        key = query_key("user_profiles", "*", id="user-1")
+
+        def failing_read():
+            raise RuntimeError("upstream down")
+
+        try:
+            flight.do(key, failing_read)
+            raised = False
+        except RuntimeError:
+            raised = True
+
+        first = flight.do(key, lambda: 1)
+        second = flight.do(key, lambda: 2)
+
+        success = raised and first == 1 and second == 2 and flight.stats()["executions"] == 3
+        self.test_results.append(("Errors And New Flights", success, None))
+        return success
+
+    def test_async_coalescing(self):
+        """Concurrent coroutines share one awaited call"""
+        print("\n🧪 Test 3: Async coalescing...")
+        flight = SingleFlight()
+        upstream_calls = []
+
+        async def slow_read():
+            upstream_calls.append(1)
+            await asyncio.sleep(0.05)
+            return ["row"]
+
+        async def run():
+            return await asyncio.gather(*[
+                flight.do_async(query_key("Clubs", "*", all_rows=True), slow_read) for _ in range(5)
+            ])
+
+        results = asyncio.run(run())
+        success = len(upstream_calls) == 1 and results == [["row"]] * 5
+        self.test_results.append(("Async Coalescing", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all single-flight tests"""
+        print("🚀 Starting Single-Flight Tests")
+        print("=" * 60)
+
+        self.test_concurrent_threads_share_one_call()
+        self.test_errors_and_new_flights()
+        self.test_async_coalescing()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = SingleFlightTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
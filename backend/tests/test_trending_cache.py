@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the trending aggregator and the rolling-window trending cache
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+from services.trending import TrendingCache, build_trending_table
+
+
+class TrendingCacheTester:
+    """Test class for trending aggregation"""
+
+    def __init__(self):
+        self.test_results = []
+        self.now = datetime(2025, 5, 17, 23, 0, tzinfo=timezone.utc)
+
+    def _review(self, club_id, rating, minutes_ago):
+        return {
+            "club_id": club_id,
+            "rating": rating,
+            "created_at": (self.now - timedelta(minutes=minutes_ago)).isoformat()
+        }
+
+    def test_table_matches_rules(self):
+        """At least 3 reviews with an average of at least 3.5 is trending"""
+        print("\n🧪 Test 1: Trending table rules...")
+        reviews = [self._review("a", 4, 10), self._review("a", 5, 20), self._review("a", 3, 30),
+                   self._review("b", 5, 10), self._review("b", 5, 20),
+                   self._review("c", 2, 10), self._review("c", 3, 10), self._review("c", 4, 10)]
+        table = build_trending_table(reviews)
+
+        success = (
+            table["a"]["is_trending"] and table["a"]["trending_score"] == 12
+            and not table["b"]["is_trending"] and table["b"]["recent_reviews_count"] == 2
+            and not table["c"]["is_trending"]
+        )
+        self.test_results.append(("Trending Table Rules", success, None))
+        return success
+
+    def test_cache_matches_table(self):
+        """A rebuilt cache reports the same statuses as the one-shot table"""
+        print("\n🧪 Test 2: Cache rebuild matches table...")
+        reviews = [self._review("a", 4, 10), self._review("a", 5, 100), self._review("a", 3, 290)]
+        cache = TrendingCache()
+        cache.rebuild(reviews, now=self.now)
+
+        success = cache.table(now=self.now) == build_trending_table(reviews)
+        self.test_results.append(("Cache Rebuild", success, None))
+        return success
+
+    def test_incremental_record_and_expiry(self):
+        """Recorded reviews count immediately and age out after the window"""
+        print("\n🧪 Test 3: Incremental updates and expiry...")
+        cache = TrendingCache()
+        cache.rebuild([self._review("a", 5, 10), self._review("a", 5, 20)], now=self.now)
+        cache.record("a", 4, self.now)
+
+        trending_now = cache.status("a", now=self.now)["is_trending"]
+        later = self.now + timedelta(hours=5, minutes=10)
+        expired = cache.status("a", now=later)["recent_reviews_count"] == 0
+
+        success = trending_now and expired
+        self.test_results.append(("Incremental Record And Expiry", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all trending tests"""
+        print("🚀 Starting Trending Cache Tests")
+        print("=" * 60)
+
+        self.test_table_matches_rules()
+        self.test_cache_matches_table()
+        self.test_incremental_record_and_expiry()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = TrendingCacheTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory username search index
+These tests are pure in-memory checks and do not touch Supabase
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the backend directory to Python path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(backend_dir)
+
+# Keep version stamps written by these tests out of the real stamp directory
+os.environ["MOTIVZ_VERSION_DIR"] = tempfile.mkdtemp(prefix="motivz-user-search-test-")
+
+from services import user_search
+from services.user_search import USER_SEARCH_VERSION_SCOPE, UserSearchIndex
+from services.versions import get_version
+
+PROFILES = [
+    {"id": "u1", "username": "sam", "avatar_url": "a1", "first_name": "Sam"},
+    {"id": "u2", "username": "samantha", "avatar_url": "a2"},
+    {"id": "u3", "username": "Sammy_D", "avatar_url": None},
+    {"id": "u4", "username": "big_sam", "avatar_url": "a4"},
+    {"id": "u5", "username": "alex", "avatar_url": "a5"},
+    {"id": "u6", "username": None, "avatar_url": None},
+]
+
+
+class UserSearchTester:
+    """Test class for the username search index"""
+
+    def __init__(self):
+        self.test_results = []
+        self.loads = 0
+
+    def _index(self):
+        def loader():
+            self.loads += 1
+            return PROFILES
+        return UserSearchIndex(loader=loader)
+
+    def _usernames(self, results):
+        return [user["username"] for user in results]
+
+    def test_ranking(self):
+        """Exact match, then prefix matches, then substring matches"""
+        print("\n🧪 Test 1: Ranking...")
+        index = self._index()
+        results = index.search("Sam")
+        success = (
+            self._usernames(results) == ["sam", "samantha", "Sammy_D", "big_sam"]
+            and results[0] == {"id": "u1", "username": "sam", "avatar_url": "a1"}
+            and self._usernames(index.search("ex")) == ["alex"]
+            and self._usernames(index.search("y_")) == ["Sammy_D"]
+            and self._usernames(index.search("lex")) == ["alex"]
+        )
+        self.test_results.append(("Ranking", success, None))
+        return success
+
+    def test_network_boost(self):
+        """Users in the searcher's network lead within their match group"""
+        print("\n🧪 Test 2: Network boost...")
+        index = self._index()
+        results = index.search("sam", boost_ids={"u3", "u4"})
+        success = self._usernames(results) == ["sam", "Sammy_D", "samantha", "big_sam"]
+        self.test_results.append(("Network Boost", success, None))
+        return success
+
+    def test_incremental_updates(self):
+        """Profile writes re-index a loaded index in place, without loading a cold one or invalidating others"""
+        print("\n🧪 Test 3: Incremental updates...")
+        self.loads = 0
+        index = self._index()
+        version = get_version(USER_SEARCH_VERSION_SCOPE)
+        index.upsert({"id": "u9", "username": "samwise", "avatar_url": None})  # Cold: read from the database on load
+        cold_loads = self.loads
+
+        index.search("sam")  # Loads the index
+        index.upsert({"id": "u5", "username": "alexsamson", "avatar_url": "a5"})
+        index.remove("u2")
+        results = index.search("sam")
+        success = (
+            cold_loads == 0
+            and self._usernames(results) == ["sam", "Sammy_D", "alexsamson", "big_sam"]
+            and index.search("alex") == [{"id": "u5", "username": "alexsamson", "avatar_url": "a5"}]
+            and self.loads == 1
+            and get_version(USER_SEARCH_VERSION_SCOPE) == version
+        )
+        self.test_results.append(("Incremental Updates", success, None))
+        return success
+
+    def test_short_terms_and_candidate_cap(self):
+        """Short terms keep contains semantics; boosted users survive the prefix cap"""
+        print("\n🧪 Test 4: Short terms and the candidate cap...")
+        profiles = [{"id": f"s{number:03d}", "username": f"s{number:03d}", "avatar_url": None} for number in range(40)]
+        profiles.append({"id": "friend", "username": "szz_friend", "avatar_url": None})
+        index = UserSearchIndex(loader=lambda: profiles)
+
+        original = user_search.MAX_PREFIX_CANDIDATES
+        user_search.MAX_PREFIX_CANDIDATES = 10
+        try:
+            boosted = self._usernames(index.search("s", limit=3, boost_ids={"friend"}))
+            plain = self._usernames(index.search("s", limit=3))
+            contains = self._usernames(index.search("03", limit=3))
+        finally:
+            user_search.MAX_PREFIX_CANDIDATES = original
+
+        success = (
+            boosted == ["szz_friend", "s000", "s001"]
+            and plain == ["s000", "s001", "s002"]
+            and contains == ["s003", "s030", "s031"]
+        )
+        self.test_results.append(("Short Terms And Candidate Cap", success, None))
+        return success
+
+    def run_all_tests(self):
+        """Run all user search tests"""
+        print("🚀 Starting User Search Tests")
+        print("=" * 60)
+
+        self.test_ranking()
+        self.test_network_boost()
+        self.test_incremental_updates()
+        self.test_short_terms_and_candidate_cap()
+
+        passed = sum(1 for _, success, _ in self.test_results if success)
+        for test_name, success, _ in self.test_results:
+            print(f"{'✅ PASS' if success else '❌ FAIL'} {test_name}")
+        print(f"\nOverall: {passed}/{len(self.test_results)} tests passed")
+        return passed == len(self.test_results)
+
+
+def main():
+    """Main test function"""
+    tester = UserSearchTester()
+    tester.run_all_tests()
+
+if __name__ == "__main__":
+    main()
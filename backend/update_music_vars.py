@@ -14,7 +14,9 @@ import os
 import sys
 from datetime import datetime
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from services.supabase_client import get_client
+from services.genre_index import invalidate_genre_index
 
 # Load environment variables
 load_dotenv()
@@ -28,7 +30,7 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     sys.exit(1)
 
 # Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_client(SUPABASE_URL, SUPABASE_KEY)
 
 # List of all possible genres
 ALL_GENRES = [
@@ -80,6 +82,7 @@ def update_music_schedule(club_id: str, day_of_week: str, genres: list, genre_va
             result = supabase.table('ClubMusicSchedules').update(update_data).eq('club_id', club_id).eq('day_of_week', str(day_number)).execute()
             
             if result.data:
+                invalidate_genre_index()
                 print(f"✅ Successfully updated {', '.join(genres)} to {genre_value} for club {club_id} on {day_of_week}")
                 return True
             else:
@@ -110,6 +113,7 @@ def update_music_schedule(club_id: str, day_of_week: str, genres: list, genre_va
             result = supabase.table('ClubMusicSchedules').insert(new_record).execute()
             
             if result.data:
+                invalidate_genre_index()
                 print(f"✅ Successfully created new record with {', '.join(genres)} set to {genre_value} for club {club_id} on {day_of_week}")
                 return True
             else:
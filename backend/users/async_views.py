@@ -0,0 +1,15 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from services import async_supabase_service
+
+
+# Async views for fan-out endpoints (see ASYNC_DEPLOYMENT_README.md)
+
+@require_GET
+async def get_friends_active_clubs_view(request, user_id):
+    """Get friends active clubs"""
+    try:
+        active_clubs = await async_supabase_service.get_friends_active_clubs(user_id)
+        return JsonResponse({"active_clubs": active_clubs})
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
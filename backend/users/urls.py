@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     # User profile endpoints
@@ -14,6 +14,7 @@ urlpatterns = [
     path('friendships/cancel-request/', views.cancel_friend_request_view, name='cancel_friend_request'),
     path('friendships/unfriend/', views.unfriend_user_view, name='unfriend_user'),
     path('<str:current_user_id>/friendship-status/<str:target_user_id>/', views.get_friendship_status_view, name='get_friendship_status'),
+    path('<str:user_id>/suggestions/', views.get_friend_suggestions_view, name='get_friend_suggestions'),
     
     # Favourites endpoints
     path('<str:user_id>/favourites/', views.get_user_favourites_view, name='get_user_favourites'),
@@ -24,7 +25,7 @@ urlpatterns = [
     # User activity endpoints
     path('<str:user_id>/active-club/', views.update_user_active_club_view, name='update_user_active_club'),
     path('<str:user_id>/clear-attendance/', views.check_and_clear_expired_attendance_view, name='clear_expired_attendance'),
-    path('<str:user_id>/friends-active-clubs/', views.get_friends_active_clubs_view, name='get_friends_active_clubs'),
+    path('<str:user_id>/friends-active-clubs/', async_views.get_friends_active_clubs_view, name='get_friends_active_clubs'),
     
     # User management endpoints
     path('<str:user_id>/delete-account/', views.delete_user_account_view, name='delete_user_account'),
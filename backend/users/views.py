@@ -2,6 +2,10 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.http import JsonResponse
 from services.supabase_service import supabase
+from services import friend_graph
+from services.attendance import track_check_in, track_check_out
+from services.presence import get_presence_index
+from services.user_search import get_user_search_index, search_users
 import json
 
 @api_view(["GET"])
@@ -29,8 +33,10 @@ def update_user_profile_view(request, user_id):
         
         # Update user profile in Supabase
         response = supabase.table('profiles').update(update_data).eq('id', user_id).execute()
+        friend_graph.invalidate_profile(user_id)
         
         if response.data and len(response.data) > 0:
+            get_user_search_index().upsert(response.data[0])
             return Response(response.data[0])
         else:
             return Response({"error": "Profile not found"}, status=404)
@@ -42,17 +48,8 @@ def update_user_profile_view(request, user_id):
 def get_user_friends_view(request, user_id):
     """Get user friends"""
     try:
-        # Get accepted friendships where user is either requester or receiver
-        response = supabase.table('friendships').select(
-            'requester_id,receiver_id,profiles!requester_id(*),profiles!receiver_id(*)'
-        ).or_(f'requester_id.eq.{user_id},receiver_id.eq.{user_id}').eq('status', 'accepted').execute()
-        
-        friends = []
-        for friendship in response.data:
-            if friendship['requester_id'] == user_id:
-                friends.append(friendship['profiles!receiver_id'])
-            else:
-                friends.append(friendship['profiles!requester_id'])
+        # Edge list once, then one batched profile query (cached per user)
+        friends = friend_graph.get_friends(user_id)
         
         return Response({"friends": friends})
         
@@ -64,13 +61,7 @@ def get_pending_friend_requests_view(request, user_id):
     """Get pending friend requests"""
     try:
         # Get pending friend requests where user is the receiver
-        response = supabase.table('friendships').select(
-            'requester_id,profiles!requester_id(*)'
-        ).eq('receiver_id', user_id).eq('status', 'pending').execute()
-        
-        requests = []
-        for friendship in response.data:
-            requests.append(friendship['profiles!requester_id'])
+        requests = friend_graph.get_pending_requests(user_id)
         
         return Response({"requests": requests})
         
@@ -87,13 +78,8 @@ def send_friend_request_view(request):
         if not requester_id or not receiver_id:
             return Response({"error": "requester_id and receiver_id are required"}, status=400)
         
-        # Check if friendship already exists
-        existing = supabase.table('friendships').select('*').or_(
-            f'and(requester_id.eq.{requester_id},receiver_id.eq.{receiver_id})',
-            f'and(requester_id.eq.{receiver_id},receiver_id.eq.{requester_id})'
-        ).execute()
-        
-        if existing.data:
+        # Check if friendship already exists (point query; the graph can lag direct app writes)
+        if friend_graph.get_friendship_status(requester_id, receiver_id)["status"] != "none":
             return Response({"error": "Friendship already exists"}, status=400)
         
         # Create new friendship request
@@ -102,6 +88,8 @@ def send_friend_request_view(request):
             'receiver_id': receiver_id,
             'status': 'pending'
         }).execute()
+        friend_graph.get_friend_graph().set_edge(requester_id, receiver_id, 'pending')
+        friend_graph.invalidate_friendship(requester_id, receiver_id)
         
         return Response({"message": "Friend request sent successfully"})
         
@@ -122,8 +110,10 @@ def accept_friend_request_view(request):
         response = supabase.table('friendships').update({
             'status': 'accepted'
         }).eq('requester_id', requester_id).eq('receiver_id', receiver_id).eq('status', 'pending').execute()
+        friend_graph.invalidate_friendship(requester_id, receiver_id)
         
         if response.data:
+            friend_graph.get_friend_graph().set_edge(requester_id, receiver_id, 'accepted')
             return Response({"message": "Friend request accepted successfully"})
         else:
             return Response({"error": "Friend request not found"}, status=404)
@@ -143,6 +133,9 @@ def cancel_friend_request_view(request):
         
         # Delete the friendship request
         response = supabase.table('friendships').delete().eq('requester_id', requester_id).eq('receiver_id', receiver_id).eq('status', 'pending').execute()
+        if response.data:
+            friend_graph.get_friend_graph().remove_edge(requester_id, receiver_id)
+        friend_graph.invalidate_friendship(requester_id, receiver_id)
         
         return Response({"message": "Friend request cancelled successfully"})
         
@@ -164,6 +157,8 @@ def unfriend_user_view(request):
             f'and(requester_id.eq.{user1_id},receiver_id.eq.{user2_id})',
             f'and(requester_id.eq.{user2_id},receiver_id.eq.{user1_id})'
         ).execute()
+        friend_graph.get_friend_graph().remove_edge(user1_id, user2_id)
+        friend_graph.invalidate_friendship(user1_id, user2_id)
         
         return Response({"message": "Unfriended successfully"})
         
@@ -174,23 +169,23 @@ def unfriend_user_view(request):
 def get_friendship_status_view(request, current_user_id, target_user_id):
     """Get friendship status"""
     try:
-        # Check if friendship exists
-        response = supabase.table('friendships').select('*').or_(
-            f'and(requester_id.eq.{current_user_id},receiver_id.eq.{target_user_id})',
-            f'and(requester_id.eq.{target_user_id},receiver_id.eq.{current_user_id})'
-        ).execute()
+        return Response(friend_graph.get_friendship_status(current_user_id, target_user_id))
         
-        if not response.data:
-            return Response({"status": "none", "is_requester": False})
+    except Exception as e:
+        return Response({"error": str(e)}, status=500)
+
+@api_view(["GET"])
+def get_friend_suggestions_view(request, user_id):
+    """Get friend-of-friend suggestions ranked by mutual friends"""
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
         
-        friendship = response.data[0]
-        is_requester = friendship['requester_id'] == current_user_id
+        suggestions = friend_graph.get_suggestions(user_id, limit)
         
-        return Response({
-            "status": friendship['status'],
-            "is_requester": is_requester
-        })
+        return Response({"suggestions": suggestions})
         
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
@@ -277,13 +272,17 @@ def update_user_active_club_view(request, user_id):
         if not club_id:
             return Response({"error": "club_id is required"}, status=400)
         
-        # Update user's active club
+        # Update user's active club (active_club_closed is the column the
+        # attendance sweeper and the app read)
         response = supabase.table('profiles').update({
             'active_club_id': club_id,
-            'active_club_expires_at': expires_at
+            'active_club_closed': expires_at
         }).eq('id', user_id).execute()
+        friend_graph.invalidate_profile(user_id)
         
         if response.data:
+            get_presence_index().check_in(user_id, club_id, expires_at)
+            track_check_in(user_id, expires_at)
             return Response(response.data[0])
         else:
             return Response({"error": "Profile not found"}, status=404)
@@ -293,21 +292,31 @@ def update_user_active_club_view(request, user_id):
 
 @api_view(["POST"])
 def check_and_clear_expired_attendance_view(request, user_id):
-    """Check and clear expired attendance"""
+    """Check and clear expired attendance (the sweeper normally clears it in bulk first)"""
     try:
-        from datetime import datetime
+        from datetime import datetime, timezone
+        from services.trending import parse_timestamp
         
-        # Get current time
-        now = datetime.utcnow().isoformat()
+        response = supabase.table('profiles').select(
+            'active_club_id,active_club_closed'
+        ).eq('id', user_id).execute()
         
-        # Update profiles where active_club_closed is in the past
-        response = supabase.table('profiles').update({
-            'active_club_id': None,
-             'active_club_closed': None
-        }).eq('id', user_id).lt('active_club_closed', now).execute()
+        profile = response.data[0] if response.data else {}
+        closed_at = profile.get('active_club_closed')
+        now = datetime.now(timezone.utc)
+        if not profile.get('active_club_id') or not closed_at or parse_timestamp(closed_at) > now:
+            return Response({"cleared": False})
         
-        cleared = len(response.data) > 0
-        return Response({"cleared": cleared})
+        # Expired but not swept yet (e.g. no sweeper running): clear this user only
+        cleared = supabase.table('profiles').update({
+            'active_club_id': None,
+            'active_club_closed': None
+        }).eq('id', user_id).lte('active_club_closed', now.isoformat()).execute()
+        if cleared.data:
+            get_presence_index().check_out(user_id)
+            track_check_out(user_id)
+            friend_graph.invalidate_profile(user_id)
+        return Response({"cleared": True})
         
     except Exception as e:
         return Response({"error": str(e)}, status=500)
@@ -316,36 +325,8 @@ def check_and_clear_expired_attendance_view(request, user_id):
 def get_friends_active_clubs_view(request, user_id):
     """Get friends active clubs"""
     try:
-        # Get user's friends
-        friends_response = supabase.table('friendships').select(
-            'requester_id,receiver_id'
-        ).or_(f'requester_id.eq.{user_id},receiver_id.eq.{user_id}').eq('status', 'accepted').execute()
-        
-        friend_ids = []
-        for friendship in friends_response.data:
-            if friendship['requester_id'] == user_id:
-                friend_ids.append(friendship['receiver_id'])
-            else:
-                friend_ids.append(friendship['requester_id'])
-        
-        if not friend_ids:
-            return Response({"active_clubs": []})
-        
-        # Get friends' active clubs
-        active_clubs_response = supabase.table('profiles').select(
-            'id,username,avatar_url,active_club_id,active_club_closed,clubs(*)'
-        ).in_('id', friend_ids).not_.is_('active_club_id', 'null').execute()
-        
-        active_clubs = []
-        for profile in active_clubs_response.data:
-            if profile['clubs']:
-                active_clubs.append({
-                    'user_id': profile['id'],
-                    'username': profile['username'],
-                    'avatar_url': profile['avatar_url'],
-                    'club': profile['clubs'],
-                    'expires_at': profile['active_club_closed']
-                })
+        # Reuses the cached friend list instead of re-querying friendships
+        active_clubs = friend_graph.get_friends_active_clubs(user_id)
         
         return Response({"active_clubs": active_clubs})
         
@@ -358,6 +339,7 @@ def delete_user_account_view(request, user_id):
     try:
         # Delete user's profile
         response = supabase.table('profiles').delete().eq('id', user_id).execute()
+        get_user_search_index().remove(user_id)
         
         # Note: In a real implementation, you might also want to delete related data
         # like friendships, favourites, etc. This is a simplified version.
@@ -376,10 +358,10 @@ def search_users_view(request):
         if not search_term:
             return Response({"users": []})
         
-        # Search users by username (simplified query)
-        response = supabase.table('profiles').select('*').ilike('username', f'%{search_term}%').limit(20).execute()
+        # In-memory username index (prefix + trigram); ?user_id= boosts the searcher's network
+        users = search_users(search_term, limit=20, user_id=request.GET.get('user_id') or None)
         
-        return Response({"users": response.data})
+        return Response({"users": users})
         
     except Exception as e:
         return Response({"error": str(e)}, status=500)
@@ -0,0 +1,18 @@
+-- Natural key for generated recurring event instances, so bulk inserts can
+-- use ON CONFLICT DO NOTHING (PostgREST upsert with ignore_duplicates).
+--
+-- A template (recurring_config IS NOT NULL) starts on the same date as its
+-- first instance, so the key includes whether the row is a template.
+ALTER TABLE events ADD COLUMN IF NOT EXISTS is_template BOOLEAN
+  GENERATED ALWAYS AS (recurring_config IS NOT NULL) STORED;
+
+-- Check for existing duplicates before creating the index (it fails if any remain):
+-- SELECT club_id, title, start_date, is_template, COUNT(*)
+-- FROM events
+-- GROUP BY club_id, title, start_date, is_template
+-- HAVING COUNT(*) > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_instance_key
+  ON events(club_id, title, start_date, is_template);
+
+COMMENT ON COLUMN events.is_template IS 'True for recurring event templates; part of the instance natural key';